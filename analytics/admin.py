@@ -0,0 +1,7 @@
+from django.contrib import admin
+
+from .models import SpaceDailyUsage, SpaceDailyMemberUsage, RollupBackfillPartition
+
+admin.site.register(SpaceDailyUsage)
+admin.site.register(SpaceDailyMemberUsage)
+admin.site.register(RollupBackfillPartition)
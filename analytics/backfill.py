@@ -0,0 +1,103 @@
+"""
+일별 사용량 집계의 재계산(backfill) 작업
+작업은 (그룹, 월) 단위로 나누어지며, 각 작업은 별도의 process에서 독립적인 DB connection으로 수행된다.
+"""
+import os
+import time
+from datetime import date, timedelta
+from typing import List, Tuple
+
+import django
+
+
+def init_worker(settings_module: str) -> None:
+    """
+    ProcessPoolExecutor의 worker process를 초기화하는 함수
+    worker는 부모 process의 DB connection을 공유하지 않고, 첫 query 시점에 자신의 connection을 연결한다.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    django.setup()
+
+
+def next_month(month: date) -> date:
+    return date(month.year + 1, 1, 1) if month.month == 12 else date(month.year, month.month + 1, 1)
+
+
+def get_partitions() -> List[Tuple[int, date]]:
+    """
+    예약 내역(보관된 예약 내역 포함) 또는 비어 있지 않은 일별 사용량 집계가 존재하는 모든 (그룹 pk, 월) 목록을 반환하는 함수
+    예약 내역이 모두 취소된 달도 남아 있는 집계를 비우기 위해 포함된다.
+    """
+    from django.db.models import Min, Max
+    from analytics.models import SpaceDailyUsage
+    from reservations.models import Reservation, ArchivedReservation
+
+    ranges = dict()
+
+    def add_range(group_id: int, first: date, last: date) -> None:
+        prev_first, prev_last = ranges.get(group_id, (first, last))
+        ranges[group_id] = (min(first, prev_first), max(last, prev_last))
+
+    for model in (Reservation, ArchivedReservation):
+        for group_id, first, last in model.objects.values('space__group').annotate(
+                first=Min('dt_from'), last=Max('dt_from')).values_list('space__group', 'first', 'last'):
+            add_range(group_id, first.date(), last.date())
+    for group_id, first, last in SpaceDailyUsage.objects.filter(booked_hours__gt=0).values('space__group').annotate(
+            first=Min('date'), last=Max('date')).values_list('space__group', 'first', 'last'):
+        add_range(group_id, first, last)
+
+    partitions = []
+    for group_id, (first, last) in sorted(ranges.items()):
+        month = date(first.year, first.month, 1)
+        while month <= last:
+            partitions.append((group_id, month))
+            month = next_month(month)
+    return partitions
+
+
+def backfill_partition(group_id: int, month: date, retries: int = 3) -> int:
+    """
+    한 그룹의 한 달 동안의 일별 사용량 집계를 다시 계산하는 함수 (worker process에서 실행됨)
+    다른 worker와의 write lock 경합으로 실패한 경우 잠시 후 다시 시도한다.
+    :return: 집계한 예약 내역의 수
+    """
+    from django.db import OperationalError
+
+    for attempt in range(retries):
+        try:
+            return _backfill_partition(group_id, month)
+        except OperationalError:
+            if attempt == retries - 1:
+                raise
+            time.sleep(0.5 * 2 ** attempt)
+
+
+def _backfill_partition(group_id: int, month: date) -> int:
+    """
+    집계 행의 lock, 예약 내역의 조회, 집계의 교체와 작업 완료 기록은 하나의 transaction에서 수행된다.
+    예약 생성/취소(record_reservations)가 거는 것과 같은 집계 행에 먼저 lock을 건 뒤 예약 내역을 조회하므로,
+    조회와 교체 사이에 생성/취소된 예약 내역이 집계에서 누락되지 않는다.
+    예약 내역이 없는 달의 집계는 비워진다.
+    """
+    from django.db import transaction
+    from analytics.models import SpaceDailyUsage, RollupBackfillPartition
+    from reservations.models import Space, Reservation, ArchivedReservation
+
+    month_end = next_month(month)
+    month_last = month_end - timedelta(days=1)
+    space_ids = list(Space.all_objects.filter(group_id=group_id).values_list('pk', flat=True))
+
+    with transaction.atomic():
+        SpaceDailyUsage.lock_range(space_ids, month, month_last)
+
+        rows = []
+        for model in (Reservation, ArchivedReservation):
+            rows += model.objects.filter(space__in=space_ids, dt_from__gte=month, dt_from__lt=month_end) \
+                .values_list('space_id', 'member_id', 'dt_from')
+
+        SpaceDailyUsage.rebuild(space_ids, month, month_last, rows)
+        RollupBackfillPartition.objects.update_or_create(
+            group_id=group_id, month=month, defaults={'reservation_count': len(rows)}
+        )
+
+    return len(rows)
@@ -0,0 +1,64 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from analytics.backfill import init_worker, get_partitions, backfill_partition
+from analytics.models import RollupBackfillPartition
+
+
+class Command(BaseCommand):
+    help = '예약 내역으로부터 일별 사용량 집계를 (그룹, 월) 단위로 나누어 병렬로 다시 계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1),
+                            help='동시에 실행할 worker process의 수 (default: min(4, CPU 수))')
+        parser.add_argument('--restart', action='store_true',
+                            help='완료 기록을 지우고 모든 작업을 처음부터 다시 수행')
+
+    def handle(self, *args, **options):
+        if options['restart']:
+            RollupBackfillPartition.objects.all().delete()
+
+        completed = set(RollupBackfillPartition.objects.values_list('group_id', 'month'))
+        partitions = [p for p in get_partitions() if p not in completed]
+        self.stdout.write(f'{len(partitions)} partitions to backfill ({len(completed)} already completed)')
+        if not partitions:
+            return
+
+        # worker process가 부모 process의 connection을 물려받지 않도록 먼저 닫아둠
+        connections.close_all()
+
+        started = time.monotonic()
+        total_rows = 0
+        failed = 0
+        with ProcessPoolExecutor(max_workers=options['workers'],
+                                 mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=init_worker,
+                                 initargs=(os.environ['DJANGO_SETTINGS_MODULE'],)) as executor:
+            futures = {executor.submit(backfill_partition, group_id, month): (group_id, month)
+                       for group_id, month in partitions}
+
+            for done, future in enumerate(as_completed(futures), start=1):
+                group_id, month = futures[future]
+                try:
+                    rows = future.result()
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f'  group #{group_id} {month:%Y-%m}: failed ({e})')
+                    continue
+
+                total_rows += rows
+                elapsed = time.monotonic() - started
+                self.stdout.write(f'  [{done}/{len(partitions)}] group #{group_id} {month:%Y-%m}: {rows} rows '
+                                  f'({total_rows / elapsed:.0f} rows/s)')
+
+        elapsed = time.monotonic() - started
+        summary = f'{total_rows} rows in {elapsed:.1f}s ({total_rows / elapsed:.0f} rows/s), {failed} failed.'
+        if failed:
+            self.stdout.write(self.style.WARNING(summary + ' Run again to resume the failed partitions.'))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,56 @@
+# Generated by Django 4.0.4 on 2026-10-19 16:05
+
+import analytics.models
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('reservations', '0015_archivedreservation_reservation_reservation_space_dt_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpaceDailyUsage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='날짜')),
+                ('booked_hours', models.PositiveIntegerField(default=0, verbose_name='예약된 시간')),
+                ('distinct_members', models.PositiveIntegerField(default=0, verbose_name='예약한 멤버 수')),
+                ('hour_histogram', models.JSONField(default=analytics.models.empty_hour_histogram, verbose_name='시간대별 예약 수')),
+                ('space', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_usages', to='reservations.space', verbose_name='대상 공간')),
+            ],
+            options={
+                'verbose_name': '공간 일별 사용량',
+                'verbose_name_plural': '공간 일별 사용량 목록',
+            },
+        ),
+        migrations.CreateModel(
+            name='SpaceDailyMemberUsage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='날짜')),
+                ('hours', models.PositiveIntegerField(default=0, verbose_name='예약된 시간')),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_space_usages', to=settings.AUTH_USER_MODEL, verbose_name='멤버')),
+                ('space', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_member_usages', to='reservations.space', verbose_name='대상 공간')),
+            ],
+            options={
+                'verbose_name': '멤버 일별 사용량',
+                'verbose_name_plural': '멤버 일별 사용량 목록',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='spacedailyusage',
+            constraint=models.UniqueConstraint(fields=('space', 'date'), name='single daily usage per space'),
+        ),
+        migrations.AddConstraint(
+            model_name='spacedailymemberusage',
+            constraint=models.UniqueConstraint(fields=('space', 'date', 'member'), name='single daily usage per space and member'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.0.4 on 2026-10-19 17:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_group_deleted_at'),
+        ('analytics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupBackfillPartition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(verbose_name='대상 월(1일)')),
+                ('completed_at', models.DateTimeField(auto_now=True, verbose_name='완료 일시')),
+                ('reservation_count', models.PositiveIntegerField(default=0, verbose_name='집계한 예약 내역 수')),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rollup_backfill_partitions', to='users.group', verbose_name='대상 그룹')),
+            ],
+            options={
+                'verbose_name': '사용량 집계 재계산 작업',
+                'verbose_name_plural': '사용량 집계 재계산 작업 목록',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='rollupbackfillpartition',
+            constraint=models.UniqueConstraint(fields=('group', 'month'), name='single backfill partition per group and month'),
+        ),
+    ]
@@ -0,0 +1,282 @@
+import operator
+from collections import defaultdict
+from datetime import date
+from functools import reduce
+from typing import Iterable, Dict, List, Tuple
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+
+def empty_hour_histogram() -> List[int]:
+    return [0] * 24
+
+
+class SpaceDailyUsage(models.Model):
+    """
+    공간의 일별 사용량 집계
+    예약 생성/취소 시 record_reservations에 의해 점진적으로 갱신되며, 사용량 통계는 예약 내역 대신 이 집계만을 조회한다.
+    - SpaceDailyUsage : Space = N : 1 (한 공간에 날짜별로 하나의 집계가 존재하므로)
+    """
+    space = models.ForeignKey('reservations.Space', null=False, on_delete=models.CASCADE,
+                              verbose_name='대상 공간', related_name='daily_usages')
+    date = models.DateField('날짜')
+
+    booked_hours = models.PositiveIntegerField('예약된 시간', default=0)
+    distinct_members = models.PositiveIntegerField('예약한 멤버 수', default=0)
+    # 0시 ~ 23시의 시간대별 예약 수
+    hour_histogram = models.JSONField('시간대별 예약 수', default=empty_hour_histogram)
+
+    class Meta:
+        verbose_name = '공간 일별 사용량'
+        verbose_name_plural = '공간 일별 사용량 목록'
+        constraints = (
+            models.UniqueConstraint(
+                fields=['space', 'date'],
+                name='single daily usage per space',
+            ),
+        )
+
+    @classmethod
+    def record_reservations(cls, reservations: Iterable, delta: int) -> None:
+        """
+        생성 또는 취소된 예약 내역을 일별 사용량 집계에 반영하는 메서드
+        예약 내역을 생성/삭제하는 transaction 안에서 호출되어야 한다.
+        :param reservations: 생성 또는 취소된 예약 내역 목록
+        :param delta: 생성된 경우 1, 취소된 경우 -1
+        """
+        # (공간 pk, 날짜)별 변경량
+        histogram_deltas = defaultdict(empty_hour_histogram)
+        member_deltas = defaultdict(lambda: defaultdict(int))
+        for reservation in reservations:
+            key = (reservation.space_id, reservation.dt_from.date())
+            histogram_deltas[key][reservation.dt_from.hour] += delta
+            member_deltas[key][reservation.member_id] += delta
+
+        if not histogram_deltas:
+            return
+
+        keys = sorted(histogram_deltas.keys())
+        with transaction.atomic():
+            # 여러 (공간, 날짜)의 집계를 한 번에 갱신함 (예약 내역의 수와 관계없이 query 수가 일정함)
+            # 집계 행이 없는 (공간, 날짜)의 행을 먼저 생성한 뒤,
+            # rebuild(lock_range)와 같은 (공간, 날짜) 순서로 lock을 걸어 서로를 기다리다 멈추지 않도록 함
+            cls.objects.bulk_create([cls(space_id=space_id, date=target_date) for space_id, target_date in keys],
+                                    ignore_conflicts=True)
+            usages = list(cls.objects.select_for_update().filter(reduce(operator.or_, (
+                Q(space_id=space_id, date=target_date) for space_id, target_date in keys
+            ))).order_by('space_id', 'date'))
+
+            distinct_deltas = SpaceDailyMemberUsage.apply_deltas(member_deltas)
+            for usage in usages:
+                key = (usage.space_id, usage.date)
+                usage.hour_histogram = [max(0, h + d) for h, d in zip(usage.hour_histogram, histogram_deltas[key])]
+                usage.booked_hours = sum(usage.hour_histogram)
+                usage.distinct_members = max(0, usage.distinct_members + distinct_deltas[key])
+            cls.objects.bulk_update(usages, ['hour_histogram', 'booked_hours', 'distinct_members'])
+
+    @classmethod
+    def lock_range(cls, space_ids: Iterable[int], date_from: date, date_to: date) -> None:
+        """
+        기간 내 공간들의 일별 사용량 집계 행에 lock을 거는 메서드
+        record_reservations가 거는 것과 같은 행에 lock을 걸기 위해, 집계 행이 없는 날짜의 행도 먼저 생성한다.
+        lock을 건 뒤에 조회한 예약 내역으로 rebuild를 호출하면, 아직 commit되지 않은 예약 생성/취소는
+        조회되지 않는 대신 이 transaction이 끝난 뒤에 집계에 반영되므로 누락되거나 두 번 반영되지 않는다.
+        transaction 안에서 호출되어야 한다.
+        :param space_ids: 대상 공간 pk 목록
+        :param date_from: 시작 날짜 (포함)
+        :param date_to: 종료 날짜 (포함)
+        """
+        space_ids = sorted(space_ids)
+        days = (date_to - date_from).days + 1
+        cls.objects.bulk_create([
+            cls(space_id=space_id, date=date_from + timezone.timedelta(days=i))
+            for space_id in space_ids for i in range(days)
+        ], ignore_conflicts=True)
+        list(cls.objects.select_for_update().filter(space__in=space_ids, date__range=(date_from, date_to))
+             .order_by('space_id', 'date').values_list('pk', flat=True))
+
+    @classmethod
+    def rebuild(cls, space_ids: Iterable[int], date_from: date, date_to: date, rows: Iterable) -> int:
+        """
+        기간 내 공간들의 일별 사용량 집계를 예약 내역으로부터 다시 계산해 교체하는 메서드
+        같은 인자로 여러 번 호출되어도 같은 결과를 가진다(idempotent).
+        lock_range로 집계 행에 lock을 건 뒤 예약 내역을 조회한 transaction 안에서 호출되어야 한다.
+        lock을 기다리는 record_reservations가 같은 행을 갱신할 수 있도록, 집계 행은 삭제하지 않고 그 자리에서 교체한다.
+        :param space_ids: 대상 공간 pk 목록
+        :param date_from: 시작 날짜 (포함)
+        :param date_to: 종료 날짜 (포함)
+        :param rows: 기간 내 예약 내역의 (공간 pk, 멤버 pk, 예약 시작 일시) 목록
+        :return: 예약 내역이 있는 일별 사용량 집계 행의 수
+        """
+        space_ids = list(space_ids)
+        histograms = defaultdict(empty_hour_histogram)
+        member_hours = defaultdict(int)
+        for space_id, member_id, dt_from in rows:
+            histograms[(space_id, dt_from.date())][dt_from.hour] += 1
+            member_hours[(space_id, dt_from.date(), member_id)] += 1
+
+        distinct_members = defaultdict(int)
+        for space_id, target_date, _ in member_hours.keys():
+            distinct_members[(space_id, target_date)] += 1
+
+        with transaction.atomic():
+            usages = list(cls.objects.filter(space__in=space_ids, date__range=(date_from, date_to)))
+            for usage in usages:
+                key = (usage.space_id, usage.date)
+                usage.hour_histogram = histograms[key] if key in histograms else empty_hour_histogram()
+                usage.booked_hours = sum(usage.hour_histogram)
+                usage.distinct_members = distinct_members[key]
+            cls.objects.bulk_update(usages, ['hour_histogram', 'booked_hours', 'distinct_members'])
+
+            SpaceDailyMemberUsage.objects.filter(space__in=space_ids, date__range=(date_from, date_to)).delete()
+            SpaceDailyMemberUsage.objects.bulk_create([
+                SpaceDailyMemberUsage(space_id=space_id, date=target_date, member_id=member_id, hours=hours)
+                for (space_id, target_date, member_id), hours in member_hours.items()
+            ])
+
+        return len(histograms)
+
+    @classmethod
+    def get_group_report(cls, group, date_from: date, date_to: date) -> Dict:
+        """
+        그룹에 등록된 공간들의 기간 내 사용량 통계를 일별 집계로부터 계산하는 메서드
+        :param group: 대상 그룹
+        :param date_from: 시작 날짜 (포함)
+        :param date_to: 종료 날짜 (포함)
+        :return: {
+            'spaces': 사용률이 낮은 순으로 정렬된 공간별 통계 목록,
+            'heatmap': 요일(월~일) x 시간대(0~23)별 사용률(0~1),
+        }
+        """
+        spaces = {
+            pk: {'pk': pk, 'name': name, 'capacity': capacity, 'booked_hours': 0, 'member_days': 0,
+                 'hour_histogram': empty_hour_histogram()}
+            for pk, name, capacity in group.registered_spaces.values_list('pk', 'name', 'capacity')
+        }
+        heatmap_counts = [empty_hour_histogram() for _ in range(7)]
+
+        usages = cls.objects.filter(space__in=spaces.keys(), date__range=(date_from, date_to)).values_list(
+            'space_id', 'date', 'booked_hours', 'distinct_members', 'hour_histogram'
+        )
+        for space_id, usage_date, booked_hours, distinct_members, hour_histogram in usages:
+            space = spaces[space_id]
+            space['booked_hours'] += booked_hours
+            space['member_days'] += distinct_members
+            for h, count in enumerate(hour_histogram):
+                space['hour_histogram'][h] += count
+                heatmap_counts[usage_date.weekday()][h] += count
+
+        days = (date_to - date_from).days + 1
+        # 기간 안에 각 요일이 몇 번 포함되는지
+        weekday_occurrences = [0] * 7
+        for i in range(days):
+            weekday_occurrences[(date_from + timezone.timedelta(days=i)).weekday()] += 1
+
+        for space in spaces.values():
+            space['utilization'] = space['booked_hours'] / (days * 24 * space['capacity'])
+            space['avg_distinct_members'] = space['member_days'] / days
+            peak = max(space['hour_histogram'])
+            space['peak_hour'] = space['hour_histogram'].index(peak) if peak else None
+
+        # 한 시간대에 예약할 수 있는 그룹 전체의 좌석 수
+        total_capacity = sum(space['capacity'] for space in spaces.values())
+        heatmap = [
+            [count / (total_capacity * weekday_occurrences[wd]) if total_capacity and weekday_occurrences[wd] else 0
+             for count in heatmap_counts[wd]]
+            for wd in range(7)
+        ]
+
+        return {
+            'spaces': sorted(spaces.values(), key=lambda s: (s['utilization'], s['pk'])),
+            'heatmap': heatmap,
+        }
+
+
+class SpaceDailyMemberUsage(models.Model):
+    """
+    공간의 일별, 멤버별 예약 시간 집계
+    SpaceDailyUsage.distinct_members를 점진적으로 갱신하기 위해 사용된다.
+    """
+    space = models.ForeignKey('reservations.Space', null=False, on_delete=models.CASCADE,
+                              verbose_name='대상 공간', related_name='daily_member_usages')
+    date = models.DateField('날짜')
+    member = models.ForeignKey(settings.AUTH_USER_MODEL, null=False, on_delete=models.CASCADE,
+                               verbose_name='멤버', related_name='daily_space_usages')
+    hours = models.PositiveIntegerField('예약된 시간', default=0)
+
+    class Meta:
+        verbose_name = '멤버 일별 사용량'
+        verbose_name_plural = '멤버 일별 사용량 목록'
+        constraints = (
+            models.UniqueConstraint(
+                fields=['space', 'date', 'member'],
+                name='single daily usage per space and member',
+            ),
+        )
+
+    @classmethod
+    def apply_deltas(cls, member_deltas: Dict[Tuple[int, date], Dict[int, int]]) -> Dict[Tuple[int, date], int]:
+        """
+        (공간, 날짜)별 멤버의 예약 시간 변경량을 한 번에 반영하는 메서드
+        같은 (공간, 날짜)의 SpaceDailyUsage 행에 lock을 건 상태에서 호출되어야 한다.
+        :param member_deltas: (공간 pk, 날짜) -> 멤버 pk -> 예약 시간 변경량
+        :return: (공간 pk, 날짜) -> 예약한 멤버 수의 변경량
+        """
+        existing = {
+            (usage.space_id, usage.date, usage.member_id): usage
+            for usage in cls.objects.filter(reduce(operator.or_, (
+                Q(space_id=space_id, date=target_date, member_id__in=list(deltas.keys()))
+                for (space_id, target_date), deltas in member_deltas.items()
+            )))
+        }
+
+        distinct_deltas = defaultdict(int)
+        created, updated, deleted = [], [], []
+        for (space_id, target_date), deltas in member_deltas.items():
+            for member_id, hours_delta in deltas.items():
+                usage = existing.get((space_id, target_date, member_id))
+                prev_hours = 0 if usage is None else usage.hours
+                new_hours = max(0, prev_hours + hours_delta)
+                if usage is None:
+                    if new_hours > 0:
+                        created.append(cls(space_id=space_id, date=target_date, member_id=member_id, hours=new_hours))
+                elif new_hours == 0:
+                    deleted.append(usage.pk)
+                else:
+                    usage.hours = new_hours
+                    updated.append(usage)
+                distinct_deltas[(space_id, target_date)] += int(new_hours > 0) - int(prev_hours > 0)
+
+        if created:
+            cls.objects.bulk_create(created)
+        if updated:
+            cls.objects.bulk_update(updated, ['hours'])
+        if deleted:
+            cls.objects.filter(pk__in=deleted).delete()
+        return distinct_deltas
+
+
+class RollupBackfillPartition(models.Model):
+    """
+    일별 사용량 집계의 재계산(backfill)이 완료된 (그룹, 월) 단위 작업
+    backfill_usage_rollups 명령이 중단된 후 다시 실행될 때, 완료된 작업을 건너뛰기 위해 사용된다.
+    """
+    group = models.ForeignKey('users.Group', null=False, on_delete=models.CASCADE,
+                              verbose_name='대상 그룹', related_name='rollup_backfill_partitions')
+    month = models.DateField('대상 월(1일)')
+
+    completed_at = models.DateTimeField('완료 일시', auto_now=True)
+    reservation_count = models.PositiveIntegerField('집계한 예약 내역 수', default=0)
+
+    class Meta:
+        verbose_name = '사용량 집계 재계산 작업'
+        verbose_name_plural = '사용량 집계 재계산 작업 목록'
+        constraints = (
+            models.UniqueConstraint(
+                fields=['group', 'month'],
+                name='single backfill partition per group and month',
+            ),
+        )
@@ -0,0 +1,114 @@
+from datetime import date
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from analytics.backfill import get_partitions, _backfill_partition
+from analytics.models import SpaceDailyUsage, SpaceDailyMemberUsage, RollupBackfillPartition
+from reservations.models import Term, Space, Reservation
+from users.models import SystemUser, Group
+
+
+class SpaceDailyUsageTest(TestCase):
+    """
+    예약 생성/취소에 의한 일별 사용량 집계의 갱신과 재계산(backfill)
+    """
+
+    def setUp(self):
+        self.manager = SystemUser.signup('manager', 'password1234', 'manager@example.com', 'manager')
+        self.member = SystemUser.signup('member', 'password1234', 'member@example.com', 'member')
+        self.group = Group.start_new_group(self.manager, 'group', False)
+        self.group.add_member(self.member)
+        term = Term.create_term(self.group, 'term', 'body')
+        self.space = Space.create_space('space', self.group, term, None)
+        self.target_dt = (timezone.now() + timezone.timedelta(days=1)).replace(hour=10, minute=0, second=0,
+                                                                               microsecond=0)
+
+    def get_usage(self) -> SpaceDailyUsage:
+        return SpaceDailyUsage.objects.get(space=self.space, date=self.target_dt.date())
+
+    def test_reservations_update_usage(self):
+        Reservation.create_reservation(self.space, self.manager, self.target_dt)
+        Reservation.create_reservation(self.space, self.member, self.target_dt + timezone.timedelta(hours=1))
+        cancelled = Reservation.create_reservation(self.space, self.member,
+                                                   self.target_dt + timezone.timedelta(hours=2))
+
+        usage = self.get_usage()
+        self.assertEqual((usage.booked_hours, usage.distinct_members), (3, 2))
+        self.assertEqual(usage.hour_histogram[10:13], [1, 1, 1])
+
+        cancelled.cancel()
+        usage = self.get_usage()
+        self.assertEqual((usage.booked_hours, usage.distinct_members), (2, 2))
+        self.assertEqual(usage.hour_histogram[10:13], [1, 1, 0])
+
+        # 멤버의 마지막 예약이 취소되면 예약한 멤버 수에서 빠짐
+        Reservation.objects.get(member=self.member).cancel()
+        self.assertEqual(self.get_usage().distinct_members, 1)
+
+    def test_batch_updates_usage_with_constant_queries(self):
+        def count_queries(reservations):
+            with CaptureQueriesContext(connection) as queries:
+                SpaceDailyUsage.record_reservations(reservations, 1)
+            return len(queries)
+
+        def make_reservations(first_day, days):
+            return [Reservation(space=self.space, member=self.member, dt_from=dt_from, dt_to=dt_from)
+                    for dt_from in (self.target_dt + timezone.timedelta(days=first_day + i) for i in range(days))]
+
+        # (공간, 날짜)의 수와 관계없이 같은 수의 query로 집계함
+        self.assertEqual(count_queries(make_reservations(30, 1)), count_queries(make_reservations(60, 5)))
+        self.assertEqual(SpaceDailyUsage.objects.filter(booked_hours=1, distinct_members=1).count(), 6)
+
+        # 같은 (공간, 날짜)에 다시 반영된 경우 멤버별 집계가 갱신됨
+        SpaceDailyUsage.record_reservations(make_reservations(60, 5), -1)
+        SpaceDailyUsage.record_reservations(make_reservations(30, 1) * 2, 1)
+        usage = SpaceDailyUsage.objects.get(date=(self.target_dt + timezone.timedelta(days=30)).date())
+        self.assertEqual((usage.booked_hours, usage.distinct_members), (3, 1))
+        self.assertEqual(SpaceDailyMemberUsage.objects.get().hours, 3)
+
+    def get_rollup(self):
+        return sorted(SpaceDailyUsage.objects.exclude(booked_hours=0).values_list(
+            'space_id', 'date', 'booked_hours', 'distinct_members', 'hour_histogram'))
+
+    def test_backfill_matches_incremental_rollup(self):
+        Reservation.create_reservation(self.space, self.manager, self.target_dt)
+        Reservation.create_reservation(self.space, self.member, self.target_dt + timezone.timedelta(hours=2))
+        expected = self.get_rollup()
+
+        SpaceDailyUsage.objects.all().update(booked_hours=99, distinct_members=99)
+        SpaceDailyMemberUsage.objects.all().delete()
+        month = date(self.target_dt.year, self.target_dt.month, 1)
+        self.assertEqual(get_partitions(), [(self.group.pk, month)])
+
+        self.assertEqual(_backfill_partition(self.group.pk, month), 2)
+        self.assertEqual(self.get_rollup(), expected)
+        self.assertEqual(RollupBackfillPartition.objects.get(group=self.group, month=month).reservation_count, 2)
+
+        # 재계산 후의 예약 생성/취소도 집계에 반영됨
+        Reservation.objects.get(member=self.member).cancel()
+        usage = self.get_usage()
+        self.assertEqual((usage.booked_hours, usage.distinct_members), (1, 1))
+
+    def test_backfill_clears_month_without_reservations(self):
+        # 달의 유일한 예약이 backfill 전에 취소되어, 남아 있는 (잘못된) 집계만 존재하는 경우
+        Reservation.create_reservation(self.space, self.member, self.target_dt).cancel()
+        SpaceDailyUsage.objects.filter(space=self.space).update(booked_hours=3, distinct_members=1)
+        month = date(self.target_dt.year, self.target_dt.month, 1)
+        self.assertEqual(get_partitions(), [(self.group.pk, month)])
+
+        self.assertEqual(_backfill_partition(self.group.pk, month), 0)
+        self.assertEqual(self.get_rollup(), [])
+        self.assertEqual(RollupBackfillPartition.objects.get(group=self.group, month=month).reservation_count, 0)
+
+    def test_group_report(self):
+        Reservation.create_reservation(self.space, self.member, self.target_dt)
+        report = SpaceDailyUsage.get_group_report(self.group, self.target_dt.date(), self.target_dt.date())
+
+        space_report = report['spaces'][0]
+        self.assertEqual(space_report['booked_hours'], 1)
+        self.assertEqual(space_report['peak_hour'], 10)
+        self.assertAlmostEqual(space_report['utilization'], 1 / 24)
+        self.assertAlmostEqual(report['heatmap'][self.target_dt.weekday()][10], 1)
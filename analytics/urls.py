@@ -0,0 +1,10 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'analytics'
+
+urlpatterns = [
+    # 그룹 공간 사용량 통계
+    path('<int:group_pk>/utilization/', views.GroupUtilizationView.as_view(), name='group_utilization'),
+]
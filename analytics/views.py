@@ -0,0 +1,37 @@
+from django.shortcuts import render
+from django.utils import timezone
+
+from analytics.models import SpaceDailyUsage
+from users.views import ManagerOnlyView
+
+
+class GroupUtilizationView(ManagerOnlyView):
+    """
+    그룹에 등록된 공간들의 사용량 통계와 요일 x 시간대별 사용률(heatmap)을 보여주는 View
+    예약 내역을 직접 집계하지 않고, 일별 사용량 집계(SpaceDailyUsage)만을 조회한다.
+    """
+    DEFAULT_WEEKS = 4
+    MAX_WEEKS = 52
+
+    def get(self, request, *args, **kwargs):
+        try:
+            weeks = int(request.GET.get('weeks', self.DEFAULT_WEEKS))
+        except ValueError:
+            weeks = self.DEFAULT_WEEKS
+        weeks = min(max(weeks, 1), self.MAX_WEEKS)
+
+        date_to = timezone.now().date()
+        date_from = date_to - timezone.timedelta(days=weeks * 7 - 1)
+
+        report = SpaceDailyUsage.get_group_report(self.group, date_from, date_to)
+
+        self.context['weeks'] = weeks
+        self.context['date_from'] = date_from
+        self.context['date_to'] = date_to
+        self.context['space_reports'] = report['spaces']
+        # 행: 시간대(0~23), 열: 요일(월~일)
+        self.context['heatmap_rows'] = [
+            (f'{h:0>2d}:00', [report['heatmap'][wd][h] for wd in range(7)]) for h in range(24)
+        ]
+
+        return render(request, 'analytics/group_utilization.html', self.context)
@@ -1,3 +1,10 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import RateLimitBucket, ThrottleCounter, IdempotencyRecord, OutboxMessage, PeriodicJobLease, PeriodicJobRun
+
+admin.site.register(RateLimitBucket)
+admin.site.register(ThrottleCounter)
+admin.site.register(IdempotencyRecord)
+admin.site.register(OutboxMessage)
+admin.site.register(PeriodicJobLease)
+admin.site.register(PeriodicJobRun)
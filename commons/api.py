@@ -0,0 +1,197 @@
+import base64
+import hashlib
+import json
+from typing import Dict, List, Optional, Sequence
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import ensure_csrf_cookie
+
+
+class ApiError(Exception):
+    """
+    JSON API 요청을 처리할 수 없는 경우 발생하는 예외
+    ApiView에서 {"error": code, "message": message} 형태의 응답으로 변환된다.
+    """
+
+    def __init__(self, status: int, code: str, message: str = '', headers: Dict[str, str] = None):
+        super(ApiError, self).__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+        self.headers = headers or {}
+
+
+def json_response(request, data, status: int = 200, headers: Dict[str, str] = None) -> HttpResponse:
+    """
+    data를 JSON으로 직렬화해 응답하는 함수
+    GET 요청의 응답에는 본문의 SHA-256으로 만든 strong ETag를 붙이며, If-None-Match가 일치하는 경우 본문 없이 304로 응답한다.
+    """
+    body = json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(',', ':')).encode()
+
+    etag = None
+    if request.method in ('GET', 'HEAD') and status == 200:
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        if etag in parse_if_none_match(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = HttpResponseNotModified()
+            response['ETag'] = etag
+            return response
+
+    response = HttpResponse(body, status=status, content_type='application/json')
+    if etag is not None:
+        response['ETag'] = etag
+        # 캐시된 응답은 항상 ETag로 재검증하도록 함
+        response['Cache-Control'] = 'private, no-cache'
+    for key, value in (headers or {}).items():
+        response[key] = value
+    return response
+
+
+def parse_if_none_match(header: str) -> List[str]:
+    """
+    If-None-Match header에 담긴 ETag 목록을 반환하는 함수 (weak ETag는 비교하지 않음)
+    """
+    return [etag.strip() for etag in header.split(',') if etag.strip() and not etag.strip().startswith('W/')]
+
+
+def parse_fields(request, available: Sequence[str], default: Sequence[str] = None) -> List[str]:
+    """
+    ?fields=a,b,c 로 선택된 응답 필드 목록을 반환하는 함수
+    :param available: 선택할 수 있는 필드 목록 (순서대로 응답에 포함됨)
+    :param default: fields가 전달되지 않은 경우의 필드 목록 (None인 경우 available 전체)
+    :raises ApiError: 선택할 수 없는 필드가 포함된 경우
+    """
+    raw = request.GET.get('fields')
+    if not raw:
+        return list(default if default is not None else available)
+
+    selected = {field.strip() for field in raw.split(',') if field.strip()}
+    unknown = selected - set(available)
+    if unknown:
+        raise ApiError(400, 'invalid_fields', 'Unknown fields: ' + ', '.join(sorted(unknown)))
+    return [field for field in available if field in selected]
+
+
+def parse_limit(request, default: int, maximum: int) -> int:
+    """
+    ?limit= 으로 전달된 한 페이지의 크기를 1 ~ maximum 사이의 값으로 반환하는 함수
+    """
+    try:
+        limit = int(request.GET.get('limit', default))
+    except ValueError:
+        raise ApiError(400, 'invalid_limit', 'limit must be an integer.')
+    return min(max(limit, 1), maximum)
+
+
+def encode_cursor(last_pk: int) -> str:
+    """
+    마지막으로 응답한 instance의 pk를 다음 페이지를 요청하기 위한 cursor 문자열로 변환하는 함수
+    """
+    return base64.urlsafe_b64encode(f'pk:{last_pk}'.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """
+    encode_cursor로 만든 cursor 문자열로부터 pk를 구하는 함수
+    :return: cursor가 전달되지 않은 경우 None
+    :raises ApiError: 올바르지 않은 cursor인 경우
+    """
+    if not cursor:
+        return None
+    try:
+        decoded = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        prefix, pk = decoded.split(':', 1)
+        if prefix != 'pk':
+            raise ValueError
+        return int(pk)
+    except ValueError:
+        raise ApiError(400, 'invalid_cursor', 'cursor is malformed.')
+
+
+def project(rows, fields: List[str], lookups: Dict[str, str]) -> List[Dict]:
+    """
+    values()로 조회된 row들을 응답 필드 이름으로 바꾸는 함수
+    :param lookups: 응답 필드 이름 -> ORM lookup
+    """
+    return [{field: row[lookups[field]] for field in fields} for row in rows]
+
+
+def paginate_by_pk(request, queryset, fields: List[str], lookups: Dict[str, str],
+                   default_limit: int = 50, max_limit: int = 200) -> Dict:
+    """
+    queryset을 pk 순으로 정렬하여 cursor 기반으로 나누어 조회하는 함수
+    offset을 사용하지 않으므로 뒤쪽 페이지도 같은 비용으로 조회되며, 조회 중 instance가 추가/삭제되어도 중복/누락되지 않는다.
+    :param fields: 응답에 포함할 필드 목록 (선택된 필드만 values()로 조회됨)
+    :param lookups: 응답 필드 이름 -> ORM lookup
+    :return: {"results": [...], "next_cursor": 다음 페이지의 cursor 또는 None}
+    """
+    limit = parse_limit(request, default_limit, max_limit)
+    after = decode_cursor(request.GET.get('cursor'))
+    if after is not None:
+        queryset = queryset.filter(pk__gt=after)
+
+    # cursor 계산을 위해 pk는 항상 함께 조회함
+    rows = list(queryset.order_by('pk').values('pk', *{lookups[field] for field in fields})[:limit + 1])
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+
+    return {
+        'results': project(rows, fields, lookups),
+        'next_cursor': encode_cursor(rows[-1]['pk']) if has_next else None,
+    }
+
+
+def parse_json_body(request) -> Dict:
+    """
+    요청 본문을 JSON으로 해석하여 반환하는 함수
+    JSON이 아닌 요청(form)은 POST 값을 그대로 사용한다.
+    :raises ApiError: 본문이 올바른 JSON object가 아닌 경우
+    """
+    if request.content_type != 'application/json':
+        return request.POST.dict()
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        raise ApiError(400, 'invalid_json', 'Request body is not valid JSON.')
+    if not isinstance(data, dict):
+        raise ApiError(400, 'invalid_json', 'Request body must be a JSON object.')
+    return data
+
+
+@method_decorator(ensure_csrf_cookie, name='dispatch')
+class ApiView(View):
+    """
+    JSON API view의 기본 class
+    - 로그인되지 않은 요청은 login 페이지로 redirect하지 않고 401로 응답한다.
+    - ApiError, Http404는 JSON 오류 응답으로 변환된다.
+    - 세션 인증을 사용하므로 GET이 아닌 요청은 X-CSRFToken header가 필요하다. (GET 응답에 csrftoken cookie가 설정됨)
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return self.error_response(request, ApiError(401, 'not_authenticated', 'Login required.'))
+        try:
+            self.initial(request, *args, **kwargs)
+            return super(ApiView, self).dispatch(request, *args, **kwargs)
+        except ApiError as e:
+            return self.error_response(request, e)
+        except Http404:
+            return self.error_response(request, ApiError(404, 'not_found', 'Not found.'))
+
+    def initial(self, request, *args, **kwargs) -> None:
+        """
+        요청을 method별 handler로 전달하기 전에 호출되는 메서드 (권한 검사 등)
+        """
+        pass
+
+    def http_method_not_allowed(self, request, *args, **kwargs):
+        response = self.error_response(request, ApiError(405, 'method_not_allowed', 'Method not allowed.'))
+        response['Allow'] = ', '.join(self._allowed_methods())
+        return response
+
+    @staticmethod
+    def error_response(request, error: ApiError) -> HttpResponse:
+        return json_response(request, {'error': error.code, 'message': error.message}, status=error.status,
+                             headers=error.headers)
@@ -0,0 +1,121 @@
+import functools
+import uuid
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import HttpResponseRedirect
+from django.shortcuts import render
+from django.utils import timezone
+
+from commons.models import IdempotencyRecord
+
+IDEMPOTENCY_HEADER = 'HTTP_IDEMPOTENCY_KEY'
+IDEMPOTENCY_FIELD = 'idempotency_key'
+
+
+def new_idempotency_key() -> str:
+    return uuid.uuid4().hex
+
+
+def get_idempotency_key(request) -> Optional[str]:
+    """
+    요청에 포함된 idempotency key를 반환하는 함수 (Idempotency-Key header 또는 form의 idempotency_key)
+    """
+    key = request.META.get(IDEMPOTENCY_HEADER) or request.POST.get(IDEMPOTENCY_FIELD)
+    if not key:
+        return None
+    return key[:64]
+
+
+def reserve(request, scope: str, key: str) -> Tuple[IdempotencyRecord, bool]:
+    """
+    key로 요청을 처리하기 위해 IdempotencyRecord를 생성하는 함수
+    처리 중인 기록은 IDEMPOTENCY_LEASE_SECONDS 동안만 유효하며, 그 안에 결과가 기록되지 않으면(처리 중 프로세스 중단 등)
+    버려진 기록으로 간주하여 같은 key의 요청을 다시 처리한다.
+    같은 key의 요청이 처리 중이더라도 기다리지 않고 바로 반환한다. (기다리는 동안 sync view를 실행하는 thread를 점유하지 않도록)
+    :return: (IdempotencyRecord, 새로 생성되었는지 여부) - 새로 생성되지 않은 경우 같은 key로 먼저 요청된 기록
+    """
+    user = request.user if request.user.is_authenticated else None
+
+    while True:
+        now = timezone.now()
+        try:
+            # 바깥 transaction 안에서 호출되어도 이어서 조회할 수 있도록 savepoint에서 생성함
+            with transaction.atomic():
+                record = IdempotencyRecord.objects.create(
+                    user=user, scope=scope, key=key,
+                    expires_at=now + timezone.timedelta(seconds=settings.IDEMPOTENCY_LEASE_SECONDS),
+                )
+            return record, True
+        except IntegrityError:
+            pass
+
+        try:
+            record = IdempotencyRecord.objects.get(user=user, scope=scope, key=key)
+        except IdempotencyRecord.DoesNotExist:
+            # 그 사이에 먼저 처리하던 요청이 실패하여 기록이 삭제된 경우
+            continue
+
+        # 만료된 기록(처리 결과의 보관 기간이 지났거나, 처리 중에 버려진 기록)은 없는 것으로 간주함
+        if record.expires_at <= now:
+            IdempotencyRecord.objects.filter(pk=record.pk, expires_at=record.expires_at).delete()
+            continue
+        return record, False
+
+
+def idempotent(scope: str):
+    """
+    POST view를 idempotency key로 한 번만 처리되게 하는 decorator
+    처리 결과가 redirect인 경우 IDEMPOTENCY_KEY_TTL_SECONDS 동안 저장되며, 같은 key로 다시 요청되면(더블 클릭,
+    proxy 재시도 등) view를 호출하지 않고 저장된 redirect를 그대로 응답한다.
+    redirect가 아닌 응답(입력 오류 등)은 저장하지 않으므로, 같은 key로 다시 요청하면 다시 처리된다.
+    key가 없는 요청은 그대로 처리된다.
+    class-based view에는 method_decorator(idempotent(scope), name='post')와 같이 적용한다.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def decorated(request, *args, **kwargs):
+            key = get_idempotency_key(request)
+            if key is None:
+                return func(request, *args, **kwargs)
+
+            record, created = reserve(request, scope, key)
+            if not created:
+                if record.is_completed:
+                    return HttpResponseRedirect(record.response_location, status=record.response_status)
+                # 먼저 요청된 같은 key의 요청이 아직 처리 중인 경우
+                response = render(request, 'commons/errors/409.html', status=409)
+                response['Retry-After'] = '1'
+                return response
+
+            # 처리 중에 lease가 만료되어 다른 요청이 같은 key를 가져간 경우 그 기록을 건드리지 않도록 pk로 갱신함
+            records = IdempotencyRecord.objects.filter(pk=record.pk)
+            try:
+                response = func(request, *args, **kwargs)
+            except Exception:
+                records.delete()
+                raise
+
+            if isinstance(response, HttpResponseRedirect):
+                records.update(
+                    response_status=response.status_code, response_location=response['Location'],
+                    expires_at=timezone.now() + timezone.timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL_SECONDS),
+                )
+            else:
+                records.delete()
+            return response
+
+        return decorated
+
+    return decorator
+
+
+def prune_expired() -> int:
+    """
+    만료된 IdempotencyRecord를 삭제하는 함수
+    :return: 삭제된 기록의 수
+    """
+    deleted, _ = IdempotencyRecord.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
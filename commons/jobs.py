@@ -0,0 +1,33 @@
+"""
+주기 작업(PERIODIC_JOBS)으로 실행되는 공통 정리 작업
+각 함수는 run_periodic_jobs 명령에서 인자 없이 호출되며, 실행 기록에 남길 요약을 반환한다.
+"""
+from django.conf import settings
+
+from commons.idempotency import prune_expired
+from commons.models import OutboxMessage
+from commons.ratelimit import DatabaseTokenBucketStore
+from commons.transport_strategies import create_outbox_transport
+
+# 이 시간(초) 이상 사용되지 않은 bucket은 이미 가득 차 있으므로 삭제해도 허용량이 달라지지 않음 (가장 긴 기간: 1h)
+RATE_LIMIT_BUCKET_IDLE_SECONDS = 60 * 60
+
+
+def prune_idempotency_records() -> str:
+    return f'{prune_expired()} expired idempotency records deleted'
+
+
+def prune_rate_limit_buckets() -> str:
+    # RATE_LIMIT_STORE = 'database'인 경우에만 bucket이 저장됨
+    return f'{DatabaseTokenBucketStore.prune(RATE_LIMIT_BUCKET_IDLE_SECONDS)} idle rate limit buckets deleted'
+
+
+def drain_outbox() -> str:
+    config = settings.OUTBOX
+    transport = create_outbox_transport(config['transport'], config.get('file_path'))
+
+    sent, retried, dead = OutboxMessage.drain(
+        transport, config['batch_size'], config['lease_seconds'], config['max_attempts'],
+        config['backoff_seconds'], config['max_backoff_seconds'],
+    )
+    return f'{sent} messages sent, {retried} scheduled for retry, {dead} given up'
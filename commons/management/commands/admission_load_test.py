@@ -0,0 +1,124 @@
+import logging
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.http import HttpRequest
+from django.middleware.csrf import get_token
+from django.test import Client, override_settings
+
+
+class QuietWSGIRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class LoadTestServer(ThreadedWSGIServer):
+    # 동시에 연결되는 요청이 거절되지 않도록 listen backlog를 늘림
+    request_queue_size = 1024
+
+
+class Command(BaseCommand):
+    help = ('로컬 서버를 띄워 한 엔드포인트에 동시 요청을 보내고, admission control 적용 여부에 따른 '
+            '응답 시간 분포(p50/p95/p99/max)와 응답 코드를 출력합니다.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', type=str, help='요청을 보낼 사용자의 username')
+        parser.add_argument('path', type=str, help='요청할 경로 (예: /reservation/spaces/1/1/)')
+        parser.add_argument('--method', type=str, default='GET', choices=['GET', 'POST'],
+                            help='HTTP method (default: GET)')
+        parser.add_argument('--data', type=str, nargs='*', default=[],
+                            help='POST로 전달할 key=value 목록')
+        parser.add_argument('--concurrency', type=int, default=32,
+                            help='동시에 요청을 보내는 client 수 (default: 32)')
+        parser.add_argument('--requests', type=int, default=320,
+                            help='전체 요청 수 (default: 320)')
+        parser.add_argument('--compare', action='store_true',
+                            help='admission control을 끈 상태로도 실행해 결과를 비교')
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options['username'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User '{options['username']}' does not exist.")
+
+        # 로그인된 session과 CSRF token을 만들어 모든 요청에서 함께 사용함
+        client = Client()
+        client.force_login(user)
+        cookies = {settings.SESSION_COOKIE_NAME: client.cookies[settings.SESSION_COOKIE_NAME].value}
+        data = dict(item.split('=', 1) for item in options['data'])
+        if options['method'] == 'POST':
+            csrf_request = HttpRequest()
+            data['csrfmiddlewaretoken'] = get_token(csrf_request)
+            cookies[settings.CSRF_COOKIE_NAME] = csrf_request.META['CSRF_COOKIE']
+
+        # 거절된 요청마다 출력되는 503 로그를 숨김
+        logging.getLogger('django.request').setLevel(logging.CRITICAL)
+
+        runs = [('with admission control', settings.ADMISSION_CONTROL)]
+        if options['compare']:
+            runs.append(('without admission control', {}))
+
+        for title, admission_control in runs:
+            # middleware는 handler 생성 시점의 설정으로 초기화됨
+            with override_settings(ADMISSION_CONTROL=admission_control):
+                handler = WSGIHandler()
+            self.stdout.write(title)
+            self.report(*self.run(handler, cookies, data, options))
+
+    def run(self, handler, cookies, data, options):
+        server = LoadTestServer(('127.0.0.1', 0), QuietWSGIRequestHandler)
+        server.set_app(handler)
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+
+        url = f'http://127.0.0.1:{server.server_port}{options["path"]}'
+        headers = {'Cookie': '; '.join(f'{key}={value}' for key, value in cookies.items())}
+        body = urllib.parse.urlencode(data).encode() if options['method'] == 'POST' else None
+
+        def send(_):
+            request = urllib.request.Request(url, data=body, headers=headers, method=options['method'])
+            started = time.monotonic()
+            try:
+                with urllib.request.urlopen(request) as response:
+                    response.read()
+                    status = response.status
+            except urllib.error.HTTPError as e:
+                status = e.code
+            return status, time.monotonic() - started
+
+        started = time.monotonic()
+        try:
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+                results = list(executor.map(send, range(options['requests'])))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        return results, time.monotonic() - started
+
+    def report(self, results, elapsed):
+        statuses = Counter(status for status, _ in results)
+        self.stdout.write(f'  {len(results)} requests in {elapsed:.2f}s ({len(results) / elapsed:.0f} req/s)')
+        self.stdout.write('  status: ' + ', '.join(f'{status} x {count}' for status, count in sorted(statuses.items())))
+
+        for label, latencies in (
+                ('admitted', [latency for status, latency in results if status != 503]),
+                ('all', [latency for _, latency in results]),
+        ):
+            if not latencies:
+                continue
+            latencies.sort()
+            quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+            self.stdout.write(f'  {label:>8}: p50 {quantiles[49] * 1000:.0f}ms, p95 {quantiles[94] * 1000:.0f}ms, '
+                              f'p99 {quantiles[98] * 1000:.0f}ms, max {latencies[-1] * 1000:.0f}ms')
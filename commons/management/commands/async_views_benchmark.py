@@ -0,0 +1,138 @@
+import asyncio
+import importlib
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+
+DEPLOYMENTS = ('wsgi', 'asgi')
+
+
+class Command(BaseCommand):
+    help = ('같은 엔드포인트에 동시 요청을 보내 WSGI(sync view, thread)와 ASGI(async view, event loop)의 '
+            '처리량(req/s)과 응답 시간 분포(p50/p95/p99/max)를 비교합니다. '
+            '네트워크를 거치지 않고 handler를 직접 호출하며, 배포 방식마다 별도의 프로세스에서 실행됩니다.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', type=str, help='요청을 보낼 사용자의 username')
+        parser.add_argument('path', type=str, help='요청할 경로 (예: /reservation/spaces/1/1/)')
+        parser.add_argument('--concurrency', type=int, default=32,
+                            help='동시에 처리되는 요청 수 (WSGI: thread 수, ASGI: 동시 task 수) (default: 32)')
+        parser.add_argument('--requests', type=int, default=320,
+                            help='전체 요청 수 (default: 320)')
+        parser.add_argument('--deployment', type=str, choices=DEPLOYMENTS,
+                            help='한 가지 배포 방식만 현재 프로세스에서 실행 (비교 시 내부적으로 사용됨)')
+
+    def handle(self, *args, **options):
+        if options['deployment'] is None:
+            return self.compare(options)
+
+        try:
+            user = get_user_model().objects.get(username=options['username'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User '{options['username']}' does not exist.")
+
+        client = Client()
+        client.force_login(user)
+        cookie = f'{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}'
+
+        # 배포에 사용되는 application(config/wsgi.py, config/asgi.py)을 그대로 사용하되,
+        # admission control이 동시 요청을 거절하지 않도록 끈 상태로 만듦 (middleware는 생성 시점의 설정으로 초기화됨)
+        with override_settings(ADMISSION_CONTROL={}):
+            application = importlib.import_module(f'config.{options["deployment"]}').application
+        if options['deployment'] == 'wsgi':
+            results, elapsed = self.run_wsgi(application, cookie, options)
+        else:
+            results, elapsed = asyncio.run(self.run_asgi(application, cookie, options))
+        self.report(results, elapsed)
+
+    def compare(self, options):
+        """
+        배포 방식마다 하위 프로세스를 실행하여 결과를 출력하는 메서드
+        view 선택(ASYNC_VIEWS)은 URLconf를 불러올 때 결정되므로 프로세스를 나누어 실행한다.
+        """
+        for deployment in DEPLOYMENTS:
+            env = dict(os.environ, DJANGO_ASYNC_VIEWS='1' if deployment == 'asgi' else '0')
+            command = [sys.executable, str(settings.BASE_DIR / 'manage.py'), 'async_views_benchmark',
+                       options['username'], options['path'], '--deployment', deployment,
+                       '--concurrency', str(options['concurrency']), '--requests', str(options['requests'])]
+            completed = subprocess.run(command, env=env, capture_output=True, text=True)
+            if completed.returncode != 0:
+                raise CommandError(completed.stderr.strip().splitlines()[-1])
+
+            self.stdout.write('WSGI (sync views)' if deployment == 'wsgi' else 'ASGI (async views)')
+            self.stdout.write(completed.stdout.rstrip())
+
+    def run_wsgi(self, handler, cookie, options):
+        path, _, query_string = options['path'].partition('?')
+
+        def send(_):
+            environ = {'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': query_string, 'HTTP_COOKIE': cookie}
+            setup_testing_defaults(environ)
+            status = []
+
+            started = time.monotonic()
+            response = handler(environ, lambda status_line, headers: status.append(int(status_line.split()[0])))
+            try:
+                b''.join(response)
+            finally:
+                response.close()
+            return status[0], time.monotonic() - started
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            results = list(executor.map(send, range(options['requests'])))
+        return results, time.monotonic() - started
+
+    async def run_asgi(self, application, cookie, options):
+        path, _, query_string = options['path'].partition('?')
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+            'path': path, 'raw_path': path.encode(), 'query_string': query_string.encode(), 'root_path': '',
+            'headers': [(b'host', b'127.0.0.1'), (b'cookie', cookie.encode())],
+            'client': ('127.0.0.1', 0), 'server': ('127.0.0.1', 80),
+        }
+        semaphore = asyncio.Semaphore(options['concurrency'])
+
+        async def send_request():
+            request_sent = asyncio.Event()
+            status = []
+
+            async def receive():
+                if not request_sent.is_set():
+                    request_sent.set()
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                # 응답이 끝날 때까지 연결을 유지함
+                await asyncio.Future()
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    status.append(message['status'])
+
+            async with semaphore:
+                started = time.monotonic()
+                await application(dict(scope), receive, send)
+                return status[0], time.monotonic() - started
+
+        started = time.monotonic()
+        results = await asyncio.gather(*(send_request() for _ in range(options['requests'])))
+        return results, time.monotonic() - started
+
+    def report(self, results, elapsed):
+        statuses = Counter(status for status, _ in results)
+        self.stdout.write(f'  {len(results)} requests in {elapsed:.2f}s ({len(results) / elapsed:.0f} req/s)')
+        self.stdout.write('  status: ' + ', '.join(f'{status} x {count}' for status, count in sorted(statuses.items())))
+
+        latencies = sorted(latency for _, latency in results)
+        quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        self.stdout.write(f'  latency: p50 {quantiles[49] * 1000:.0f}ms, p95 {quantiles[94] * 1000:.0f}ms, '
+                          f'p99 {quantiles[98] * 1000:.0f}ms, max {latencies[-1] * 1000:.0f}ms')
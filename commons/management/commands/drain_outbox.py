@@ -0,0 +1,49 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from commons.models import OutboxMessage
+from commons.transport_strategies import create_outbox_transport
+
+
+class Command(BaseCommand):
+    help = ('outbox에 쌓인 알림을 batch 단위로 꺼내 설정된 transport(OUTBOX)로 전달합니다. '
+            '전달에 실패한 알림은 backoff 후 다시 시도됩니다.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='지금 전달할 수 있는 알림을 모두 전달한 뒤 종료 (기본: 계속 실행)')
+        parser.add_argument('--poll-seconds', type=float, default=5.0,
+                            help='전달할 알림이 없을 때 다시 확인하기까지 대기할 시간(초) (default: 5)')
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help="한 번에 꺼낼 알림 수 (default: OUTBOX['batch_size'])")
+
+    def handle(self, *args, **options):
+        config = settings.OUTBOX
+        transport = create_outbox_transport(config['transport'], config.get('file_path'))
+        batch_size = options['batch_size'] or config['batch_size']
+
+        self.stdout.write(f"Draining outbox via '{config['transport']}' transport")
+
+        totals = [0, 0, 0]
+        try:
+            while True:
+                result = OutboxMessage.drain(
+                    transport, batch_size, config['lease_seconds'], config['max_attempts'],
+                    config['backoff_seconds'], config['max_backoff_seconds'],
+                    on_batch=lambda batch: self.stdout.write(
+                        f'  sent: {batch[0]}, retry: {batch[1]}, dead: {batch[2]}'
+                    ),
+                )
+                totals = [total + count for total, count in zip(totals, result)]
+
+                if options['once']:
+                    break
+                time.sleep(options['poll_seconds'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{totals[0]} messages sent, {totals[1]} scheduled for retry, {totals[2]} given up.'
+        ))
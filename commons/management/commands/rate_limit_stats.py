@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from commons.ratelimit import DatabaseTokenBucketStore
+
+
+class Command(BaseCommand):
+    help = ('scope별로 요청 허용량을 넘어 거절된 요청 수를 출력하고, 오래 사용되지 않은 bucket을 정리합니다. '
+            "(RATE_LIMIT_STORE = 'database'인 경우에만 여러 worker의 값이 합산되어 기록됨)")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--prune-idle-seconds', type=int, default=None,
+                            help='지정한 시간(초) 이상 사용되지 않은 bucket을 삭제')
+
+    def handle(self, *args, **options):
+        if settings.RATE_LIMIT_STORE != 'database':
+            self.stdout.write(self.style.WARNING(
+                f"RATE_LIMIT_STORE is '{settings.RATE_LIMIT_STORE}'; "
+                f"counts of each worker process are kept in its own memory."
+            ))
+
+        store = DatabaseTokenBucketStore()
+        counts = store.get_throttled_counts()
+        for name in sorted(counts.keys()):
+            self.stdout.write(f'  {name}: {counts[name]} throttled')
+        if not counts:
+            self.stdout.write('  No throttled requests recorded.')
+
+        if options['prune_idle_seconds'] is not None:
+            pruned = store.prune(options['prune_idle_seconds'])
+            self.stdout.write(self.style.SUCCESS(f'{pruned} idle buckets pruned.'))
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from commons.models import PeriodicJobLease, PeriodicJobRun
+from commons.periodic_jobs import get_periodic_jobs, get_worker_name, run_job, format_run, PeriodicJobScheduler
+
+
+class Command(BaseCommand):
+    help = ('설정(PERIODIC_JOBS)에 등록된 주기 작업을 실행 간격마다 실행합니다. '
+            '여러 서버에서 실행하더라도 각 작업은 DB lease를 얻은 한 worker에서만 실행되며, 실행 기록이 남습니다.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('jobs', nargs='*', help='실행할 작업 이름 (default: 등록된 모든 작업)')
+        parser.add_argument('--once', action='store_true',
+                            help='실행할 차례가 된 작업을 한 번씩 실행한 뒤 종료 (기본: 계속 실행)')
+        parser.add_argument('--force', action='store_true',
+                            help='--once와 함께 사용, 실행할 차례가 되지 않은 작업도 실행')
+        parser.add_argument('--list', action='store_true', help='작업별 다음 실행 일시와 마지막 실행 결과를 출력')
+
+    def handle(self, *args, **options):
+        try:
+            jobs = get_periodic_jobs(options['jobs'] or None)
+        except ValueError as e:
+            raise CommandError(e)
+
+        if options['list']:
+            return self.list_jobs(jobs)
+
+        owner = get_worker_name()
+        self.stdout.write(f'Running {len(jobs)} periodic jobs as {owner}')
+
+        if options['once']:
+            for job in jobs:
+                run = run_job(job, owner, force=options['force'])
+                self.stdout.write(format_run(run) if run is not None else f'{job.name}: skipped (not due or running)')
+            return
+
+        try:
+            PeriodicJobScheduler(jobs, owner, report=self.stdout.write).run_forever()
+        except KeyboardInterrupt:
+            self.stdout.write('Stopped.')
+
+    def list_jobs(self, jobs):
+        leases = {lease.name: lease for lease in PeriodicJobLease.objects.filter(name__in=[job.name for job in jobs])}
+        for job in jobs:
+            lease = leases.get(job.name)
+            last_run = PeriodicJobRun.objects.filter(name=job.name).order_by('-started_at').first()
+
+            self.stdout.write(f'{job.name} (every {job.interval_seconds:g}s)')
+            self.stdout.write(f'  next run: {lease.next_run_at if lease else "now"}'
+                              + (f', running on {lease.owner}' if lease and lease.owner else ''))
+            if last_run is not None:
+                self.stdout.write(f'  last run: {last_run.started_at}, {format_run(last_run)}')
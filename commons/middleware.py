@@ -0,0 +1,394 @@
+import asyncio
+import json
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from typing import Deque, Dict, List, Optional, Tuple, Union
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.urls import resolve, Resolver404
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from commons.views import overloaded_view
+from utils.database import database_sync_to_async
+
+
+class ConcurrencyLimiter:
+    """
+    동시에 처리되는 요청 수를 max_concurrent로 제한하는 limiter (WSGI, 요청마다 thread에서 처리되는 경우)
+    자리가 없는 경우 최대 max_queue개의 요청만 queue_timeout초 동안 기다리게 하고, 그 외의 요청은 바로 거절한다.
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self._condition = threading.Condition()
+        self.active = 0
+        self.waiting = 0
+        # 거절된 요청 수 (모니터링용)
+        self.shed = 0
+
+    def acquire(self) -> bool:
+        """
+        처리할 자리를 얻는 메서드
+        :return: 자리를 얻은 경우 True, 대기열이 가득 찼거나 대기 시간이 초과된 경우 False
+        """
+        with self._condition:
+            if self.active < self.max_concurrent:
+                self.active += 1
+                return True
+
+            if self.waiting >= self.max_queue:
+                self.shed += 1
+                return False
+
+            self.waiting += 1
+            try:
+                admitted = self._condition.wait_for(lambda: self.active < self.max_concurrent, self.queue_timeout)
+            finally:
+                self.waiting -= 1
+
+            if admitted:
+                self.active += 1
+            else:
+                self.shed += 1
+            return admitted
+
+    def release(self) -> None:
+        with self._condition:
+            self.active -= 1
+            self._condition.notify()
+
+
+class AsyncConcurrencyLimiter:
+    """
+    동시에 처리되는 요청 수를 max_concurrent로 제한하는 limiter (ASGI, event loop에서 처리되는 경우)
+    대기하는 요청이 thread를 점유하지 않도록 event loop에서 기다리며, 반납된 자리는 먼저 기다린 요청에게 넘겨준다.
+    (한 event loop에서만 사용되므로 lock이 필요하지 않음)
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.active = 0
+        # 거절된 요청 수 (모니터링용)
+        self.shed = 0
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> bool:
+        """
+        처리할 자리를 얻는 메서드
+        :return: 자리를 얻은 경우 True, 대기열이 가득 찼거나 대기 시간이 초과된 경우 False
+        """
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            return True
+
+        if len(self._waiters) >= self.max_queue:
+            self.shed += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # release()가 자리를 넘겨주면 active를 그대로 이어받음
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+            return True
+        except asyncio.TimeoutError:
+            if waiter.done():
+                # 대기 시간이 끝나는 순간 자리를 넘겨받은 경우
+                return True
+            waiter.cancel()
+            self.shed += 1
+            return False
+        except asyncio.CancelledError:
+            # 자리를 넘겨받은 뒤 요청이 취소된 경우(연결 끊김 등) 자리를 다시 반납함
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            waiter.cancel()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(True)
+                return
+        self.active -= 1
+
+
+class AdmissionControlMiddleware:
+    """
+    엔드포인트 분류(ADMISSION_CONTROL)별로 동시에 처리되는 요청 수를 제한하는 middleware
+    제한을 넘는 요청은 잠시 대기시키거나 Retry-After와 함께 503 응답으로 거절하여, 요청이 쌓여 모든 worker가
+    느려지는 대신 처리되는 요청의 응답 시간을 일정하게 유지한다.
+    (제한은 worker 프로세스마다 적용됨)
+    ASGI로 실행하는 경우에는 자리를 기다리는 요청이 sync view를 실행하는 thread를 점유하지 않도록
+    event loop에서 기다린다. (AsyncConcurrencyLimiter)
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        is_async = asyncio.iscoroutinefunction(get_response)
+        if is_async:
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+        limiter_class = AsyncConcurrencyLimiter if is_async else ConcurrencyLimiter
+
+        # {분류 이름: limiter}, {view 경로: (분류 이름, 적용할 method 목록)}
+        self.limiters: Dict[str, Union[ConcurrencyLimiter, AsyncConcurrencyLimiter]] = dict()
+        self.view_classes: Dict[str, tuple] = dict()
+        self.retry_after: Dict[str, int] = dict()
+        for name, config in getattr(settings, 'ADMISSION_CONTROL', {}).items():
+            self.limiters[name] = limiter_class(config['max_concurrent'], config.get('max_queue', 0),
+                                                config.get('queue_timeout', 0))
+            self.retry_after[name] = config.get('retry_after', 1)
+            methods = {method.upper() for method in config.get('methods', [])}
+            for view_path in config['views']:
+                self.view_classes[view_path] = (name, methods)
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        name = self.get_limiter_name(request)
+        if name is None:
+            return self.get_response(request)
+
+        if not self.limiters[name].acquire():
+            return overloaded_view(request, self.retry_after[name])
+        try:
+            return self.get_response(request)
+        finally:
+            self.limiters[name].release()
+
+    async def __acall__(self, request):
+        name = self.get_limiter_name(request)
+        if name is None:
+            return await self.get_response(request)
+
+        if not await self.limiters[name].acquire():
+            # 503 page는 template을 렌더링하므로(session, 사용자 조회) thread에서 실행함
+            return await database_sync_to_async(overloaded_view)(request, self.retry_after[name])
+        try:
+            return await self.get_response(request)
+        finally:
+            self.limiters[name].release()
+
+    def get_limiter_name(self, request) -> Optional[str]:
+        """
+        요청된 view가 속한 엔드포인트 분류 이름을 반환하는 메서드 (제한 대상이 아닌 경우 None)
+        view가 실행되기 전에 자리를 얻어야 하므로, URL 경로로 view를 직접 찾는다.
+        """
+        if not self.view_classes:
+            return None
+        try:
+            match = resolve(request.path_info, getattr(request, 'urlconf', None))
+        except Resolver404:
+            return None
+
+        view = getattr(match.func, 'view_class', match.func)
+        matched = self.view_classes.get(f'{view.__module__}.{view.__qualname__}')
+        if matched is None:
+            return None
+
+        name, methods = matched
+        if methods and request.method not in methods:
+            return None
+        return name
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    sync/async를 모두 지원하는 WhiteNoiseMiddleware
+    WhiteNoiseMiddleware는 sync만 지원하므로, ASGI로 실행하는 경우 이후의 middleware와 view가 모두 thread에서 실행된다.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super(StaticFilesMiddleware, self).__init__(get_response, settings)
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        return super(StaticFilesMiddleware, self).__call__(request)
+
+    async def __acall__(self, request):
+        # autorefresh(DEBUG)인 경우 정적 파일을 찾을 때 파일 시스템을 조회하므로 thread에서 실행함
+        if self.autorefresh:
+            response = await sync_to_async(self.process_request)(request)
+        else:
+            response = self.process_request(request)
+        if response is None:
+            response = await self.get_response(request)
+        return response
+
+
+query_logger = logging.getLogger('commons.queries')
+
+# 같은 형태의 SQL로 묶기 위해 IN (%s, %s, ...)의 placeholder 수를 하나로 줄임
+IN_PLACEHOLDERS = re.compile(r'\(\s*%s(?:\s*,\s*%s)+\s*\)')
+
+# 현재 요청의 QueryRecorder (sync_to_async로 실행되는 thread에도 전달됨)
+current_query_recorder: ContextVar[Optional['QueryRecorder']] = ContextVar('current_query_recorder', default=None)
+
+
+class QueryRecorder:
+    """
+    한 요청에서 실행된 SQL의 수, DB 시간, 형태별 실행 횟수를 기록하는 recorder
+    async view에서는 여러 thread에서 동시에 SQL이 실행될 수 있으므로 lock으로 보호한다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def record(self, sql: str, duration: float) -> None:
+        shape = IN_PLACEHOLDERS.sub('(%s, ...)', sql)
+        with self._lock:
+            self.count += 1
+            self.duration += duration
+            self.shapes[shape] += 1
+
+    def get_duplicates(self) -> List[Tuple[str, int]]:
+        """
+        두 번 이상 실행된 SQL 형태와 실행 횟수를 많이 실행된 순서로 반환하는 메서드 (N+1 조회의 단서)
+        """
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > 1]
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    현재 요청의 QueryRecorder에 실행된 SQL을 기록하는 execute wrapper
+    기록 중인 요청이 아닌 경우 바로 실행한다.
+    """
+    recorder = current_query_recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        recorder.record(sql, time.perf_counter() - started)
+
+
+def install_query_wrapper(connection, **kwargs) -> None:
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+# thread pool(async view의 조회)에서 새로 연결되는 DB connection에도 wrapper를 등록함
+connection_created.connect(install_query_wrapper)
+
+
+class QueryInstrumentationMiddleware:
+    """
+    요청마다 실행된 SQL의 수, DB 시간, 중복 실행된 SQL 형태를 기록하는 middleware (QUERY_INSTRUMENTATION)
+    - 기록은 sample_rate의 비율로 선택된 요청에만 적용되며, 요청마다 한 줄의 JSON log를 남긴다.
+    - view class에 선언된 query_budget(요청당 SQL 수)을 넘은 요청은 WARNING으로 기록한다.
+    - DEBUG인 경우 기록된 요청의 응답에 Server-Timing header로 SQL 수와 DB 시간을 추가한다.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+        config = getattr(settings, 'QUERY_INSTRUMENTATION', {})
+        self.sample_rate = config.get('sample_rate', 0.0)
+        self.default_budget = config.get('default_budget')
+        self.max_logged_duplicates = config.get('max_logged_duplicates', 5)
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        if not self.is_sampled():
+            return self.get_response(request)
+
+        # 요청을 처리하는 thread에서 이미 연결된 connection에도 wrapper를 등록함
+        for alias in connections:
+            install_query_wrapper(connections[alias])
+
+        recorder = QueryRecorder()
+        token = current_query_recorder.set(recorder)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_query_recorder.reset(token)
+        self.report(request, response, recorder)
+        return response
+
+    async def __acall__(self, request):
+        if not self.is_sampled():
+            return await self.get_response(request)
+
+        recorder = QueryRecorder()
+        token = current_query_recorder.set(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_query_recorder.reset(token)
+        self.report(request, response, recorder)
+        return response
+
+    def is_sampled(self) -> bool:
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view = getattr(view_func, 'view_class', view_func)
+        request._query_view = f'{view.__module__}.{view.__qualname__}'
+        request._query_budget = getattr(view, 'query_budget', self.default_budget)
+        return None
+
+    def report(self, request, response, recorder: QueryRecorder) -> None:
+        budget = getattr(request, '_query_budget', self.default_budget)
+        over_budget = budget is not None and recorder.count > budget
+        duplicates = recorder.get_duplicates()
+
+        query_logger.log(logging.WARNING if over_budget else logging.INFO, json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'view': getattr(request, '_query_view', None),
+            'status': response.status_code,
+            'queries': recorder.count,
+            'db_ms': round(recorder.duration * 1000, 2),
+            'budget': budget,
+            'over_budget': over_budget,
+            'duplicated_queries': sum(count - 1 for _, count in duplicates),
+            'duplicates': [{'count': count, 'sql': shape[:300]}
+                           for shape, count in duplicates[:self.max_logged_duplicates]],
+        }, ensure_ascii=False))
+
+        if settings.DEBUG:
+            description = f'{recorder.count} queries, {len(duplicates)} duplicated shapes'
+            if over_budget:
+                description += f', over budget {budget}'
+            response['Server-Timing'] = f'db;dur={recorder.duration * 1000:.2f};desc="{description}"'
+
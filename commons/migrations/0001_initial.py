@@ -0,0 +1,39 @@
+# Generated by Django 4.0.4 on 2026-10-19 14:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RateLimitBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255, unique=True, verbose_name='bucket key')),
+                ('tokens', models.FloatField(verbose_name='남은 token 수')),
+                ('updated_at', models.FloatField(db_index=True, verbose_name='갱신 시각')),
+            ],
+            options={
+                'verbose_name': '요청 제한 bucket',
+                'verbose_name_plural': '요청 제한 bucket 목록',
+            },
+        ),
+        migrations.CreateModel(
+            name='ThrottleCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='scope:제한 기준')),
+                ('count', models.PositiveBigIntegerField(default=0, verbose_name='거절된 요청 수')),
+            ],
+            options={
+                'verbose_name': '거절된 요청 수',
+                'verbose_name_plural': '거절된 요청 수 목록',
+            },
+        ),
+    ]
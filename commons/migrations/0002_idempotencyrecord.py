@@ -0,0 +1,37 @@
+# Generated by Django 4.0.4 on 2026-10-19 15:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('commons', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성 일시')),
+                ('expires_at', models.DateTimeField(db_index=True, verbose_name='만료 일시')),
+                ('scope', models.CharField(max_length=50, verbose_name='요청 분류')),
+                ('key', models.CharField(max_length=64, verbose_name='idempotency key')),
+                ('response_status', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='응답 코드')),
+                ('response_location', models.CharField(blank=True, default='', max_length=2048, verbose_name='redirect 경로')),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='idempotency_records', to=settings.AUTH_USER_MODEL, verbose_name='요청한 사용자')),
+            ],
+            options={
+                'verbose_name': '중복 요청 방지 기록',
+                'verbose_name_plural': '중복 요청 방지 기록 목록',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='idempotencyrecord',
+            constraint=models.UniqueConstraint(fields=('user', 'scope', 'key'), name='single record per idempotency key'),
+        ),
+    ]
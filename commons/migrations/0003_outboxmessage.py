@@ -0,0 +1,41 @@
+# Generated by Django 4.0.4 on 2026-10-19 18:00
+
+from django.conf import settings
+import django.core.serializers.json
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('commons', '0002_idempotencyrecord'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성 일시')),
+                ('topic', models.CharField(max_length=50, verbose_name='알림 종류')),
+                ('payload', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='알림 내용')),
+                ('status', models.CharField(choices=[('pending', '전달 대기'), ('sent', '전달 완료'), ('dead', '전달 포기')], default='pending', max_length=10, verbose_name='상태')),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='전달 시도 일시')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='전달 시도 횟수')),
+                ('last_error', models.TextField(blank=True, default='', verbose_name='마지막 오류')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='전달 일시')),
+                ('recipient', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='outbox_messages', to=settings.AUTH_USER_MODEL, verbose_name='받는 사용자')),
+            ],
+            options={
+                'verbose_name': '알림 outbox',
+                'verbose_name_plural': '알림 outbox 목록',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='outboxmessage',
+            index=models.Index(fields=['status', 'available_at'], name='outbox_status_available'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.0.4 on 2026-10-19 19:00
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('commons', '0003_outboxmessage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PeriodicJobLease',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='작업 이름')),
+                ('next_run_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='다음 실행 일시')),
+                ('owner', models.CharField(blank=True, default='', max_length=100, verbose_name='실행 중인 worker')),
+                ('leased_until', models.DateTimeField(blank=True, null=True, verbose_name='lease 만료 일시')),
+            ],
+            options={
+                'verbose_name': '주기 작업 일정',
+                'verbose_name_plural': '주기 작업 일정 목록',
+            },
+        ),
+        migrations.CreateModel(
+            name='PeriodicJobRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='작업 이름')),
+                ('owner', models.CharField(max_length=100, verbose_name='실행한 worker')),
+                ('started_at', models.DateTimeField(verbose_name='시작 일시')),
+                ('duration', models.FloatField(verbose_name='실행 시간(초)')),
+                ('status', models.CharField(choices=[('succeeded', '성공'), ('failed', '실패')], max_length=10, verbose_name='결과')),
+                ('result', models.TextField(blank=True, default='', verbose_name='결과 내용')),
+            ],
+            options={
+                'verbose_name': '주기 작업 실행 기록',
+                'verbose_name_plural': '주기 작업 실행 기록 목록',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='periodicjobrun',
+            index=models.Index(fields=['name', '-started_at'], name='periodic_job_run_name_started'),
+        ),
+    ]
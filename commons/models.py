@@ -1,3 +1,346 @@
-from django.db import models
+import random
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+
+class AliveManager(models.Manager):
+    """
+    삭제 요청되지 않은(deleted_at이 비어 있는) instance만 조회하는 Manager
+    """
+
+    def get_queryset(self):
+        return super(AliveManager, self).get_queryset().filter(deleted_at__isnull=True)
+
+
+class SoftDeleteModel(models.Model):
+    """
+    삭제 요청 시 즉시 숨겨지고, 실제 삭제(purge)는 작업 프로세스에서 나누어 수행되는 model
+    - objects: 삭제 요청되지 않은 instance만 조회 (related manager에도 적용됨)
+    - all_objects: 삭제 요청된 instance를 포함한 모든 instance를 조회
+    """
+    deleted_at = models.DateTimeField('삭제 요청 일시', null=True, blank=True, db_index=True)
+
+    objects = AliveManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        abstract = True
+
+    def soft_delete(self) -> None:
+        """
+        instance를 삭제 요청 상태로 변경하는 메서드
+        연결된 instance들은 purge_deleted_objects 명령에 의해 나누어 삭제된다.
+        """
+        self.deleted_at = timezone.now()
+        self.save(update_fields=['deleted_at'])
+
+
+def delete_in_batches(queryset, batch_size: int, on_progress=None) -> int:
+    """
+    queryset에 포함된 instance를 batch_size개씩 나누어, batch마다 별도의 transaction으로 삭제하는 함수
+    :param queryset: 삭제할 instance의 queryset
+    :param batch_size: 한 transaction에서 삭제할 instance의 수
+    :param on_progress: batch 삭제 후 (삭제된 수, 전체 수)를 인자로 호출될 함수
+    :return: 삭제된 instance의 수
+    """
+    model = queryset.model
+    total = queryset.count()
+    deleted = 0
+
+    while True:
+        pks = list(queryset.order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            break
+
+        with transaction.atomic():
+            model._base_manager.filter(pk__in=pks).delete()
+
+        deleted += len(pks)
+        if on_progress is not None:
+            on_progress(deleted, max(total, deleted))
+
+    return deleted
+
+
+class RateLimitBucket(models.Model):
+    """
+    요청 허용량 제한(rate limit)에 사용되는 token bucket
+    RATE_LIMIT_STORE가 'database'인 경우에만 사용되며, 여러 worker 프로세스가 같은 bucket을 공유한다.
+    """
+    key = models.CharField('bucket key', max_length=255, unique=True)
+    tokens = models.FloatField('남은 token 수')
+    # 마지막으로 token이 계산된 시각 (UNIX timestamp)
+    updated_at = models.FloatField('갱신 시각', db_index=True)
+
+    class Meta:
+        verbose_name = '요청 제한 bucket'
+        verbose_name_plural = '요청 제한 bucket 목록'
+
+
+class ThrottleCounter(models.Model):
+    """
+    요청 허용량을 넘어 거절된 요청 수 (scope, 제한 기준별)
+    """
+    name = models.CharField('scope:제한 기준', max_length=255, unique=True)
+    count = models.PositiveBigIntegerField('거절된 요청 수', default=0)
+
+    class Meta:
+        verbose_name = '거절된 요청 수'
+        verbose_name_plural = '거절된 요청 수 목록'
+
+
+class IdempotencyRecord(models.Model):
+    """
+    idempotency key로 처리된 POST 요청의 결과
+    같은 key로 다시 요청된 경우 요청을 다시 처리하지 않고 저장된 redirect를 그대로 응답한다.
+    - response_location이 비어 있는 경우 아직 처리 중인 요청 (expires_at: 처리 중인 요청의 lease 만료 일시)
+    """
+    created_at = models.DateTimeField('생성 일시', auto_now_add=True)
+    expires_at = models.DateTimeField('만료 일시', db_index=True)
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, on_delete=models.CASCADE,
+                             related_name='idempotency_records', verbose_name='요청한 사용자')
+    scope = models.CharField('요청 분류', max_length=50)
+    key = models.CharField('idempotency key', max_length=64)
+
+    response_status = models.PositiveSmallIntegerField('응답 코드', null=True, blank=True)
+    response_location = models.CharField('redirect 경로', max_length=2048, blank=True, default='')
+
+    class Meta:
+        verbose_name = '중복 요청 방지 기록'
+        verbose_name_plural = '중복 요청 방지 기록 목록'
+        constraints = (
+            models.UniqueConstraint(fields=['user', 'scope', 'key'], name='single record per idempotency key'),
+        )
+
+    @property
+    def is_completed(self) -> bool:
+        return self.response_status is not None
+
+
+class OutboxMessage(models.Model):
+    """
+    전달할 알림(transactional outbox)
+    알림의 원인이 된 변경과 같은 transaction에서 추가되므로, 변경이 commit된 경우에만 알림이 전달되며 요청 처리 중에는
+    알림을 보내지 않는다. drain_outbox 명령이 batch 단위로 꺼내어 transport(OUTBOX['transport'])로 전달하며,
+    전달에 실패한 알림은 점점 긴 간격을 두고 다시 시도된다.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_SENT = 'sent'
+    STATUS_DEAD = 'dead'
+    STATUS_CHOICES = (
+        (STATUS_PENDING, '전달 대기'),
+        (STATUS_SENT, '전달 완료'),
+        (STATUS_DEAD, '전달 포기'),
+    )
+
+    created_at = models.DateTimeField('생성 일시', auto_now_add=True)
+
+    topic = models.CharField('알림 종류', max_length=50)
+    recipient = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, on_delete=models.CASCADE,
+                                  related_name='outbox_messages', verbose_name='받는 사용자')
+    payload = models.JSONField('알림 내용', default=dict, encoder=DjangoJSONEncoder)
+
+    status = models.CharField('상태', max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    # 다음 전달 시도 일시 (전달 중인 알림은 lease가 끝나는 일시)
+    available_at = models.DateTimeField('전달 시도 일시', default=timezone.now)
+    attempts = models.PositiveIntegerField('전달 시도 횟수', default=0)
+    last_error = models.TextField('마지막 오류', blank=True, default='')
+    sent_at = models.DateTimeField('전달 일시', null=True, blank=True)
+
+    class Meta:
+        verbose_name = '알림 outbox'
+        verbose_name_plural = '알림 outbox 목록'
+        indexes = (
+            models.Index(fields=['status', 'available_at'], name='outbox_status_available'),
+        )
+
+    def __str__(self):
+        return f'#{self.pk} {self.topic} ({self.status})'
+
+    @classmethod
+    def enqueue(cls, topic: str, messages: Iterable[Tuple[Optional[int], Dict]]) -> List['OutboxMessage']:
+        """
+        알림을 outbox에 추가하는 메서드
+        알림의 원인이 된 변경을 수행하는 transaction 안에서 호출되어야 한다.
+        :param topic: 알림 종류 (예: 'reservation.confirmed')
+        :param messages: (받는 사용자의 pk, 알림 내용) 목록
+        """
+        return cls.objects.bulk_create([
+            cls(topic=topic, recipient_id=recipient_id, payload=payload) for recipient_id, payload in messages
+        ])
+
+    @classmethod
+    def claim(cls, batch_size: int, lease_seconds: float) -> List['OutboxMessage']:
+        """
+        전달할 알림을 batch_size개까지 꺼내는 메서드
+        꺼낸 알림은 lease_seconds 동안 다른 worker가 꺼내지 않으며, 그 안에 결과가 기록되지 않으면(worker 중단 등) 다시 전달된다.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            # 여러 worker가 동시에 꺼내는 경우 다른 worker가 잠근 알림은 건너뜀
+            pks = list(
+                cls.objects.select_for_update(skip_locked=True)
+                .filter(status=cls.STATUS_PENDING, available_at__lte=now)
+                .order_by('available_at', 'pk').values_list('pk', flat=True)[:batch_size]
+            )
+            cls.objects.filter(pk__in=pks).update(available_at=now + timezone.timedelta(seconds=lease_seconds),
+                                                  attempts=F('attempts') + 1)
+        return list(cls.objects.filter(pk__in=pks).select_related('recipient').order_by('available_at', 'pk'))
+
+    @classmethod
+    def deliver_batch(cls, transport, batch_size: int, lease_seconds: float, max_attempts: int,
+                      backoff_seconds: float, max_backoff_seconds: float) -> Tuple[int, int, int]:
+        """
+        알림 한 batch를 꺼내 transport로 전달하고 결과를 기록하는 메서드
+        전달에 실패한 알림은 backoff_seconds * 2^(시도 횟수 - 1)초(최대 max_backoff_seconds초, 50~100% 사이의 무작위 값) 뒤에
+        다시 시도되며, max_attempts번 실패하면 더 이상 시도하지 않는다(STATUS_DEAD).
+        :param transport: 알림을 전달할 OutboxTransport
+        :return: (전달된 수, 다시 시도할 수, 포기한 수) (모두 0인 경우 전달할 알림이 없음)
+        """
+        messages = cls.claim(batch_size, lease_seconds)
+        if not messages:
+            return 0, 0, 0
+
+        try:
+            failures = transport.send(messages)
+        except Exception as e:
+            # batch 전체의 전달에 실패한 경우
+            failures = {message.pk: f'{type(e).__name__}: {e}' for message in messages}
+
+        now = timezone.now()
+        sent = [message.pk for message in messages if message.pk not in failures]
+        cls.objects.filter(pk__in=sent).update(status=cls.STATUS_SENT, sent_at=now, last_error='')
+
+        retried, dead = 0, 0
+        for message in messages:
+            if message.pk not in failures:
+                continue
+            message.last_error = failures[message.pk]
+            if message.attempts >= max_attempts:
+                message.status = cls.STATUS_DEAD
+                dead += 1
+            else:
+                delay = min(backoff_seconds * 2 ** (message.attempts - 1), max_backoff_seconds)
+                message.available_at = now + timezone.timedelta(seconds=delay * random.uniform(0.5, 1.0))
+                retried += 1
+        cls.objects.bulk_update([message for message in messages if message.pk in failures],
+                                ['status', 'available_at', 'last_error'])
+
+        return len(sent), retried, dead
+
+    @classmethod
+    def drain(cls, transport, batch_size: int, lease_seconds: float, max_attempts: int,
+              backoff_seconds: float, max_backoff_seconds: float, on_batch=None) -> Tuple[int, int, int]:
+        """
+        지금 전달할 수 있는 알림이 남지 않을 때까지 deliver_batch를 반복하는 메서드
+        drain_outbox 명령과 주기 작업에서 함께 사용된다.
+        :param on_batch: batch마다 deliver_batch의 결과를 인자로 호출될 함수
+        :return: (전달된 수, 다시 시도할 수, 포기한 수)의 합계
+        """
+        totals = (0, 0, 0)
+        while True:
+            result = cls.deliver_batch(transport, batch_size, lease_seconds, max_attempts,
+                                       backoff_seconds, max_backoff_seconds)
+            if not any(result):
+                break
+
+            totals = tuple(total + count for total, count in zip(totals, result))
+            if on_batch is not None:
+                on_batch(result)
+        return totals
+
+
+class PeriodicJobLease(models.Model):
+    """
+    주기 작업(PERIODIC_JOBS)별 실행 일정과 실행 권한(lease)
+    여러 서버에서 run_periodic_jobs 명령을 실행하더라도 lease를 얻은 한 worker만 작업을 실행하며,
+    다음 실행 일시도 이 행에 기록되어 모든 worker가 같은 일정을 따른다.
+    """
+    name = models.CharField('작업 이름', max_length=100, unique=True)
+    next_run_at = models.DateTimeField('다음 실행 일시', default=timezone.now)
+    # 실행 중인 worker와 lease 만료 일시 (만료될 때까지 결과가 기록되지 않으면 다른 worker가 다시 실행함)
+    owner = models.CharField('실행 중인 worker', max_length=100, blank=True, default='')
+    leased_until = models.DateTimeField('lease 만료 일시', null=True, blank=True)
+
+    class Meta:
+        verbose_name = '주기 작업 일정'
+        verbose_name_plural = '주기 작업 일정 목록'
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def acquire(cls, name: str, owner: str, lease_seconds: float, force: bool = False) -> bool:
+        """
+        실행할 차례가 된 작업의 lease를 얻는 메서드
+        조건부 UPDATE 한 번으로 얻으므로, 여러 worker가 동시에 시도해도 한 worker만 성공한다.
+        :param force: True인 경우 다음 실행 일시가 되지 않았더라도 lease를 얻음 (다른 worker가 실행 중인 경우는 제외)
+        :return: lease를 얻었는지 여부
+        """
+        now = timezone.now()
+        cls.objects.get_or_create(name=name, defaults={'next_run_at': now})
+
+        leases = cls.objects.filter(Q(leased_until__isnull=True) | Q(leased_until__lte=now), name=name)
+        if not force:
+            leases = leases.filter(next_run_at__lte=now)
+        return bool(leases.update(owner=owner, leased_until=now + timezone.timedelta(seconds=lease_seconds)))
+
+    @classmethod
+    def release(cls, name: str, owner: str, next_run_at: datetime) -> bool:
+        """
+        작업을 마친 뒤 lease를 반납하고 다음 실행 일시를 기록하는 메서드
+        :return: 반납할 때까지 lease를 유지했는지 여부 (False인 경우 lease가 만료되어 다른 worker가 가져감)
+        """
+        return bool(cls.objects.filter(name=name, owner=owner).update(
+            owner='', leased_until=None, next_run_at=next_run_at,
+        ))
+
+    @classmethod
+    def get_wait_seconds(cls, name: str) -> float:
+        """
+        작업을 다시 실행할 수 있을 때까지 남은 시간(초)을 반환하는 메서드
+        다른 worker가 실행 중인 경우에는 다음 실행 일시와 lease 만료 일시 중 늦은 시각까지 기다린다.
+        """
+        lease = cls.objects.filter(name=name).first()
+        if lease is None:
+            return 0.0
+        available_at = max(lease.next_run_at, lease.leased_until or lease.next_run_at)
+        return max((available_at - timezone.now()).total_seconds(), 0.0)
+
+
+class PeriodicJobRun(models.Model):
+    """
+    주기 작업의 실행 기록 (실행 시간과 결과)
+    """
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = (
+        (STATUS_SUCCEEDED, '성공'),
+        (STATUS_FAILED, '실패'),
+    )
+
+    name = models.CharField('작업 이름', max_length=100)
+    owner = models.CharField('실행한 worker', max_length=100)
+    started_at = models.DateTimeField('시작 일시')
+    duration = models.FloatField('실행 시간(초)')
+    status = models.CharField('결과', max_length=10, choices=STATUS_CHOICES)
+    # 성공한 경우 작업이 반환한 요약, 실패한 경우 traceback
+    result = models.TextField('결과 내용', blank=True, default='')
+
+    class Meta:
+        verbose_name = '주기 작업 실행 기록'
+        verbose_name_plural = '주기 작업 실행 기록 목록'
+        indexes = (
+            models.Index(fields=['name', '-started_at'], name='periodic_job_run_name_started'),
+        )
+
+    def __str__(self):
+        return f'{self.name} ({self.status}, {self.started_at})'
 
-# Create your models here.
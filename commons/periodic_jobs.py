@@ -0,0 +1,124 @@
+import heapq
+import os
+import socket
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, DatabaseError
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from commons.models import PeriodicJobLease, PeriodicJobRun
+
+# lease를 얻지 못한 작업을 다시 확인하기까지 기다리는 최소 시간(초)
+MIN_WAIT_SECONDS = 1.0
+# DB에 연결할 수 없는 등 일정을 확인하지 못한 경우 다시 시도하기까지 기다리는 시간(초)
+ERROR_RETRY_SECONDS = 30.0
+
+
+@dataclass
+class PeriodicJob:
+    name: str
+    function: Callable[[], Optional[str]]
+    interval_seconds: float
+    lease_seconds: float
+
+
+def get_periodic_jobs(names: Iterable[str] = None) -> List[PeriodicJob]:
+    """
+    설정(PERIODIC_JOBS)에 등록된 주기 작업 목록을 반환하는 함수
+    :param names: 전달된 경우 해당 이름의 작업만 반환함
+    :raises ValueError: 등록되지 않은 작업 이름이 전달된 경우
+    """
+    configs = settings.PERIODIC_JOBS
+    if names is not None:
+        unknown = [name for name in names if name not in configs]
+        if unknown:
+            raise ValueError(f'Unknown periodic jobs: {", ".join(unknown)}')
+        configs = {name: configs[name] for name in names}
+
+    return [
+        PeriodicJob(name=name, function=import_string(config['function']),
+                    interval_seconds=config['interval_seconds'],
+                    lease_seconds=config.get('lease_seconds', settings.PERIODIC_JOB_LEASE_SECONDS))
+        for name, config in configs.items()
+    ]
+
+
+def get_worker_name() -> str:
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def run_job(job: PeriodicJob, owner: str, force: bool = False) -> Optional[PeriodicJobRun]:
+    """
+    작업의 lease를 얻은 경우 작업을 실행하고, 실행 시간과 결과를 기록하는 메서드
+    작업에서 발생한 예외는 실패로 기록되며, 다음 실행 일시는 성공 여부와 관계없이 실행 간격만큼 뒤로 정해진다.
+    :param owner: 실행하는 worker의 이름
+    :param force: True인 경우 다음 실행 일시가 되지 않았더라도 실행함
+    :return: 실행 기록 (다른 worker가 실행 중이거나 실행할 차례가 아닌 경우 None)
+    """
+    if not PeriodicJobLease.acquire(job.name, owner, job.lease_seconds, force=force):
+        return None
+
+    started_at = timezone.now()
+    started = time.monotonic()
+    try:
+        result, status = str(job.function() or ''), PeriodicJobRun.STATUS_SUCCEEDED
+    except Exception:
+        result, status = traceback.format_exc(), PeriodicJobRun.STATUS_FAILED
+    duration = time.monotonic() - started
+
+    # 다음 실행 일시는 시작 일시를 기준으로 정함 (실행 시간만큼 일정이 밀리지 않도록)
+    next_run_at = started_at + timezone.timedelta(seconds=job.interval_seconds)
+    if not PeriodicJobLease.release(job.name, owner, next_run_at):
+        result += f'\n(lease expired after {job.lease_seconds}s; another worker may have run this job concurrently)'
+
+    return PeriodicJobRun.objects.create(name=job.name, owner=owner, started_at=started_at, duration=duration,
+                                         status=status, result=result.strip())
+
+
+class PeriodicJobScheduler:
+    """
+    주기 작업을 다음 실행 시각 순서(heap)로 실행하는 scheduler
+    실행 시각이 된 작업은 lease를 얻은 경우에만 실행되며, 이후 DB에 기록된 다음 실행 일시까지 기다린다.
+    (다른 worker가 실행한 경우에도 같은 일정을 따름)
+    """
+
+    def __init__(self, jobs: List[PeriodicJob], owner: str, report: Callable[[str], None] = None):
+        self.owner = owner
+        self.report = report or (lambda message: None)
+        # (실행 시각(monotonic), 등록 순서, 작업) - 실행 시각이 같은 경우 등록 순서대로 실행함
+        self.queue = [(0.0, index, job) for index, job in enumerate(jobs)]
+        heapq.heapify(self.queue)
+
+    def run_forever(self) -> None:
+        while self.queue:
+            due, index, job = heapq.heappop(self.queue)
+            wait = due - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            heapq.heappush(self.queue, (time.monotonic() + self.run_pending(job), index, job))
+
+    def run_pending(self, job: PeriodicJob) -> float:
+        """
+        실행할 차례가 된 작업을 실행하는 메서드
+        :return: 작업을 다시 확인하기까지 기다릴 시간(초)
+        """
+        # 오래 실행되는 프로세스이므로 끊어졌거나 수명이 지난 DB 연결을 정리함
+        close_old_connections()
+        try:
+            run = run_job(job, self.owner)
+            if run is not None:
+                self.report(format_run(run))
+            return max(PeriodicJobLease.get_wait_seconds(job.name), MIN_WAIT_SECONDS)
+        except DatabaseError as e:
+            self.report(f'{job.name}: could not check the schedule ({e}), retrying in {ERROR_RETRY_SECONDS:.0f}s')
+            return ERROR_RETRY_SECONDS
+
+
+def format_run(run: PeriodicJobRun) -> str:
+    summary = run.result.splitlines()[-1] if run.result else ''
+    return f'{run.name}: {run.status} in {run.duration:.2f}s' + (f' - {summary}' if summary else '')
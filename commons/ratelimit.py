@@ -0,0 +1,217 @@
+import functools
+import threading
+import time
+from abc import ABCMeta, abstractmethod
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction, IntegrityError
+from django.db.models import F
+
+from commons.models import RateLimitBucket, ThrottleCounter
+from commons.views import throttled_view
+
+_PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60}
+
+
+def parse_rate(rate: str) -> Tuple[int, float]:
+    """
+    '횟수/기간' 형태의 허용량을 (bucket 크기, 초당 채워지는 token 수)로 변환하는 함수
+    예) '30/m' => 연속으로 30번 요청할 수 있고, 1분 동안 30개의 token이 다시 채워짐
+    """
+    count, period = rate.split('/')
+    return int(count), int(count) / _PERIODS[period]
+
+
+class TokenBucketStore(metaclass=ABCMeta):
+    """
+    token bucket의 상태를 저장하기 위한 Strategy interface
+    """
+
+    @abstractmethod
+    def consume(self, key: str, capacity: int, refill_rate: float) -> float:
+        """
+        key에 해당하는 bucket에서 token 하나를 사용하는 추상 메서드
+        :param key: bucket key
+        :param capacity: bucket 크기
+        :param refill_rate: 초당 채워지는 token 수
+        :return: 허용된 경우 0, 거절된 경우 다음 token이 채워질 때까지 기다려야 하는 시간(초)
+        """
+        pass
+
+    @abstractmethod
+    def record_throttled(self, name: str) -> None:
+        """
+        name(scope:제한 기준)으로 거절된 요청 수를 1 증가시키는 추상 메서드
+        """
+        pass
+
+    @abstractmethod
+    def get_throttled_counts(self) -> Dict[str, int]:
+        """
+        {scope:제한 기준: 거절된 요청 수}를 반환하는 추상 메서드
+        """
+        pass
+
+    @staticmethod
+    def refill(tokens: float, elapsed: float, capacity: int, refill_rate: float) -> Tuple[float, float]:
+        """
+        elapsed초 동안 채워진 token을 반영한 뒤 token 하나를 사용하는 메서드
+        :return: (남은 token 수, 기다려야 하는 시간(초), 허용된 경우 0)
+        """
+        tokens = min(capacity, tokens + elapsed * refill_rate)
+        if tokens >= 1:
+            return tokens - 1, 0
+        return tokens, (1 - tokens) / refill_rate
+
+
+class InMemoryTokenBucketStore(TokenBucketStore):
+    """
+    token bucket을 프로세스 메모리에 저장하는 Strategy
+    worker 프로세스마다 따로 계산되므로, 실제 허용량은 설정값 x worker 수가 된다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # {key: (남은 token 수, 갱신 시각)}
+        self._buckets: Dict[str, Tuple[float, float]] = dict()
+        self._throttled = Counter()
+
+    def consume(self, key: str, capacity: int, refill_rate: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens, retry_after = self.refill(tokens, now - updated_at, capacity, refill_rate)
+            self._buckets[key] = (tokens, now)
+
+            # 한 시간 이상 사용되지 않은 bucket은 이미 가득 찬 상태(처음 요청한 것과 같음)이므로 정리함
+            if len(self._buckets) > 10000:
+                self._buckets = {k: v for k, v in self._buckets.items() if now - v[1] < 60 * 60}
+        return retry_after
+
+    def record_throttled(self, name: str) -> None:
+        with self._lock:
+            self._throttled[name] += 1
+
+    def get_throttled_counts(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._throttled)
+
+
+class DatabaseTokenBucketStore(TokenBucketStore):
+    """
+    token bucket을 RateLimitBucket 테이블에 저장하는 Strategy
+    여러 worker 프로세스가 같은 허용량을 공유해야 하는 경우에 사용한다.
+    """
+
+    def consume(self, key: str, capacity: int, refill_rate: float) -> float:
+        now = time.time()
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    bucket, _ = RateLimitBucket.objects.select_for_update().get_or_create(
+                        key=key, defaults={'tokens': capacity, 'updated_at': now}
+                    )
+            except IntegrityError:
+                # 다른 요청이 같은 bucket을 먼저 생성한 경우
+                bucket = RateLimitBucket.objects.select_for_update().get(key=key)
+
+            bucket.tokens, retry_after = self.refill(bucket.tokens, max(0.0, now - bucket.updated_at),
+                                                     capacity, refill_rate)
+            bucket.updated_at = now
+            bucket.save(update_fields=['tokens', 'updated_at'])
+        return retry_after
+
+    def record_throttled(self, name: str) -> None:
+        if not ThrottleCounter.objects.filter(name=name).update(count=F('count') + 1):
+            try:
+                with transaction.atomic():
+                    ThrottleCounter.objects.create(name=name, count=1)
+            except IntegrityError:
+                ThrottleCounter.objects.filter(name=name).update(count=F('count') + 1)
+
+    def get_throttled_counts(self) -> Dict[str, int]:
+        return dict(ThrottleCounter.objects.values_list('name', 'count'))
+
+    @staticmethod
+    def prune(idle_seconds: float) -> int:
+        """
+        idle_seconds 이상 사용되지 않은(이미 가득 찬) bucket을 삭제하는 메서드
+        :return: 삭제된 bucket의 수
+        """
+        deleted, _ = RateLimitBucket.objects.filter(updated_at__lt=time.time() - idle_seconds).delete()
+        return deleted
+
+
+_store: Optional[TokenBucketStore] = None
+
+
+def get_rate_limit_store() -> TokenBucketStore:
+    """
+    설정된 저장 방식(RATE_LIMIT_STORE)에 맞는 TokenBucketStore를 반환하는 함수
+    """
+    global _store
+    if _store is None:
+        if settings.RATE_LIMIT_STORE == 'database':
+            _store = DatabaseTokenBucketStore()
+        elif settings.RATE_LIMIT_STORE == 'memory':
+            _store = InMemoryTokenBucketStore()
+        else:
+            raise ValueError(f'Unknown rate limit store: {settings.RATE_LIMIT_STORE}')
+    return _store
+
+
+def get_client_ip(request) -> str:
+    """
+    요청한 client의 IP 주소를 반환하는 함수
+    """
+    if settings.RATE_LIMIT_USE_X_FORWARDED_FOR:
+        forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+        if forwarded_for:
+            return forwarded_for.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def check_rate_limit(scope: str, request) -> float:
+    """
+    RATE_LIMITS[scope]에 설정된 사용자별, IP별 허용량을 확인하는 함수
+    로그인하지 않은 사용자는 IP별 허용량만 확인한다.
+    :return: 허용된 경우 0, 거절된 경우 기다려야 하는 시간(초)
+    """
+    limits = settings.RATE_LIMITS.get(scope, {})
+    store = get_rate_limit_store()
+
+    idents = []
+    if 'user' in limits and request.user.is_authenticated:
+        idents.append(('user', request.user.pk))
+    if 'ip' in limits:
+        idents.append(('ip', get_client_ip(request)))
+
+    for kind, ident in idents:
+        capacity, refill_rate = parse_rate(limits[kind])
+        retry_after = store.consume(f'{scope}:{kind}:{ident}', capacity, refill_rate)
+        if retry_after:
+            store.record_throttled(f'{scope}:{kind}')
+            return retry_after
+    return 0
+
+
+def rate_limit(scope: str):
+    """
+    view에 RATE_LIMITS[scope]의 허용량을 적용하는 decorator
+    허용량을 넘는 요청에는 429 응답(Retry-After)을 반환한다.
+    class-based view에는 method_decorator(rate_limit(scope), name='post')와 같이 제한할 method에 적용한다.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def decorated(request, *args, **kwargs):
+            retry_after = check_rate_limit(scope, request)
+            if retry_after:
+                return throttled_view(request, max(1, int(retry_after + 0.999)))
+            return func(request, *args, **kwargs)
+
+        return decorated
+
+    return decorator
@@ -0,0 +1,15 @@
+from django import template
+from django.utils.html import format_html
+
+from commons.idempotency import IDEMPOTENCY_FIELD, new_idempotency_key
+
+register = template.Library()
+
+
+@register.simple_tag
+def idempotency_key_input():
+    """
+    form이 렌더링될 때마다 새 idempotency key를 담은 hidden input을 생성하는 tag
+    같은 form이 여러 번 제출되어도(더블 클릭 등) 같은 key가 전달되어 한 번만 처리된다.
+    """
+    return format_html('<input type="hidden" name="{}" value="{}">', IDEMPOTENCY_FIELD, new_idempotency_key())
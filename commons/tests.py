@@ -1,3 +1,390 @@
-from django.test import TestCase
+import asyncio
+import json
+import threading
+import time
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.shortcuts import redirect
+from django.test import TestCase, SimpleTestCase, RequestFactory, override_settings
+from django.utils import timezone
+from django.views import View
+
+from commons import ratelimit
+from commons.idempotency import idempotent, IDEMPOTENCY_HEADER
+from commons.middleware import ConcurrencyLimiter, AsyncConcurrencyLimiter, QueryInstrumentationMiddleware
+from commons.models import IdempotencyRecord, OutboxMessage, PeriodicJobLease, RateLimitBucket
+from commons.ratelimit import parse_rate, rate_limit, TokenBucketStore, InMemoryTokenBucketStore, \
+    DatabaseTokenBucketStore
+from commons.transport_strategies import ConsoleTransport, OutboxTransport
+from users.models import SystemUser
+
+
+class ConcurrencyLimiterTest(SimpleTestCase):
+    """
+    WSGI용 ConcurrencyLimiter의 자리 배정과 거절
+    """
+
+    def test_sheds_when_queue_is_full(self):
+        limiter = ConcurrencyLimiter(max_concurrent=1, max_queue=0, queue_timeout=1)
+        self.assertTrue(limiter.acquire())
+        self.assertFalse(limiter.acquire())
+        self.assertEqual(limiter.shed, 1)
+
+        limiter.release()
+        self.assertTrue(limiter.acquire())
+
+    def test_waiter_is_admitted_on_release(self):
+        limiter = ConcurrencyLimiter(max_concurrent=1, max_queue=1, queue_timeout=5)
+        limiter.acquire()
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(limiter.acquire()))
+        waiter.start()
+        while limiter.waiting == 0:
+            pass
+
+        limiter.release()
+        waiter.join()
+        self.assertEqual(results, [True])
+        self.assertEqual(limiter.active, 1)
+
+    def test_waiter_times_out(self):
+        limiter = ConcurrencyLimiter(max_concurrent=1, max_queue=1, queue_timeout=0.05)
+        limiter.acquire()
+        self.assertFalse(limiter.acquire())
+        self.assertEqual((limiter.active, limiter.waiting, limiter.shed), (1, 0, 1))
+
+
+class AsyncConcurrencyLimiterTest(SimpleTestCase):
+    """
+    ASGI용 AsyncConcurrencyLimiter의 자리 배정, 넘겨주기(FIFO)와 거절
+    """
+
+    async def test_slots_are_handed_over_in_order(self):
+        limiter = AsyncConcurrencyLimiter(max_concurrent=1, max_queue=2, queue_timeout=5)
+        self.assertTrue(await limiter.acquire())
+
+        admitted = []
+
+        async def wait(name):
+            await limiter.acquire()
+            admitted.append(name)
+
+        first = asyncio.create_task(wait('first'))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(wait('second'))
+        await asyncio.sleep(0)
+        # 대기열이 가득 찬 경우 바로 거절됨
+        self.assertFalse(await limiter.acquire())
+        self.assertEqual(limiter.shed, 1)
+
+        limiter.release()
+        await first
+        limiter.release()
+        await second
+        self.assertEqual(admitted, ['first', 'second'])
+        self.assertEqual((limiter.active, limiter.waiting), (1, 0))
+
+    async def test_waiter_times_out(self):
+        limiter = AsyncConcurrencyLimiter(max_concurrent=1, max_queue=1, queue_timeout=0.05)
+        await limiter.acquire()
+        self.assertFalse(await limiter.acquire())
+        self.assertEqual((limiter.active, limiter.waiting, limiter.shed), (1, 0, 1))
+
+        limiter.release()
+        self.assertEqual(limiter.active, 0)
+
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        limiter = AsyncConcurrencyLimiter(max_concurrent=1, max_queue=1, queue_timeout=5)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+        limiter.release()
+        self.assertEqual((limiter.active, limiter.waiting), (0, 0))
+        self.assertTrue(await limiter.acquire())
+
+
+class TokenBucketStoreTest(TestCase):
+    """
+    token bucket에 의한 요청 허용량 계산 (InMemory/Database 저장 방식)
+    """
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('30/m'), (30, 0.5))
+        self.assertEqual(parse_rate('2/s'), (2, 2.0))
+
+    def test_refill(self):
+        # 비어 있는 bucket은 1초에 0.5개씩 채워지므로 2초 뒤에 다시 허용됨
+        self.assertEqual(TokenBucketStore.refill(0, 0, 2, 0.5), (0, 2.0))
+        self.assertEqual(TokenBucketStore.refill(0, 2, 2, 0.5), (0, 0))
+        # bucket 크기보다 많이 채워지지 않음
+        self.assertEqual(TokenBucketStore.refill(1, 3600, 2, 0.5), (1, 0))
+
+    def assert_bucket_is_exhausted(self, store):
+        self.assertEqual(store.consume('key', 2, 0.5), 0)
+        self.assertEqual(store.consume('key', 2, 0.5), 0)
+        self.assertGreater(store.consume('key', 2, 0.5), 1)
+        # 다른 key의 bucket에는 영향을 주지 않음
+        self.assertEqual(store.consume('other key', 2, 0.5), 0)
+
+    def test_in_memory_store(self):
+        store = InMemoryTokenBucketStore()
+        self.assert_bucket_is_exhausted(store)
+
+        store.record_throttled('scope:user')
+        self.assertEqual(store.get_throttled_counts(), {'scope:user': 1})
+
+    def test_database_store(self):
+        store = DatabaseTokenBucketStore()
+        self.assert_bucket_is_exhausted(store)
+
+        # 시간이 지나면 token이 다시 채워짐
+        RateLimitBucket.objects.filter(key='key').update(updated_at=time.time() - 2)
+        self.assertEqual(store.consume('key', 2, 0.5), 0)
+
+        store.record_throttled('scope:user')
+        store.record_throttled('scope:user')
+        self.assertEqual(store.get_throttled_counts(), {'scope:user': 2})
+
+        # 오래 사용되지 않은 bucket만 정리됨
+        RateLimitBucket.objects.filter(key='other key').update(updated_at=time.time() - 7200)
+        self.assertEqual(DatabaseTokenBucketStore.prune(3600), 1)
+        self.assertEqual(list(RateLimitBucket.objects.values_list('key', flat=True)), ['key'])
+
+
+# 테스트는 DEBUG=False로 실행되므로, collectstatic으로 만들어지는 manifest 없이 페이지를 렌더링할 수 있도록 함
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage',
+                   RATE_LIMITS={'test': {'user': '1/m', 'ip': '2/m'}}, RATE_LIMIT_STORE='memory')
+class RateLimitTest(TestCase):
+    """
+    rate_limit decorator에 의한 사용자별, IP별 요청 허용량 제한
+    """
+
+    def setUp(self):
+        self.user = SystemUser.signup('user', 'password1234', 'user@example.com', 'user')
+        self.other = SystemUser.signup('other', 'password1234', 'other@example.com', 'other')
+        # 테스트마다 새 bucket으로 계산함
+        ratelimit._store = None
+        self.addCleanup(setattr, ratelimit, '_store', None)
+        self.view = rate_limit('test')(lambda request: HttpResponse())
+
+    def get(self, user):
+        request = RequestFactory().get('/', REMOTE_ADDR='10.0.0.1')
+        request.user = user
+        return self.view(request)
+
+    def test_user_and_ip_limits(self):
+        self.assertEqual(self.get(self.user).status_code, 200)
+
+        # 사용자별 허용량을 넘은 경우
+        response = self.get(self.user)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '60')
+
+        # 다른 사용자와 로그인하지 않은 사용자도 같은 IP의 허용량을 함께 사용함
+        self.assertEqual(self.get(self.other).status_code, 200)
+        self.assertEqual(self.get(AnonymousUser()).status_code, 429)
+        self.assertEqual(ratelimit.get_rate_limit_store().get_throttled_counts(), {'test:user': 1, 'test:ip': 1})
+
+
+class IdempotentViewTest(TestCase):
+    """
+    idempotent decorator에 의한 같은 key의 요청 처리
+    (idempotency key는 사용자별로 구분되므로, 로그인한 사용자의 요청으로 검사함)
+    """
+
+    def setUp(self):
+        self.user = SystemUser.signup('user', 'password1234', 'user@example.com', 'user')
+        self.calls = 0
+
+        @idempotent('test')
+        def view(request):
+            self.calls += 1
+            if request.POST.get('invalid'):
+                return HttpResponse(status=400)
+            return redirect(f'/done/{self.calls}/')
+
+        self.view = view
+
+    def post(self, key, **data):
+        request = RequestFactory().post('/', data, **{IDEMPOTENCY_HEADER: key})
+        request.user = self.user
+        return self.view(request)
+
+    def test_completed_key_replays_redirect(self):
+        first = self.post('key')
+        second = self.post('key')
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual((second.status_code, second['Location']), (first.status_code, '/done/1/'))
+        self.assertEqual(self.post('other key')['Location'], '/done/2/')
+
+    def test_in_flight_key_is_rejected(self):
+        IdempotencyRecord.objects.create(user=self.user, scope='test', key='key',
+                                         expires_at=timezone.now() + timezone.timedelta(seconds=60))
+
+        response = self.post('key')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.calls, 0)
+
+    def test_abandoned_key_is_processed_again(self):
+        IdempotencyRecord.objects.create(user=self.user, scope='test', key='key',
+                                         expires_at=timezone.now() - timezone.timedelta(seconds=1))
+
+        self.assertEqual(self.post('key')['Location'], '/done/1/')
+        self.assertEqual(self.calls, 1)
+
+    def test_failed_response_is_not_stored(self):
+        self.assertEqual(self.post('key', invalid='1').status_code, 400)
+        self.assertEqual(self.post('key')['Location'], '/done/2/')
+        self.assertFalse(IdempotencyRecord.objects.filter(response_location='').exists())
+
+
+class PeriodicJobLeaseTest(TestCase):
+    """
+    PeriodicJobLease에 의한 주기 작업의 실행 권한(lease)과 일정
+    """
+
+    def test_only_one_worker_acquires(self):
+        self.assertTrue(PeriodicJobLease.acquire('job', 'first', lease_seconds=60))
+        self.assertFalse(PeriodicJobLease.acquire('job', 'second', lease_seconds=60))
+        # 다른 worker가 실행 중인 경우 force로도 얻을 수 없음
+        self.assertFalse(PeriodicJobLease.acquire('job', 'second', lease_seconds=60, force=True))
+
+        next_run_at = timezone.now() + timezone.timedelta(minutes=5)
+        self.assertTrue(PeriodicJobLease.release('job', 'first', next_run_at))
+        # 다음 실행 일시가 되기 전에는 force인 경우에만 얻을 수 있음
+        self.assertFalse(PeriodicJobLease.acquire('job', 'second', lease_seconds=60))
+        self.assertGreater(PeriodicJobLease.get_wait_seconds('job'), 0)
+        self.assertTrue(PeriodicJobLease.acquire('job', 'second', lease_seconds=60, force=True))
+
+    def test_expired_lease_is_taken_over(self):
+        PeriodicJobLease.acquire('job', 'first', lease_seconds=60)
+        PeriodicJobLease.objects.filter(name='job').update(
+            leased_until=timezone.now() - timezone.timedelta(seconds=1))
+
+        self.assertTrue(PeriodicJobLease.acquire('job', 'second', lease_seconds=60))
+        # lease를 잃은 worker는 실행 일정을 기록하지 못함
+        self.assertFalse(PeriodicJobLease.release('job', 'first', timezone.now()))
+        self.assertEqual(PeriodicJobLease.objects.get(name='job').owner, 'second')
+
+
+class FailingTransport(OutboxTransport):
+    """
+    지정된 수신자에게 보내는 알림의 전달에 실패하는 transport
+    """
+
+    def __init__(self, failing_recipient_id):
+        self.failing_recipient_id = failing_recipient_id
+
+    def send(self, messages):
+        return {message.pk: 'unreachable' for message in messages if message.recipient_id == self.failing_recipient_id}
+
+
+class OutboxDeliveryTest(TestCase):
+    """
+    OutboxMessage.drain에 의한 알림의 전달과 다시 시도
+    """
+
+    def setUp(self):
+        self.user = SystemUser.signup('user', 'password1234', 'user@example.com', 'user')
+        self.other = SystemUser.signup('other', 'password1234', 'other@example.com', 'other')
+
+    def drain(self, transport, max_attempts=3):
+        return OutboxMessage.drain(transport, batch_size=10, lease_seconds=60, max_attempts=max_attempts,
+                                   backoff_seconds=10, max_backoff_seconds=60)
+
+    def test_message_is_delivered(self):
+        OutboxMessage.enqueue('test', [(self.user.pk, {'value': 1})])
+        stream = StringIO()
+
+        self.assertEqual(self.drain(ConsoleTransport(stream)), (1, 0, 0))
+        message = OutboxMessage.objects.get()
+        self.assertEqual((message.status, message.attempts), (OutboxMessage.STATUS_SENT, 1))
+        self.assertIn('"value": 1', stream.getvalue())
+        # 전달된 알림은 다시 전달되지 않음
+        self.assertEqual(self.drain(ConsoleTransport(StringIO())), (0, 0, 0))
+
+    def test_failed_message_is_retried_after_backoff(self):
+        OutboxMessage.enqueue('test', [(self.user.pk, {}), (self.other.pk, {})])
+
+        self.assertEqual(self.drain(FailingTransport(self.other.pk)), (1, 1, 0))
+        failed = OutboxMessage.objects.get(recipient=self.other)
+        self.assertEqual((failed.status, failed.last_error), (OutboxMessage.STATUS_PENDING, 'unreachable'))
+        self.assertGreater(failed.available_at, timezone.now())
+        # backoff가 끝나기 전에는 다시 꺼내지 않음
+        self.assertEqual(self.drain(ConsoleTransport(StringIO())), (0, 0, 0))
+
+        OutboxMessage.objects.filter(pk=failed.pk).update(available_at=timezone.now())
+        self.assertEqual(self.drain(ConsoleTransport(StringIO())), (1, 0, 0))
+
+    def test_message_is_given_up_after_max_attempts(self):
+        OutboxMessage.enqueue('test', [(self.other.pk, {})])
+
+        self.assertEqual(self.drain(FailingTransport(self.other.pk), max_attempts=1), (0, 0, 1))
+        self.assertEqual(OutboxMessage.objects.get().status, OutboxMessage.STATUS_DEAD)
+
+
+class CountUsersView(View):
+    query_budget = 2
+
+    def get(self, request):
+        for _ in range(3):
+            SystemUser.objects.count()
+        return HttpResponse()
+
+
+class QueryInstrumentationTest(TestCase):
+    """
+    QueryInstrumentationMiddleware에 의한 요청별 SQL 기록과 query_budget 검사
+    """
+
+    def get_response(self, view_func=CountUsersView.as_view(), sample_rate=1.0, default_budget=None):
+        with self.settings(QUERY_INSTRUMENTATION={'sample_rate': sample_rate, 'default_budget': default_budget}):
+            middleware = QueryInstrumentationMiddleware(view_func)
+        request = RequestFactory().get('/users/')
+        middleware.process_view(request, view_func, (), {})
+        return middleware(request)
+
+    def get_log(self, logs):
+        self.assertEqual(len(logs.records), 1)
+        return json.loads(logs.records[0].getMessage())
+
+    def test_over_budget_request_is_warned(self):
+        with self.assertLogs('commons.queries', 'INFO') as logs:
+            response = self.get_response()
+
+        log = self.get_log(logs)
+        self.assertEqual(logs.records[0].levelname, 'WARNING')
+        self.assertEqual((log['view'], log['queries'], log['budget'], log['over_budget']),
+                         ('commons.tests.CountUsersView', 3, 2, True))
+        self.assertEqual(log['duplicated_queries'], 2)
+        # DEBUG가 아닌 경우 Server-Timing header를 추가하지 않음
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    def test_default_budget_applies_to_views_without_budget(self):
+        def view(request):
+            SystemUser.objects.count()
+            return HttpResponse()
+
+        with self.assertLogs('commons.queries', 'INFO') as logs:
+            self.get_response(view, default_budget=1)
+
+        self.assertEqual(logs.records[0].levelname, 'INFO')
+        self.assertEqual(self.get_log(logs)['budget'], 1)
+        self.assertFalse(self.get_log(logs)['over_budget'])
+
+    @override_settings(DEBUG=True)
+    def test_debug_adds_server_timing_but_keeps_sample_rate(self):
+        with self.assertLogs('commons.queries', 'INFO'):
+            self.assertIn('over budget 2', self.get_response()['Server-Timing'])
+
+        # DEBUG인 경우에도 설정된 비율로만 기록함
+        with self.assertNoLogs('commons.queries'):
+            response = self.get_response(sample_rate=0.0)
+        self.assertFalse(response.has_header('Server-Timing'))
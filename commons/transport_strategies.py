@@ -0,0 +1,79 @@
+import json
+import sys
+from abc import ABCMeta, abstractmethod
+from typing import Dict, List, TextIO
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+class OutboxTransport(metaclass=ABCMeta):
+    """
+    outbox의 알림(OutboxMessage)을 외부(email, webhook 등)로 전달하기 위한 Strategy interface
+    """
+
+    @abstractmethod
+    def send(self, messages: List) -> Dict[int, str]:
+        """
+        알림 목록을 전달하는 추상 메서드
+        batch 전체를 전달하지 못한 경우에는 예외를 발생시켜도 된다. (batch의 모든 알림이 다시 시도됨)
+        :param messages: 전달할 OutboxMessage 목록 (recipient가 로드되어 있음)
+        :return: 전달하지 못한 알림의 pk -> 오류 내용
+        """
+        pass
+
+    @staticmethod
+    def serialize(message) -> str:
+        """
+        알림을 한 줄의 JSON으로 변환하는 메서드
+        """
+        return json.dumps({
+            'id': message.pk,
+            'topic': message.topic,
+            'recipient': message.recipient_id,
+            'email': None if message.recipient is None else message.recipient.email,
+            'payload': message.payload,
+            'created_at': message.created_at,
+        }, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+class ConsoleTransport(OutboxTransport):
+    """
+    알림을 표준 출력에 한 줄씩 출력하는 Strategy (개발, 테스트용)
+    """
+
+    def __init__(self, stream: TextIO = None):
+        self.stream = stream
+
+    def send(self, messages: List) -> Dict[int, str]:
+        stream = self.stream or sys.stdout
+        for message in messages:
+            stream.write(self.serialize(message) + '\n')
+        stream.flush()
+        return {}
+
+
+class FileTransport(OutboxTransport):
+    """
+    알림을 파일에 한 줄씩(JSON Lines) 추가하는 Strategy (개발, 테스트용)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def send(self, messages: List) -> Dict[int, str]:
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write(''.join(self.serialize(message) + '\n' for message in messages))
+        return {}
+
+
+def create_outbox_transport(strategy: str, file_path: str = None) -> OutboxTransport:
+    """
+    설정된 전달 방식(OUTBOX['transport'])에 맞는 OutboxTransport를 생성하는 함수
+    :param strategy: 'console' 또는 'file'
+    :param file_path: 'file' 방식에서 알림을 추가할 파일 경로
+    """
+    if strategy == 'console':
+        return ConsoleTransport()
+    elif strategy == 'file':
+        return FileTransport(file_path)
+    raise ValueError(f'Unknown outbox transport: {strategy}')
@@ -1,3 +1,5 @@
+import asyncio
+
 from django.shortcuts import render
 from django.views import View
 
@@ -21,3 +23,43 @@ class ViewWithContext(View):
     def __init__(self, *args, **kwargs):
         super(ViewWithContext, self).__init__(*args, **kwargs)
         self.context = dict()
+
+
+class AsyncViewWithContext(ViewWithContext):
+    """
+    method별 handler(get, post 등)를 async def로 정의하는 ViewWithContext
+    Django 4.0의 View.as_view()는 항상 sync view 함수를 반환하므로, ASGI handler가 handler의 coroutine을
+    await할 수 있도록 view 함수를 coroutine function으로 표시한다. (handler는 모두 async def여야 함)
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super(AsyncViewWithContext, cls).as_view(**initkwargs)
+        view._is_coroutine = asyncio.coroutines._is_coroutine
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        # sync view를 함께 상속한 경우에도 sync 권한 검사 decorator가 적용된 dispatch를 거치지 않도록 View.dispatch를 직접 호출함
+        response = View.dispatch(self, request, *args, **kwargs)
+        # 허용되지 않은 method(http_method_not_allowed), OPTIONS는 sync로 응답함
+        if asyncio.iscoroutine(response):
+            response = await response
+        return response
+
+
+def overloaded_view(request, retry_after: int, *args, **kwargs):
+    """
+    처리 중인 요청이 너무 많아 요청을 처리하지 않는 경우의 응답 (503, Retry-After)
+    """
+    response = render(request, 'commons/errors/503.html', {'retry_after': retry_after}, status=503)
+    response['Retry-After'] = str(retry_after)
+    return response
+
+
+def throttled_view(request, retry_after: int, *args, **kwargs):
+    """
+    요청 허용량을 넘어 요청을 처리하지 않는 경우의 응답 (429, Retry-After)
+    """
+    response = render(request, 'commons/errors/429.html', {'retry_after': retry_after}, status=429)
+    response['Retry-After'] = str(retry_after)
+    return response
@@ -12,5 +12,12 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# 읽기 위주의 페이지를 async view로 처리함 (settings.ASYNC_VIEWS)
+os.environ.setdefault('DJANGO_ASYNC_VIEWS', '1')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# 예약 현황 변경 이벤트(SSE)는 Django view를 거치지 않고 처리함 (app registry가 준비된 후에 import)
+from reservations.live_updates import LiveUpdatesApplication  # noqa: E402
+
+application = LiveUpdatesApplication(django_application)
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 import django_heroku
@@ -45,11 +46,13 @@ OPERATING_APPS = [
     'users.apps.UsersConfig',
     'commons.apps.CommonsConfig',
     'reservations.apps.ReservationsConfig',
+    'analytics.apps.AnalyticsConfig',
 ]
 
 INSTALLED_APPS = DJANGO_DEFAULT_APPS + THIRD_PARTY_APPS + OPERATING_APPS
 
 MIDDLEWARE = [
+    'commons.middleware.QueryInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -57,7 +60,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'commons.middleware.AdmissionControlMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -136,5 +139,158 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 AUTH_USER_MODEL = 'users.SystemUser'
 LOGIN_URL = 'users:login'
 
+# Reservation archive
+# 예약 해제 일시가 지금으로부터 며칠 이전인 예약 내역을 보관 처리할지 결정
+RESERVATION_ARCHIVE_HORIZON_DAYS = 90
+
+# Reservation hold
+# 예약 페이지를 연 멤버를 위해 해당 시간대의 좌석 하나를 몇 초 동안 임시로 점유할지 결정 (멤버당 한 시간대만 점유됨)
+RESERVATION_HOLD_TTL_SECONDS = 300
+# 임시 점유 저장 방식
+# - 'database': ReservationHold 테이블에 저장 (여러 프로세스/서버가 공유)
+# - 'memory': 프로세스 메모리에 저장 (단일 프로세스로 운영하는 경우에만 사용)
+RESERVATION_HOLD_STRATEGY = 'database'
+
+# Batch reservation
+# 한 번의 요청으로 함께 예약할 수 있는 최대 (공간, 시간대) 수
+RESERVATION_BATCH_MAX_SLOTS = 48
+
+# Reservation availability
+# 기간별 예약 현황(날짜별 bitmask)을 한 번에 조회할 수 있는 최대 날짜 수
+RESERVATION_AVAILABILITY_MAX_DAYS = 92
+
+# Live updates (Server-Sent Events)
+# 공간/그룹별 예약 생성, 취소 이벤트를 실시간으로 전달함 (ASGI(config/asgi.py)로 실행하는 경우에만 제공됨)
+# - broker: 'memory' (같은 프로세스의 변경만 즉시 전달, worker 프로세스가 하나인 경우)
+#           'database' (ChangeLogEntry를 poll_seconds마다 조회, 여러 worker 프로세스로 운영하는 경우)
+# - keepalive_seconds: 이벤트가 없을 때 연결 유지를 위한 comment를 보내는 간격(초)
+# - max_stream_seconds: 한 연결을 유지하는 최대 시간(초), 이후 브라우저가 Last-Event-ID로 다시 연결함
+LIVE_UPDATES = {
+    'broker': 'memory',
+    'poll_seconds': 2.0,
+    'keepalive_seconds': 15.0,
+    'max_stream_seconds': 600,
+}
+
+# Admission control
+# 엔드포인트 분류별로 동시에 처리할 요청 수 (worker 프로세스마다 적용됨)
+# - views: 분류에 속하는 view 경로 목록
+# - methods: 제한할 HTTP method 목록 (비어 있는 경우 모든 method)
+# - max_concurrent: 동시에 처리할 수 있는 요청 수
+# - max_queue / queue_timeout: 자리를 기다릴 수 있는 요청 수 / 기다리는 최대 시간(초)
+# - retry_after: 거절된 요청에 응답할 Retry-After(초)
+ADMISSION_CONTROL = {
+    'booking': {
+        'views': ['reservations.views.CreateReservationView', 'reservations.api_views.ReservationCreateApiView',
+                  'reservations.api_views.ReservationBatchApiView'],
+        'methods': ['POST'],
+        'max_concurrent': 2,
+        'max_queue': 8,
+        'queue_timeout': 2.0,
+        'retry_after': 3,
+    },
+    'space_detail': {
+        'views': ['reservations.views.SpaceDetailView', 'reservations.views.AsyncSpaceDetailView',
+                  'reservations.views.SpaceWeekGridView'],
+        'methods': ['GET'],
+        'max_concurrent': 4,
+        'max_queue': 16,
+        'queue_timeout': 1.0,
+        'retry_after': 2,
+    },
+}
+
+# Async views
+# 공간 목록/상세, 그룹 목록 페이지를 async view로 처리할지 여부
+# ASGI(config/asgi.py)로 실행하는 경우 DJANGO_ASYNC_VIEWS=1로 설정되어 사용됨
+# (WSGI에서는 async view가 요청마다 event loop를 거쳐 실행되어 더 느리므로 sync view를 사용함)
+ASYNC_VIEWS = os.environ.get('DJANGO_ASYNC_VIEWS') == '1'
+
+# Rate limiting
+# scope별 사용자/IP당 요청 허용량 ('횟수/기간', 기간: s, m, h)
+# 횟수만큼 연속으로 요청할 수 있으며, 기간 동안 같은 횟수만큼 다시 채워짐 (token bucket)
+RATE_LIMITS = {
+    'reservation_create': {'user': '30/m', 'ip': '60/m'},
+    'reservation_batch': {'user': '10/m', 'ip': '30/m'},
+    'group_join_request': {'user': '10/m', 'ip': '30/m'},
+    'group_search': {'user': '20/m', 'ip': '20/m'},
+}
+# 허용량 계산 방식
+# - 'memory': 프로세스 메모리에서 계산 (worker 프로세스마다 따로 계산됨)
+# - 'database': RateLimitBucket 테이블에서 계산 (모든 worker 프로세스가 공유)
+RATE_LIMIT_STORE = 'memory'
+# 프록시 뒤에서 운영되는 경우 X-Forwarded-For의 첫 번째 주소를 client IP로 사용
+RATE_LIMIT_USE_X_FORWARDED_FOR = False
+
+# Idempotency key
+# form의 idempotency_key 또는 Idempotency-Key header로 전달된 key의 처리 결과(redirect)를 보관하는 시간(초)
+# 보관 기간 동안 같은 key로 다시 요청되면 요청을 다시 처리하지 않고 처음의 redirect를 그대로 응답함
+IDEMPOTENCY_KEY_TTL_SECONDS = 60 * 60 * 24
+# 같은 key의 요청이 처리 중인 동안에는 기다리지 않고 409로 응답함
+# 처리 중인 기록이 유지되는 시간(초), 그 안에 결과가 기록되지 않으면 버려진 요청으로 간주하여 같은 key로 다시 처리함
+IDEMPOTENCY_LEASE_SECONDS = 60
+
+# Notification outbox
+# 예약 확정/취소, 그룹 가입 승인, 활동 제한 알림은 변경과 같은 transaction에서 outbox(OutboxMessage)에 추가되고,
+# drain_outbox 명령이 batch 단위로 꺼내어 전달함
+# - transport: 'console' (표준 출력), 'file' (file_path에 JSON Lines로 추가)
+# - batch_size: 한 번에 꺼내는 알림 수
+# - lease_seconds: 꺼낸 알림의 결과를 기다리는 시간(초), 지나면 다른 worker가 다시 꺼냄
+# - max_attempts: 최대 전달 시도 횟수, backoff_seconds * 2^(시도 횟수 - 1)초(최대 max_backoff_seconds초) 뒤에 다시 시도함
+OUTBOX = {
+    'transport': 'console',
+    'file_path': BASE_DIR / 'outbox.jsonl',
+    'batch_size': 100,
+    'lease_seconds': 60,
+    'max_attempts': 8,
+    'backoff_seconds': 10,
+    'max_backoff_seconds': 60 * 60,
+}
+
+# Periodic jobs
+# run_periodic_jobs 명령이 실행 간격마다 실행하는 정리 작업 (작업 이름: 설정)
+# 여러 서버에서 명령을 실행하더라도 각 작업은 DB lease(PeriodicJobLease)를 얻은 한 worker에서만 실행됨
+# - function: 실행할 함수의 경로 (인자 없이 호출되며, 실행 기록(PeriodicJobRun)에 남길 요약을 반환함)
+# - interval_seconds: 실행 간격(초)
+# - lease_seconds: 한 번의 실행에 걸릴 수 있는 최대 시간(초) (default: PERIODIC_JOB_LEASE_SECONDS),
+#                  지나도록 결과가 기록되지 않으면 다른 worker가 다시 실행함
+PERIODIC_JOBS = {
+    'expire_reservation_holds': {'function': 'reservations.jobs.expire_reservation_holds', 'interval_seconds': 60 * 5},
+    'resolve_booking_lotteries': {'function': 'reservations.jobs.resolve_booking_lotteries', 'interval_seconds': 60},
+    'archive_reservations': {'function': 'reservations.jobs.archive_reservations', 'interval_seconds': 60 * 60 * 6,
+                             'lease_seconds': 60 * 60},
+    'prune_expired_blocks': {'function': 'users.jobs.prune_expired_blocks', 'interval_seconds': 60 * 60 * 24},
+    'prune_stale_join_requests': {'function': 'users.jobs.prune_stale_join_requests', 'interval_seconds': 60 * 60 * 24},
+    'prune_idempotency_records': {'function': 'commons.jobs.prune_idempotency_records', 'interval_seconds': 60 * 60},
+    'prune_rate_limit_buckets': {'function': 'commons.jobs.prune_rate_limit_buckets', 'interval_seconds': 60 * 60},
+    'drain_outbox': {'function': 'commons.jobs.drain_outbox', 'interval_seconds': 30},
+}
+PERIODIC_JOB_LEASE_SECONDS = 60 * 10
+# 해제된 지 며칠이 지난 활동 제한 내역을 삭제할지 결정
+BLOCK_RETENTION_DAYS = 90
+# 처리되지 않은 그룹 가입 요청을 며칠 동안 보관할지 결정
+JOIN_REQUEST_MAX_AGE_DAYS = 30
+
+# SQL instrumentation
+# 요청마다 실행된 SQL의 수, DB 시간, 같은 형태로 중복 실행된 SQL을 한 줄의 JSON으로 기록함 (logger: 'commons.queries')
+# view class의 query_budget(요청당 SQL 수)을 넘은 요청은 WARNING으로 기록됨
+# - sample_rate: 기록할 요청의 비율 (0~1), DEBUG인 경우 기록된 요청의 응답에 Server-Timing header를 추가함
+# - default_budget: query_budget이 선언되지 않은 view에 적용할 SQL 수 (None인 경우 검사하지 않음)
+# - max_logged_duplicates: log에 남길 중복 SQL 형태의 수
+QUERY_INSTRUMENTATION = {
+    'sample_rate': 0.05,
+    'default_budget': None,
+    'max_logged_duplicates': 5,
+}
+
 # Activate Django-Heroku.
 django_heroku.settings(locals())
+
+# django_heroku가 MIDDLEWARE 맨 앞에 추가하는 WhiteNoiseMiddleware는 sync만 지원하므로,
+# ASGI에서 이후의 middleware와 async view가 thread에서 실행되지 않도록 sync/async를 모두 지원하는 middleware로 바꿈
+# (위의 MIDDLEWARE 목록 끝에 있던 WhiteNoiseMiddleware는 맨 앞의 것과 같은 정적 파일을 다시 확인할 뿐이므로 두지 않음)
+MIDDLEWARE = ['commons.middleware.StaticFilesMiddleware' if middleware == 'whitenoise.middleware.WhiteNoiseMiddleware'
+              else middleware for middleware in MIDDLEWARE]
+
+# django_heroku가 LOGGING을 새로 설정하므로 SQL instrumentation의 logger는 이후에 추가함
+LOGGING['loggers']['commons.queries'] = {'handlers': ['console'], 'level': 'INFO', 'propagate': False}
@@ -4,6 +4,8 @@ from django.urls import path, include
 from users import urls as user_urls
 from commons import urls as commons_urls
 from reservations import urls as reservation_urls
+from reservations import api_urls as reservation_api_urls
+from analytics import urls as analytics_urls
 
 from commons import views as common_views
 
@@ -19,4 +21,8 @@ urlpatterns = [
     path('user/', include(user_urls)),
     # Include reservation app
     path('reservation/', include(reservation_urls)),
+    # Include analytics app
+    path('analytics/', include(analytics_urls)),
+    # JSON API (version 1)
+    path('api/v1/', include(reservation_api_urls)),
 ]
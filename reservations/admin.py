@@ -1,7 +1,12 @@
 from django.contrib import admin
 
-from .models import Term, Space, Reservation
+from .models import Term, Space, Reservation, ArchivedReservation, WaitlistEntry, LotteryRequest, \
+    ChangeLogEntry
 
 admin.site.register(Term)
 admin.site.register(Space)
 admin.site.register(Reservation)
+admin.site.register(ArchivedReservation)
+admin.site.register(WaitlistEntry)
+admin.site.register(LotteryRequest)
+admin.site.register(ChangeLogEntry)
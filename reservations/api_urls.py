@@ -0,0 +1,31 @@
+from django.urls import path
+
+from . import api_views
+
+app_name = 'api_v1'
+
+urlpatterns = [
+    # 공간 목록
+    path('groups/<int:group_pk>/spaces/', api_views.SpaceListApiView.as_view(), name='space_list'),
+    # 공간의 일주일 예약 현황
+    path('groups/<int:group_pk>/spaces/<int:space_pk>/week/', api_views.SpaceWeekApiView.as_view(), name='space_week'),
+    # 기간별 공간 예약 현황 (날짜별 bitmask)
+    path('groups/<int:group_pk>/spaces/<int:space_pk>/availability/',
+         api_views.SpaceAvailabilityApiView.as_view(), name='space_availability'),
+    # 예약 생성
+    path('groups/<int:group_pk>/spaces/<int:space_pk>/reservations/',
+         api_views.ReservationCreateApiView.as_view(), name='reservation_create'),
+    # 여러 시간대 한 번에 예약
+    path('groups/<int:group_pk>/reservations/batch/',
+         api_views.ReservationBatchApiView.as_view(), name='reservation_batch'),
+    # 예약 상세 조회/취소
+    path('groups/<int:group_pk>/spaces/<int:space_pk>/reservations/<int:reservation_pk>/',
+         api_views.ReservationDetailApiView.as_view(), name='reservation_detail'),
+    # 그룹의 변경 내역 (마지막으로 받은 token 이후의 변경)
+    path('groups/<int:group_pk>/changes/', api_views.ChangeListApiView.as_view(), name='change_list'),
+    # 그룹의 예약 현황 변경 이벤트 (SSE, ASGI로 실행하는 경우 reservations.live_updates에서 처리됨)
+    path('groups/<int:group_pk>/events/', api_views.EventStreamApiView.as_view(), name='group_events'),
+    # 공간의 예약 현황 변경 이벤트 (SSE)
+    path('groups/<int:group_pk>/spaces/<int:space_pk>/events/',
+         api_views.EventStreamApiView.as_view(), name='space_events'),
+]
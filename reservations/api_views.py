@@ -0,0 +1,405 @@
+from django.conf import settings
+from django.db import IntegrityError
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils import timezone, dateparse
+
+from commons.api import ApiError, json_response, parse_fields, paginate_by_pk, project, parse_json_body, \
+    parse_limit, encode_cursor, decode_cursor
+from commons.ratelimit import check_rate_limit
+from reservations.models import Space, Reservation, ArchivedReservation, ReservationQuotaExceeded, \
+    ReservationBatchConflict, LotteryRequest, ChangeLogEntry
+from users.views import MemberOnlyApiView
+
+# 응답 필드 이름 -> ORM lookup
+SPACE_LOOKUPS = {
+    'id': 'id',
+    'name': 'name',
+    'capacity': 'capacity',
+    'term': 'term_id',
+    'required_permission': 'required_permission__body',
+    'max_active_reservations': 'max_active_reservations',
+    'max_weekly_hours': 'max_weekly_hours',
+    'lottery_opens_at': 'lottery_opens_at',
+    'lottery_closes_at': 'lottery_closes_at',
+    'created_at': 'created_at',
+}
+SPACE_DEFAULT_FIELDS = ('id', 'name', 'capacity')
+
+RESERVATION_LOOKUPS = {
+    'id': 'id',
+    'space': 'space_id',
+    'member': 'member__username',
+    'start': 'dt_from',
+    'end': 'dt_to',
+    'seat': 'seat',
+    'created_at': 'created_at',
+}
+WEEK_RESERVATION_DEFAULT_FIELDS = ('id', 'member', 'start', 'seat')
+
+
+def get_group_space(group, space_pk: int) -> Space:
+    """
+    그룹에 등록된 공간을 반환하는 함수 (다른 그룹의 공간인 경우 Http404)
+    """
+    return get_object_or_404(Space, pk=space_pk, group=group)
+
+
+def serialize_reservation(reservation, fields) -> dict:
+    """
+    Reservation(또는 ArchivedReservation) instance를 API 응답 형태로 변환하는 함수
+    """
+    values = {
+        'id': reservation.pk,
+        'space': reservation.space_id,
+        'member': reservation.member.username,
+        'start': reservation.dt_from,
+        'end': reservation.dt_to,
+        'seat': reservation.seat,
+        'created_at': reservation.created_at,
+        'archived': reservation.is_archived,
+        'promised_term': reservation.promised_term_body,
+    }
+    return {field: values[field] for field in fields}
+
+
+class SpaceListApiView(MemberOnlyApiView):
+    """
+    그룹에 등록된 공간 목록 (GET /api/v1/groups/<group_pk>/spaces/)
+    - fields: 응답에 포함할 필드 (기본: id, name, capacity)
+    - cursor, limit: 다음 페이지 조회 (응답의 next_cursor를 전달)
+    """
+
+    def get(self, request, *args, **kwargs):
+        fields = parse_fields(request, list(SPACE_LOOKUPS), SPACE_DEFAULT_FIELDS)
+        page = paginate_by_pk(request, Space.objects.filter(group=self.group), fields, SPACE_LOOKUPS)
+        return json_response(request, page)
+
+
+class SpaceWeekApiView(MemberOnlyApiView):
+    """
+    공간의 일주일 예약 현황 (GET /api/v1/groups/<group_pk>/spaces/<space_pk>/week/)
+    - year, month, day: 조회할 주에 포함된 날짜 (기본: 오늘)
+    - fields: reservations에 포함할 필드 (기본: id, member, start, seat)
+    => slots: 날짜별 0시~23시의 [예약 수, 다른 멤버의 임시 점유 수]
+    """
+
+    def get(self, request, *args, **kwargs):
+        space = get_group_space(self.group, kwargs['space_pk'])
+        fields = parse_fields(request, list(RESERVATION_LOOKUPS), WEEK_RESERVATION_DEFAULT_FIELDS)
+
+        target_day = Reservation.get_datetime(request.GET.get('year'), request.GET.get('month'), request.GET.get('day'))
+        if target_day is None:
+            raise ApiError(400, 'invalid_date', 'year, month and day must form a valid date.')
+        monday = target_day - timezone.timedelta(days=target_day.weekday())
+        sunday_end = monday + timezone.timedelta(days=7) - timezone.timedelta(seconds=1)
+
+        rows = Reservation.get_reservation_values_in_range(space, monday, sunday_end,
+                                                           [RESERVATION_LOOKUPS[field] for field in fields])
+        holds_of_week = Reservation.get_holds_of_week(target_day, space, exclude_member=request.user)
+
+        booked_of_week = [[0] * 24 for _ in range(7)]
+        for row in rows:
+            booked_of_week[(row['dt_from'] - monday).days][row['dt_from'].hour] += 1
+
+        return json_response(request, {
+            'space': space.pk,
+            'capacity': space.capacity,
+            'week_start': monday.date(),
+            'slots': [
+                {
+                    'date': (monday + timezone.timedelta(days=weekday)).date(),
+                    'hours': [[booked_of_week[weekday][hour], holds_of_week[weekday][hour]] for hour in range(24)],
+                }
+                for weekday in range(7)
+            ],
+            'reservations': project(rows, fields, RESERVATION_LOOKUPS),
+        })
+
+
+def parse_start(value) -> timezone.datetime:
+    """
+    API로 전달된 예약 시작 일시(ISO 8601, 정시)를 datetime으로 변환하는 함수
+    예약 일시는 USE_TZ=False로 TIME_ZONE 기준의 naive datetime으로 저장되므로, offset이 포함된 일시는 TIME_ZONE 기준으로 변환한다.
+    :raises ApiError: 올바른 정시의 일시가 아닌 경우
+    """
+    try:
+        target_dt = dateparse.parse_datetime(str(value or ''))
+    except ValueError:
+        # 형식은 맞지만 존재하지 않는 일시 (예: 13월)
+        target_dt = None
+    if target_dt is not None and timezone.is_aware(target_dt):
+        target_dt = timezone.make_naive(target_dt)
+    if target_dt is None or (target_dt.minute, target_dt.second, target_dt.microsecond) != (0, 0, 0):
+        raise ApiError(400, 'invalid_start', 'start must be an ISO 8601 datetime on the hour.')
+    return target_dt
+
+
+def check_api_rate_limit(scope: str, request) -> None:
+    """
+    RATE_LIMITS[scope]의 허용량을 확인하는 함수
+    :raises ApiError: 허용량을 넘은 경우 (429, Retry-After)
+    """
+    retry_after = check_rate_limit(scope, request)
+    if retry_after:
+        retry_after = max(1, int(retry_after + 0.999))
+        raise ApiError(429, 'throttled', f'Try again in {retry_after} seconds.',
+                       headers={'Retry-After': str(retry_after)})
+
+
+def check_not_blocked(group, member) -> None:
+    """
+    member에게 group 내의 유효한 사용 제한이 없는지 검사하는 함수
+    :raises ApiError: 사용 제한이 있는 경우 (403)
+    """
+    if member.get_valid_blocks_in_group(group):
+        raise ApiError(403, 'blocked', 'You are blocked in this group.')
+
+
+def check_space_permission(space: Space, member) -> None:
+    """
+    member가 space의 요구 권한을 가지고 있는지 검사하는 함수
+    :raises ApiError: 권한이 없는 경우 (403)
+    """
+    if not Space.permission_checker.check(space, member):
+        raise ApiError(403, 'permission_required', f'You do not have the required permission for space {space.pk}.')
+
+
+class SpaceAvailabilityApiView(MemberOnlyApiView):
+    """
+    기간별 공간 예약 현황 (GET /api/v1/groups/<group_pk>/spaces/<space_pk>/availability/)
+    - from, to: 조회할 기간 (YYYY-MM-DD, to 포함, 최대 RESERVATION_AVAILABILITY_MAX_DAYS일)
+    - 또는 year, month: 조회할 달 (기본: 이번 달)
+    => full, booked: from부터 날짜별 24bit bitmask (bit h: h시 시간대)
+       full은 좌석이 모두 예약(또는 다른 멤버가 임시 점유)된 시간대, booked는 하나 이상 예약된 시간대
+    """
+
+    def get(self, request, *args, **kwargs):
+        space = get_group_space(self.group, kwargs['space_pk'])
+
+        if request.GET.get('from') or request.GET.get('to'):
+            date_from = dateparse.parse_date(request.GET.get('from') or '')
+            date_to = dateparse.parse_date(request.GET.get('to') or '')
+            if date_from is None or date_to is None or date_from > date_to:
+                raise ApiError(400, 'invalid_range', 'from and to must be dates (YYYY-MM-DD) with from <= to.')
+        else:
+            today = timezone.now().date()
+            try:
+                date_from = today.replace(year=int(request.GET.get('year', today.year)),
+                                          month=int(request.GET.get('month', today.month)), day=1)
+            except ValueError:
+                raise ApiError(400, 'invalid_month', 'year and month must form a valid month.')
+            next_month = (date_from + timezone.timedelta(days=31)).replace(day=1)
+            date_to = next_month - timezone.timedelta(days=1)
+
+        days = (date_to - date_from).days + 1
+        if days > settings.RESERVATION_AVAILABILITY_MAX_DAYS:
+            raise ApiError(400, 'range_too_long',
+                           f'At most {settings.RESERVATION_AVAILABILITY_MAX_DAYS} days can be requested at once.')
+
+        full, booked = Reservation.get_availability(space, date_from, days, exclude_member=request.user)
+        return json_response(request, {
+            'space': space.pk,
+            'capacity': space.capacity,
+            'from': date_from,
+            'days': days,
+            'full': full,
+            'booked': booked,
+        })
+
+
+class ReservationCreateApiView(MemberOnlyApiView):
+    """
+    예약 생성 (POST /api/v1/groups/<group_pk>/spaces/<space_pk>/reservations/)
+    - start: 예약 시작 일시 (ISO 8601, 정시)
+    => 201: 생성된 예약 (Location: 예약 상세 API)
+    => 202: 추첨 신청 기간인 경우 추첨 신청 내역
+    => 403: 사용 제한 또는 권한 부족, 409: 좌석이 모두 예약됨 또는 추첨 대기 중인 시간대, 422: 예약 한도 초과, 429: 요청 허용량 초과
+    """
+
+    def post(self, request, *args, **kwargs):
+        space = get_group_space(self.group, kwargs['space_pk'])
+
+        check_api_rate_limit('reservation_create', request)
+        target_dt = parse_start(parse_json_body(request).get('start'))
+        check_not_blocked(self.group, request.user)
+        check_space_permission(space, request.user)
+
+        # 추첨 신청 기간인 경우 바로 예약하지 않고 추첨 신청으로 모아둠
+        if space.is_lottery_open:
+            try:
+                lottery_request = LotteryRequest.enter(space, request.user, target_dt)
+            # 이미 신청한 경우
+            except IntegrityError:
+                lottery_request = LotteryRequest.objects.get(space=space, member=request.user, dt_from=target_dt)
+            return json_response(request, {
+                'lottery_request': {
+                    'id': lottery_request.pk,
+                    'start': lottery_request.dt_from,
+                    'status': lottery_request.status,
+                    'closes_at': space.lottery_closes_at,
+                },
+            }, status=202)
+        # 추첨 신청 기간이 끝났지만 아직 추첨되지 않은 시간대인 경우 추첨 결과가 나올 때까지 예약할 수 없음
+        if LotteryRequest.is_awaiting_draw(space, target_dt):
+            raise ApiError(409, 'lottery_pending', 'This slot is waiting for the lottery draw.')
+
+        try:
+            new_reservation = Reservation.create_reservation(space=space, member=request.user, target_dt=target_dt)
+        except IntegrityError:
+            raise ApiError(409, 'already_booked', 'All seats are booked for this slot.')
+        except ReservationQuotaExceeded as e:
+            raise ApiError(422, 'quota_exceeded', e.message)
+
+        location = reverse('api_v1:reservation_detail', kwargs={
+            'group_pk': self.group.pk, 'space_pk': space.pk, 'reservation_pk': new_reservation.pk,
+        })
+        return json_response(request, serialize_reservation(new_reservation, ReservationDetailApiView.FIELDS),
+                             status=201, headers={'Location': location})
+
+
+class ReservationDetailApiView(MemberOnlyApiView):
+    """
+    예약 상세 조회 (GET) 및 취소 (DELETE)
+    /api/v1/groups/<group_pk>/spaces/<space_pk>/reservations/<reservation_pk>/
+    - fields: 응답에 포함할 필드 (기본: 전체)
+    보관 처리된 예약 내역도 같은 pk로 조회되며, 취소는 예약자 또는 그룹 매니저만 할 수 있다.
+    """
+    FIELDS = ('id', 'space', 'member', 'start', 'end', 'seat', 'created_at', 'archived', 'promised_term')
+
+    def get(self, request, *args, **kwargs):
+        space = get_group_space(self.group, kwargs['space_pk'])
+        fields = parse_fields(request, self.FIELDS)
+
+        reservation_pk = kwargs['reservation_pk']
+        reservation = Reservation.objects.select_related('member', 'promised_term') \
+            .filter(space=space, pk=reservation_pk).first()
+        # 보관 처리된 예약 내역은 ArchivedReservation에서 같은 pk로 조회됨
+        if reservation is None:
+            reservation = get_object_or_404(ArchivedReservation.objects.select_related('member', 'promised_term'),
+                                            space=space, pk=reservation_pk)
+
+        return json_response(request, serialize_reservation(reservation, fields))
+
+    def delete(self, request, *args, **kwargs):
+        space = get_group_space(self.group, kwargs['space_pk'])
+
+        reservation_pk = kwargs['reservation_pk']
+        if request.user == self.group.manager:
+            reservation = get_object_or_404(Reservation, space=space, pk=reservation_pk)
+        else:
+            reservation = get_object_or_404(Reservation, space=space, pk=reservation_pk, member=request.user)
+        reservation.cancel()
+
+        return HttpResponse(status=204)
+
+
+class ReservationBatchApiView(MemberOnlyApiView):
+    """
+    여러 공간, 여러 시간대의 예약을 한 번에 생성 (POST /api/v1/groups/<group_pk>/reservations/batch/)
+    - slots: [{"space": 공간 pk, "start": 예약 시작 일시(ISO 8601, 정시)}, ...] (최대 RESERVATION_BATCH_MAX_SLOTS개)
+    전부 예약되거나, 하나도 예약되지 않는다.
+    => 201: 생성된 예약 목록 (slots와 같은 순서)
+    => 403: 사용 제한 또는 권한 부족, 409: 예약할 수 없는 시간대 목록(conflicts), 추첨 신청 기간인 공간 또는 추첨 대기 중인 시간대,
+       422: 예약 한도 초과, 429: 요청 허용량 초과
+    """
+
+    def post(self, request, *args, **kwargs):
+        check_api_rate_limit('reservation_batch', request)
+
+        raw_slots = parse_json_body(request).get('slots')
+        if not isinstance(raw_slots, list) or not raw_slots:
+            raise ApiError(400, 'invalid_slots', 'slots must be a non-empty list.')
+        if len(raw_slots) > settings.RESERVATION_BATCH_MAX_SLOTS:
+            raise ApiError(400, 'too_many_slots', f'At most {settings.RESERVATION_BATCH_MAX_SLOTS} slots are allowed.')
+
+        requested = []
+        for raw_slot in raw_slots:
+            if not isinstance(raw_slot, dict):
+                raise ApiError(400, 'invalid_slots', 'Each slot must be an object with space and start.')
+            try:
+                space_pk = int(raw_slot.get('space'))
+            except (TypeError, ValueError):
+                raise ApiError(400, 'invalid_slots', 'space must be a space id.')
+            requested.append((space_pk, parse_start(raw_slot.get('start'))))
+        if len(set(requested)) != len(requested):
+            raise ApiError(400, 'duplicate_slots', 'The same slot is requested more than once.')
+
+        # 공간은 한 번에 조회하고, 사용 제한은 한 번, 요구 권한은 공간마다 한 번씩만 검사함
+        check_not_blocked(self.group, request.user)
+        spaces = Space.objects.in_bulk({space_pk for space_pk, _ in requested})
+        spaces = {space_pk: space for space_pk, space in spaces.items() if space.group_id == self.group.pk}
+        missing = sorted({space_pk for space_pk, _ in requested} - set(spaces))
+        if missing:
+            raise ApiError(404, 'not_found', 'Unknown spaces: ' + ', '.join(str(space_pk) for space_pk in missing))
+        for space in spaces.values():
+            space.group = self.group
+            check_space_permission(space, request.user)
+            if space.is_lottery_open:
+                raise ApiError(409, 'lottery_open', f'Space {space.pk} only accepts lottery requests now.')
+        for space_pk, target_dt in requested:
+            if LotteryRequest.is_awaiting_draw(spaces[space_pk], target_dt):
+                raise ApiError(409, 'lottery_pending',
+                               f'Space {space_pk} is waiting for the lottery draw at {target_dt}.')
+
+        try:
+            new_reservations = Reservation.create_reservations(
+                request.user, [(spaces[space_pk], target_dt) for space_pk, target_dt in requested]
+            )
+        except ReservationBatchConflict as e:
+            return json_response(request, {
+                'error': 'already_booked',
+                'message': 'Some slots are fully booked. Nothing was reserved.',
+                'conflicts': [{'space': space.pk, 'start': target_dt} for space, target_dt in e.conflicts],
+            }, status=409)
+        except ReservationQuotaExceeded as e:
+            raise ApiError(422, 'quota_exceeded', e.message)
+
+        return json_response(request, {
+            'reservations': [serialize_reservation(reservation, ReservationDetailApiView.FIELDS)
+                             for reservation in new_reservations],
+        }, status=201)
+
+
+class ChangeListApiView(MemberOnlyApiView):
+    """
+    그룹의 예약, 공간, 약관 변경 내역 (GET /api/v1/groups/<group_pk>/changes/)
+    한 주의 예약 현황 전체를 다시 받는 대신, 마지막으로 받은 시점 이후의 변경만 받아 반영할 수 있다.
+    - since: 이전 응답의 next_token (전달되지 않은 경우 변경 내역 없이 현재 시점의 next_token만 응답함)
+    - limit: 한 번에 받을 변경 내역 수 (기본 200, 최대 1000)
+    => changes: 기록된 순서대로의 변경 내역 ({seq, type: "<reservation|space|term>.<created|updated|deleted>",
+                group, space, id, data})
+       next_token: 다음 요청에 since로 전달할 token
+       has_more: 아직 받지 않은 변경 내역이 남아 있는 경우 true
+    """
+
+    def get(self, request, *args, **kwargs):
+        limit = parse_limit(request, default=200, maximum=1000)
+        after_seq = decode_cursor(request.GET.get('since'))
+        if after_seq is None:
+            return json_response(request, {
+                'changes': [],
+                'next_token': encode_cursor(ChangeLogEntry.get_latest_seq(f'group:{self.group.pk}')),
+                'has_more': False,
+            })
+
+        changes, has_more = ChangeLogEntry.get_group_changes(self.group, after_seq, limit)
+        return json_response(request, {
+            'changes': changes,
+            'next_token': encode_cursor(changes[-1]['seq'] if changes else after_seq),
+            'has_more': has_more,
+        })
+
+
+class EventStreamApiView(MemberOnlyApiView):
+    """
+    그룹 또는 공간의 예약 현황 변경 이벤트 (Server-Sent Events)
+    이벤트 stream은 ASGI로 실행하는 경우 reservations.live_updates.LiveUpdatesApplication에서 처리되며,
+    이 view는 WSGI로 실행하는 경우에만 호출된다. 연결을 유지할 수 없으므로 204로 응답해 EventSource가 재연결하지 않게 한다.
+    """
+
+    def get(self, request, *args, **kwargs):
+        if 'space_pk' in kwargs:
+            get_group_space(self.group, kwargs['space_pk'])
+        return HttpResponse(status=204)
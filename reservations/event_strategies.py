@@ -0,0 +1,164 @@
+import asyncio
+import threading
+import time
+from abc import ABCMeta, abstractmethod
+from collections import defaultdict
+from typing import AsyncIterator, Dict, Iterable, List, Optional
+
+from asgiref.sync import sync_to_async
+
+# 구독자 한 명이 처리하지 못하고 쌓아둘 수 있는 이벤트의 수 (넘으면 연결을 끊어 재연결 시 change log에서 다시 받게 함)
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+
+class EventStreamOverflow(Exception):
+    """
+    구독자가 이벤트를 제때 받지 못해 대기열이 넘친 경우 발생하는 예외
+    """
+    pass
+
+
+class EventBroker(metaclass=ABCMeta):
+    """
+    예약 현황 변경 이벤트를 실시간 구독자(SSE)에게 전달하기 위한 Strategy interface
+    - channel: 'space:<pk>' 또는 'group:<pk>'
+    - event: ChangeLogEntry.to_event()로 만든 dict (seq 포함)
+    """
+
+    def __init__(self, change_log_model):
+        self.change_log_model = change_log_model
+
+    @abstractmethod
+    def publish(self, channels: Iterable[str], events: List[Dict]) -> None:
+        """
+        commit된 변경 이벤트를 channels의 구독자에게 전달하는 추상 메서드
+        """
+        pass
+
+    @abstractmethod
+    def listen(self, channel: str, after_seq: Optional[int], idle_timeout: float) -> AsyncIterator[Optional[Dict]]:
+        """
+        channel의 이벤트를 순서대로 반환하는 async iterator를 만드는 추상 메서드
+        :param after_seq: 전달된 경우 해당 seq 이후의 이벤트부터 반환함 (재연결 시 Last-Event-ID)
+        :param idle_timeout: 이 시간(초) 동안 이벤트가 없으면 None을 반환함 (keep-alive 전송에 사용)
+        """
+        pass
+
+    async def get_events_since(self, channel: str, after_seq: int) -> List[Dict]:
+        return await sync_to_async(self.change_log_model.get_events_since)(channel, after_seq)
+
+    async def get_latest_seq(self, channel: str) -> int:
+        return await sync_to_async(self.change_log_model.get_latest_seq)(channel)
+
+
+class InMemoryEventBroker(EventBroker):
+    """
+    같은 프로세스의 구독자에게 이벤트를 즉시 전달하는 Strategy
+    다른 worker 프로세스의 변경은 전달되지 않으므로, worker 프로세스가 하나인 경우에만 사용한다.
+    """
+
+    def __init__(self, change_log_model):
+        super(InMemoryEventBroker, self).__init__(change_log_model)
+        self._lock = threading.Lock()
+        # channel -> {(event loop, queue)}
+        self._subscribers = defaultdict(set)
+
+    def publish(self, channels: Iterable[str], events: List[Dict]) -> None:
+        with self._lock:
+            subscribers = [subscriber for channel in channels for subscriber in self._subscribers.get(channel, ())]
+        # publish는 요청을 처리하는 thread에서 호출되므로, 구독자의 event loop에서 대기열에 넣음
+        for loop, queue in subscribers:
+            for event in events:
+                try:
+                    loop.call_soon_threadsafe(self._put, queue, event)
+                except RuntimeError:
+                    # 구독자의 event loop가 이미 종료된 경우
+                    break
+
+    @staticmethod
+    def _put(queue: asyncio.Queue, event: Dict) -> None:
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # 마지막 자리에 overflow 표시를 남겨 구독을 끝내게 함
+            queue.get_nowait()
+            queue.put_nowait(None)
+
+    async def listen(self, channel: str, after_seq: Optional[int], idle_timeout: float):
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        subscriber = (loop, queue)
+        with self._lock:
+            self._subscribers[channel].add(subscriber)
+
+        try:
+            # 구독을 등록한 뒤에 지난 이벤트를 조회하므로, 그 사이의 이벤트도 누락되지 않음 (seq로 중복 제거)
+            last_seq = after_seq or 0
+            if after_seq is not None:
+                for event in await self.get_events_since(channel, after_seq):
+                    last_seq = event['seq']
+                    yield event
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=idle_timeout)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if event is None:
+                    raise EventStreamOverflow(channel)
+                if event['seq'] <= last_seq:
+                    continue
+                last_seq = event['seq']
+                yield event
+        finally:
+            with self._lock:
+                self._subscribers[channel].discard(subscriber)
+                if not self._subscribers[channel]:
+                    del self._subscribers[channel]
+
+
+class DatabaseEventBroker(EventBroker):
+    """
+    change log(ChangeLogEntry)를 주기적으로 조회하여 이벤트를 전달하는 Strategy
+    변경을 기록하는 transaction이 곧 발행이므로, 여러 worker 프로세스로 운영하는 경우에 사용한다.
+    (전달 지연: 최대 poll_seconds)
+    """
+
+    def __init__(self, change_log_model, poll_seconds: float):
+        super(DatabaseEventBroker, self).__init__(change_log_model)
+        self.poll_seconds = poll_seconds
+
+    def publish(self, channels: Iterable[str], events: List[Dict]) -> None:
+        # 구독자가 change log를 직접 조회하므로 별도로 전달하지 않음
+        pass
+
+    async def listen(self, channel: str, after_seq: Optional[int], idle_timeout: float):
+        last_seq = after_seq if after_seq is not None else await self.get_latest_seq(channel)
+        idle_since = time.monotonic()
+
+        while True:
+            events = await self.get_events_since(channel, last_seq)
+            for event in events:
+                last_seq = event['seq']
+                yield event
+            if events:
+                idle_since = time.monotonic()
+            elif time.monotonic() - idle_since >= idle_timeout:
+                idle_since = time.monotonic()
+                yield None
+            await asyncio.sleep(self.poll_seconds)
+
+
+def create_event_broker(strategy: str, change_log_model, poll_seconds: float = 2.0) -> EventBroker:
+    """
+    설정된 전달 방식(LIVE_UPDATES['broker'])에 맞는 EventBroker를 생성하는 함수
+    :param strategy: 'memory' 또는 'database'
+    :param change_log_model: 지난 이벤트를 조회할 ChangeLogEntry 모델
+    :param poll_seconds: 'database' 방식에서 change log를 조회하는 간격(초)
+    """
+    if strategy == 'memory':
+        return InMemoryEventBroker(change_log_model)
+    elif strategy == 'database':
+        return DatabaseEventBroker(change_log_model, poll_seconds)
+    raise ValueError(f'Unknown live update broker: {strategy}')
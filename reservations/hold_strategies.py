@@ -0,0 +1,136 @@
+import threading
+from abc import ABCMeta, abstractmethod
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict
+
+from django.db import transaction
+from django.utils import timezone
+
+
+class SlotHoldStore(metaclass=ABCMeta):
+    """
+    예약 페이지를 보는 동안 시간대의 좌석 하나를 임시로 점유(hold)하기 위한 Strategy interface
+    만료된 점유는 조회 시점에 정리된다.
+    """
+
+    @abstractmethod
+    def acquire(self, space, member, target_dt: datetime, expires_at: datetime) -> None:
+        """
+        space의 target_dt 시간대에 member의 점유를 생성하거나 만료 일시를 연장하는 추상 메서드
+        멤버는 한 번에 하나의 시간대만 점유할 수 있으므로, member의 다른 점유는 모두 해제한다.
+        (예약 페이지를 여는 것만으로 여러 시간대의 좌석을 막아두지 못하도록)
+        """
+        pass
+
+    @abstractmethod
+    def release(self, space, member, target_dt: datetime) -> None:
+        """
+        space의 target_dt 시간대에 대한 member의 점유를 해제하는 추상 메서드
+        """
+        pass
+
+    @abstractmethod
+    def count_holds(self, space, dt_from: datetime, dt_to: datetime, exclude_member=None) -> Dict[datetime, int]:
+        """
+        space의 dt_from ~ dt_to 사이 시간대별 유효한 점유 수를 반환하는 추상 메서드
+        :param exclude_member: 점유 수에서 제외할 멤버 (자신의 점유는 자신의 예약을 막지 않으므로)
+        :return: {예약 시작 일시: 점유 수}
+        """
+        pass
+
+
+class DatabaseSlotHoldStore(SlotHoldStore):
+    """
+    점유를 ReservationHold 테이블에 저장하는 Strategy
+    여러 프로세스가 같은 점유를 보아야 하는 경우에 사용한다.
+    """
+
+    def __init__(self, hold_model):
+        self.hold_model = hold_model
+
+    def acquire(self, space, member, target_dt: datetime, expires_at: datetime) -> None:
+        with transaction.atomic():
+            self.hold_model.objects.filter(member=member).exclude(space=space, dt_from=target_dt).delete()
+            self.hold_model.objects.update_or_create(space=space, member=member, dt_from=target_dt,
+                                                     defaults={'expires_at': expires_at})
+
+    def release(self, space, member, target_dt: datetime) -> None:
+        self.hold_model.objects.filter(space=space, member=member, dt_from=target_dt).delete()
+
+    def count_holds(self, space, dt_from: datetime, dt_to: datetime, exclude_member=None) -> Dict[datetime, int]:
+        holds = self.hold_model.objects.filter(space=space, dt_from__range=(dt_from, dt_to))
+        # 만료된 점유 정리
+        now = timezone.now()
+        holds.filter(expires_at__lte=now).delete()
+
+        holds = holds.filter(expires_at__gt=now)
+        if exclude_member is not None:
+            holds = holds.exclude(member=exclude_member)
+
+        counts = defaultdict(int)
+        for held_dt in holds.values_list('dt_from', flat=True):
+            counts[held_dt] += 1
+        return counts
+
+
+class InMemorySlotHoldStore(SlotHoldStore):
+    """
+    점유를 프로세스 메모리의 lease table에 저장하는 Strategy
+    DB 쓰기 없이 동작하지만, 다른 프로세스의 점유는 보이지 않으므로 단일 프로세스로 운영하는 경우에만 사용한다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # {공간 pk: {예약 시작 일시: {멤버 pk: 만료 일시}}}
+        self._leases = defaultdict(lambda: defaultdict(dict))
+        # {멤버 pk: (공간 pk, 예약 시작 일시)} - 멤버별 점유 중인 시간대
+        self._member_slots = dict()
+
+    def acquire(self, space, member, target_dt: datetime, expires_at: datetime) -> None:
+        with self._lock:
+            previous_slot = self._member_slots.get(member.pk)
+            if previous_slot is not None and previous_slot != (space.pk, target_dt):
+                self._leases[previous_slot[0]][previous_slot[1]].pop(member.pk, None)
+            self._leases[space.pk][target_dt][member.pk] = expires_at
+            self._member_slots[member.pk] = (space.pk, target_dt)
+
+    def release(self, space, member, target_dt: datetime) -> None:
+        with self._lock:
+            self._leases[space.pk][target_dt].pop(member.pk, None)
+            if self._member_slots.get(member.pk) == (space.pk, target_dt):
+                del self._member_slots[member.pk]
+
+    def count_holds(self, space, dt_from: datetime, dt_to: datetime, exclude_member=None) -> Dict[datetime, int]:
+        now = timezone.now()
+        counts = defaultdict(int)
+        with self._lock:
+            space_leases = self._leases[space.pk]
+            for held_dt in list(space_leases.keys()):
+                leases = space_leases[held_dt]
+                # 만료된 점유 정리
+                for member_pk in [pk for pk, expires_at in leases.items() if expires_at <= now]:
+                    del leases[member_pk]
+                    if self._member_slots.get(member_pk) == (space.pk, held_dt):
+                        del self._member_slots[member_pk]
+                if not leases:
+                    del space_leases[held_dt]
+                    continue
+
+                if dt_from <= held_dt <= dt_to:
+                    counts[held_dt] = sum(1 for member_pk in leases.keys()
+                                          if exclude_member is None or member_pk != exclude_member.pk)
+        return counts
+
+
+def create_slot_hold_store(strategy: str, hold_model) -> SlotHoldStore:
+    """
+    설정된 저장 방식(RESERVATION_HOLD_STRATEGY)에 맞는 SlotHoldStore를 생성하는 함수
+    :param strategy: 'database' 또는 'memory'
+    :param hold_model: 'database' 방식에서 사용할 ReservationHold 모델
+    """
+    if strategy == 'database':
+        return DatabaseSlotHoldStore(hold_model)
+    elif strategy == 'memory':
+        return InMemorySlotHoldStore()
+    raise ValueError(f'Unknown reservation hold strategy: {strategy}')
@@ -0,0 +1,208 @@
+import csv
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable, List, Tuple, Dict, Set
+
+from django.db import transaction, IntegrityError
+
+from analytics.models import SpaceDailyUsage
+from reservations.models import Space, Reservation, ReservationCounter, ChangeLogEntry
+from users.models import Group
+
+
+@dataclass
+class ReservationImportReport:
+    """
+    예약 내역 가져오기 결과
+    - rows: 처리한 행의 수 (header 제외)
+    - created: 생성된 예약 내역의 수
+    - errors: (CSV 파일의 줄 번호, 사유) 목록
+    """
+    rows: int = 0
+    created: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+
+
+class ReservationCsvImporter:
+    """
+    CSV 파일로부터 그룹의 예약 내역을 가져오는 importer
+    CSV 파일은 space(공간 이름), username(예약자 ID), date(YYYY-MM-DD), hour(0~23) 열을 포함해야 하며,
+    파일 전체를 메모리에 올리지 않고 chunk_size개의 행 단위로 공간/멤버 조회, 중복 검사, 생성을 수행한다.
+    잘못된 행은 건너뛰고 보고서에 기록한다.
+    파일을 더 읽을 수 없는 경우(인코딩 오류, 잘못된 CSV 형식)에는 그때까지 읽은 행만 가져오고 보고서에 기록한다.
+    """
+    REQUIRED_COLUMNS = ('space', 'username', 'date', 'hour')
+
+    def __init__(self, group: Group, chunk_size: int = 500):
+        self.group = group
+        self.chunk_size = chunk_size
+
+        # 공간 이름 -> Space instance (같은 이름의 공간이 여러 개인 경우 None)
+        self._spaces: Dict[str, Space] = dict()
+        # username -> 멤버 pk (그룹의 멤버가 아닌 경우 None)
+        self._member_pks: Dict[str, int] = dict()
+        # 파일 안에서 이미 처리된 (공간 pk, 예약 시작 일시, 멤버 pk)
+        self._seen_slots: Set[Tuple[int, datetime, int]] = set()
+
+    def run(self, lines: Iterable[str]) -> ReservationImportReport:
+        """
+        CSV 파일의 각 줄을 전달받아 예약 내역을 가져오는 메서드
+        :param lines: CSV 파일의 줄 단위 iterable (header 포함)
+        :return: 가져오기 결과
+        """
+        report = ReservationImportReport()
+
+        reader = csv.DictReader(lines)
+        try:
+            fieldnames = reader.fieldnames or []
+        except (UnicodeDecodeError, csv.Error) as e:
+            report.errors.append((1, self.get_file_error_message(e)))
+            return report
+        missing_columns = [c for c in self.REQUIRED_COLUMNS if c not in fieldnames]
+        if missing_columns:
+            report.errors.append((1, f"Missing columns: {', '.join(missing_columns)}"))
+            return report
+
+        chunk = []
+        try:
+            for row in reader:
+                report.rows += 1
+                chunk.append((reader.line_num, row))
+                if len(chunk) >= self.chunk_size:
+                    self._import_chunk(chunk, report)
+                    chunk = []
+        except (UnicodeDecodeError, csv.Error) as e:
+            # 읽지 못한 줄 이후의 행은 가져오지 않음
+            report.errors.append((reader.line_num + 1, self.get_file_error_message(e)))
+        if chunk:
+            self._import_chunk(chunk, report)
+
+        report.errors.sort(key=lambda e: e[0])
+        return report
+
+    @staticmethod
+    def get_file_error_message(error: Exception) -> str:
+        """
+        파일을 더 읽을 수 없는 경우의 보고서 메시지를 반환하는 메서드
+        """
+        if isinstance(error, UnicodeDecodeError):
+            return 'Invalid file: not a UTF-8 encoded CSV file'
+        return f'Invalid file: {error}'
+
+    def _parse_row(self, row: Dict[str, str]) -> Tuple[str, str, datetime]:
+        """
+        CSV 행을 (공간 이름, username, 예약 시작 일시)로 변환하는 메서드
+        :raises ValueError: 날짜 또는 시간의 형식이 잘못된 경우
+        """
+        hour = int(row['hour'])
+        if not 0 <= hour < 24:
+            raise ValueError(f"Invalid hour: {row['hour']}")
+        target_dt = datetime.strptime(row['date'].strip(), '%Y-%m-%d').replace(hour=hour)
+        return row['space'].strip(), row['username'].strip(), target_dt
+
+    def _resolve(self, space_names: Set[str], usernames: Set[str]) -> None:
+        """
+        아직 조회하지 않은 공간과 멤버를 한 번의 query로 각각 조회해 cache에 저장하는 메서드
+        """
+        new_space_names = space_names - self._spaces.keys()
+        if new_space_names:
+            for space in Space.objects.filter(group=self.group, name__in=new_space_names):
+                # 같은 이름의 공간이 여러 개인 경우 어느 공간인지 알 수 없으므로 None으로 표시
+                self._spaces[space.name] = None if space.name in self._spaces else space
+            for name in new_space_names - self._spaces.keys():
+                self._spaces[name] = None
+
+        new_usernames = usernames - self._member_pks.keys()
+        if new_usernames:
+            self._member_pks.update(
+                self.group.members.filter(username__in=new_usernames).values_list('username', 'pk')
+            )
+            for username in new_usernames - self._member_pks.keys():
+                self._member_pks[username] = None
+
+    def _import_chunk(self, chunk: List[Tuple[int, Dict[str, str]]], report: ReservationImportReport) -> None:
+        """
+        chunk에 포함된 행들을 검사하고, 유효한 행들을 한 번에 생성하는 메서드
+        """
+        parsed = []
+        for line_num, row in chunk:
+            try:
+                parsed.append((line_num, *self._parse_row(row)))
+            except (ValueError, TypeError, AttributeError) as e:
+                report.errors.append((line_num, f'Invalid row: {e}'))
+
+        self._resolve({p[1] for p in parsed}, {p[2] for p in parsed})
+
+        candidates = []
+        for line_num, space_name, username, target_dt in parsed:
+            space = self._spaces[space_name]
+            member_pk = self._member_pks[username]
+            if space is None:
+                report.errors.append((line_num, f'Unknown or ambiguous space: {space_name}'))
+            elif member_pk is None:
+                report.errors.append((line_num, f'Not a member of this group: {username}'))
+            elif (space.pk, target_dt, member_pk) in self._seen_slots:
+                report.errors.append((line_num, 'Duplicated in file'))
+            else:
+                self._seen_slots.add((space.pk, target_dt, member_pk))
+                candidates.append((line_num, space, member_pk, target_dt))
+
+        if not candidates:
+            return
+
+        with transaction.atomic():
+            # 이미 예약되어 있는 좌석을 한 번의 query로 조회
+            taken_seats = defaultdict(set)
+            for space_id, dt_from, seat in Reservation.objects.filter(
+                    space__in={c[1].pk for c in candidates},
+                    dt_from__in={c[3] for c in candidates},
+            ).values_list('space_id', 'dt_from', 'seat'):
+                taken_seats[(space_id, dt_from)].add(seat)
+
+            new_reservations = []
+            line_nums = []
+            for line_num, space, member_pk, target_dt in candidates:
+                seats = taken_seats[(space.pk, target_dt)]
+                free_seats = [seat for seat in range(space.capacity) if seat not in seats]
+                if not free_seats:
+                    report.errors.append((line_num, 'Already booked'))
+                    continue
+
+                seats.add(free_seats[0])
+                new_reservations.append(Reservation(
+                    space=space, member_id=member_pk, promised_term_id=space.term_snapshot_id,
+                    dt_from=target_dt, dt_to=Reservation.get_end_dt(target_dt), seat=free_seats[0]
+                ))
+                line_nums.append(line_num)
+
+            try:
+                with transaction.atomic():
+                    Reservation.objects.bulk_create(new_reservations)
+            except IntegrityError:
+                # 조회 이후 다른 요청이 같은 좌석을 먼저 예약한 경우, 한 행씩 생성하며 충돌한 행을 보고서에 기록함
+                new_reservations = self._create_each(new_reservations, line_nums, report)
+            SpaceDailyUsage.record_reservations(new_reservations, 1)
+            ReservationCounter.record_reservations(new_reservations, 1)
+            ChangeLogEntry.record_reservations(new_reservations, ChangeLogEntry.ACTION_CREATED)
+            report.created += len(new_reservations)
+
+    @staticmethod
+    def _create_each(reservations: List[Reservation], line_nums: List[int],
+                     report: ReservationImportReport) -> List[Reservation]:
+        """
+        예약 내역을 한 행씩 각각의 savepoint에서 생성하는 메서드
+        :return: 생성된 예약 내역 목록
+        """
+        created = []
+        for line_num, reservation in zip(line_nums, reservations):
+            # 실패한 bulk insert에서 부여되었을 수 있는 pk를 지움
+            reservation.pk = None
+            try:
+                with transaction.atomic():
+                    reservation.save(force_insert=True)
+            except IntegrityError:
+                report.errors.append((line_num, 'Already booked'))
+                continue
+            created.append(reservation)
+        return created
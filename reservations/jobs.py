@@ -0,0 +1,23 @@
+"""
+주기 작업(PERIODIC_JOBS)으로 실행되는 예약 관련 정리 작업
+각 함수는 run_periodic_jobs 명령에서 인자 없이 호출되며, 실행 기록에 남길 요약을 반환한다.
+"""
+from reservations.models import Reservation, ReservationHold, ArchivedReservation, LotteryRequest
+
+# 한 transaction에서 보관 처리할 예약 내역의 수
+ARCHIVE_BATCH_SIZE = 1000
+
+
+def expire_reservation_holds() -> str:
+    return f'{ReservationHold.delete_expired()} expired holds deleted'
+
+
+def archive_reservations() -> str:
+    boundary = Reservation.get_archive_boundary()
+    archived = ArchivedReservation.archive_all_before(boundary, ARCHIVE_BATCH_SIZE)
+    return f'{archived} reservations ended before {boundary} archived'
+
+
+def resolve_booking_lotteries() -> str:
+    spaces, won, lost = LotteryRequest.resolve_all_closed()
+    return f'{spaces} spaces resolved ({won} won, {lost} lost)'
@@ -0,0 +1,161 @@
+import asyncio
+import json
+import time
+from http.cookies import SimpleCookie
+from importlib import import_module
+from typing import Dict, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import auth
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpRequest
+from django.urls import resolve, Resolver404
+
+from reservations.event_strategies import EventStreamOverflow
+from reservations.models import ChangeLogEntry, Space
+from users.models import Group
+
+# 이벤트 stream으로 처리할 URL 이름 (reservations/api_urls.py)
+EVENT_STREAM_URL_NAMES = ('api_v1:group_events', 'api_v1:space_events')
+
+# 연결이 끊긴 경우 브라우저가 다시 연결하기까지 기다리는 시간(ms)
+RECONNECT_MILLISECONDS = 3000
+
+
+def format_event(event: Dict) -> bytes:
+    """
+    이벤트를 SSE 형식(id/event/data)으로 변환하는 함수
+    """
+    data = json.dumps(event, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(',', ':'))
+    return f'id: {event["seq"]}\nevent: {event["type"]}\ndata: {data}\n\n'.encode()
+
+
+def get_header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope['headers']:
+        if key == name:
+            return value.decode('latin1')
+    return None
+
+
+def parse_last_event_id(scope) -> Optional[int]:
+    """
+    재연결 시 브라우저가 보내는 Last-Event-ID header(마지막으로 받은 seq)를 반환하는 함수
+    """
+    value = get_header(scope, b'last-event-id')
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+def authorize(scope, kwargs: Dict) -> Tuple[int, Optional[str]]:
+    """
+    session cookie로 사용자를 확인하고, 요청한 그룹/공간의 이벤트를 구독할 수 있는지 검사하는 함수
+    :return: (응답 status, 구독할 channel) (status가 200이 아닌 경우 channel은 None)
+    """
+    cookie = SimpleCookie(get_header(scope, b'cookie') or '')
+    session_key = cookie[settings.SESSION_COOKIE_NAME].value if settings.SESSION_COOKIE_NAME in cookie else None
+
+    request = HttpRequest()
+    request.session = import_module(settings.SESSION_ENGINE).SessionStore(session_key)
+    user = auth.get_user(request)
+    if not user.is_authenticated:
+        return 401, None
+
+    group = Group.objects.filter(pk=kwargs['group_pk']).first()
+    if group is None or not group.members.contains(user):
+        return 404, None
+
+    if 'space_pk' in kwargs:
+        if not Space.objects.filter(pk=kwargs['space_pk'], group=group).exists():
+            return 404, None
+        return 200, f'space:{kwargs["space_pk"]}'
+    return 200, f'group:{group.pk}'
+
+
+class LiveUpdatesApplication:
+    """
+    예약 현황 변경 이벤트(SSE) 요청을 처리하고, 나머지 요청은 Django application으로 전달하는 ASGI application
+    Django 4.0의 ASGIHandler는 streaming response를 event loop 안에서 동기적으로 순회하므로,
+    연결을 오래 유지하는 이벤트 stream은 Django view 대신 이 application에서 직접 처리한다.
+    """
+
+    def __init__(self, django_application):
+        self.django_application = django_application
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            try:
+                match = resolve(scope['path'])
+            except Resolver404:
+                match = None
+            if match is not None and match.view_name in EVENT_STREAM_URL_NAMES:
+                return await self.stream(scope, receive, send, match.kwargs)
+        return await self.django_application(scope, receive, send)
+
+    async def stream(self, scope, receive, send, kwargs: Dict) -> None:
+        status, channel = await sync_to_async(authorize)(scope, kwargs)
+        if status != 200:
+            await send({'type': 'http.response.start', 'status': status,
+                        'headers': [(b'content-type', b'text/plain; charset=utf-8')]})
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream; charset=utf-8'),
+                (b'cache-control', b'no-cache'),
+                # proxy(nginx 등)가 응답을 모아서 보내지 않도록 함
+                (b'x-accel-buffering', b'no'),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': f'retry: {RECONNECT_MILLISECONDS}\n\n'.encode(),
+                    'more_body': True})
+
+        disconnected = asyncio.Event()
+
+        async def watch_disconnect():
+            while (await receive())['type'] != 'http.disconnect':
+                pass
+            disconnected.set()
+
+        watcher = asyncio.ensure_future(watch_disconnect())
+        try:
+            await self.send_events(send, channel, parse_last_event_id(scope), disconnected)
+        finally:
+            watcher.cancel()
+        if not disconnected.is_set():
+            await send({'type': 'http.response.body', 'body': b''})
+
+    @staticmethod
+    async def send_events(send, channel: str, after_seq: Optional[int], disconnected: asyncio.Event) -> None:
+        """
+        연결이 끊기거나 최대 연결 시간(LIVE_UPDATES['max_stream_seconds'])이 지날 때까지 channel의 이벤트를 전송하는 메서드
+        """
+        options = settings.LIVE_UPDATES
+        deadline = time.monotonic() + options['max_stream_seconds']
+        events = ChangeLogEntry.event_broker.listen(channel, after_seq, options['keepalive_seconds'])
+        try:
+            while not disconnected.is_set() and time.monotonic() < deadline:
+                next_event = asyncio.ensure_future(events.__anext__())
+                waiter = asyncio.ensure_future(disconnected.wait())
+                done, _ = await asyncio.wait((next_event, waiter), return_when=asyncio.FIRST_COMPLETED,
+                                            timeout=max(deadline - time.monotonic(), 0))
+                waiter.cancel()
+                if next_event not in done:
+                    # generator를 닫기 전에 진행 중인 조회가 취소될 때까지 기다림
+                    next_event.cancel()
+                    await asyncio.gather(next_event, return_exceptions=True)
+                    break
+                event = next_event.result()
+                # 이벤트가 없는 동안에는 연결 유지를 위한 comment를 보냄
+                body = b': keepalive\n\n' if event is None else format_event(event)
+                await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+        except EventStreamOverflow:
+            # 재연결하면 Last-Event-ID 이후의 이벤트를 change log에서 다시 받음
+            pass
+        finally:
+            await events.aclose()
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from reservations.models import Reservation, ArchivedReservation
+
+
+class Command(BaseCommand):
+    help = '보관 처리 기준 일시 이전의 예약 내역을 batch 단위로 ArchivedReservation으로 옮깁니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--horizon-days', type=int, default=None,
+                            help='지금으로부터 며칠 이전의 예약 내역을 옮길지 (default: RESERVATION_ARCHIVE_HORIZON_DAYS)')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='한 transaction에서 옮길 예약 내역의 수 (default: 1000)')
+        parser.add_argument('--sleep', type=float, default=0.0,
+                            help='batch 사이에 대기할 시간(초) (default: 0)')
+
+    def handle(self, *args, **options):
+        if options['horizon_days'] is None:
+            boundary = Reservation.get_archive_boundary()
+        else:
+            boundary = timezone.now() - timezone.timedelta(days=options['horizon_days'])
+            boundary = boundary.replace(hour=0, minute=0, second=0, microsecond=0)
+
+        self.stdout.write(f'Archiving reservations ended before {boundary}')
+
+        archived = ArchivedReservation.archive_all_before(
+            boundary, options['batch_size'], sleep_seconds=options['sleep'],
+            on_progress=lambda count: self.stdout.write(f'  archived: {count}'),
+        )
+
+        self.stdout.write(self.style.SUCCESS(f'{archived} reservations archived.'))
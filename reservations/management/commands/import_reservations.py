@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from reservations.importers import ReservationCsvImporter
+from users.models import Group
+
+
+class Command(BaseCommand):
+    help = 'CSV 파일(space, username, date, hour)로부터 그룹의 예약 내역을 가져옵니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('group_pk', type=int, help='예약 내역을 가져올 그룹의 pk')
+        parser.add_argument('csv_path', help='가져올 CSV 파일의 경로')
+        parser.add_argument('--chunk-size', type=int, default=500,
+                            help='한 번에 검사하고 생성할 행의 수 (default: 500)')
+        parser.add_argument('--encoding', default='utf-8-sig', help='CSV 파일의 인코딩 (default: utf-8-sig)')
+
+    def handle(self, *args, **options):
+        try:
+            group = Group.objects.get(pk=options['group_pk'])
+        except Group.DoesNotExist:
+            raise CommandError(f"Group #{options['group_pk']} does not exist.")
+
+        importer = ReservationCsvImporter(group, chunk_size=options['chunk_size'])
+        with open(options['csv_path'], newline='', encoding=options['encoding']) as f:
+            report = importer.run(f)
+
+        for line_num, message in report.errors:
+            self.stdout.write(f'  line {line_num}: {message}')
+
+        summary = f'{report.created} of {report.rows} rows imported, {len(report.errors)} errors.'
+        if report.errors:
+            self.stdout.write(self.style.WARNING(summary))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,75 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from analytics.models import SpaceDailyUsage, SpaceDailyMemberUsage, RollupBackfillPartition
+from commons.models import delete_in_batches
+from reservations.models import Space, Term, Reservation, ArchivedReservation, WaitlistEntry, \
+    ReservationCounter, ReservationHold, LotteryRequest, ChangeLogEntry, ChangeLogCounter
+from users.models import Group, PermissionTag, Block, JoinRequest
+
+
+class Command(BaseCommand):
+    help = '삭제 요청된 공간과 그룹, 그리고 연결된 instance들을 batch 단위로 나누어 삭제합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='한 transaction에서 삭제할 instance의 수 (default: 500)')
+        parser.add_argument('--sleep', type=float, default=0.0,
+                            help='batch 사이에 대기할 시간(초), 다른 요청이 lock을 얻을 수 있도록 함 (default: 0)')
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.sleep = options['sleep']
+
+        # 그룹과 함께 삭제될 공간은 그룹을 삭제할 때 처리함
+        deleted_spaces = Space.all_objects.filter(deleted_at__isnull=False, group__deleted_at__isnull=True)
+        for space in deleted_spaces.order_by('pk'):
+            self.purge_space(space)
+
+        for group in Group.all_objects.filter(deleted_at__isnull=False).order_by('pk'):
+            self.purge_group(group)
+
+        self.stdout.write(self.style.SUCCESS('Purge completed.'))
+
+    def delete(self, label: str, queryset) -> int:
+        """
+        queryset을 batch 단위로 삭제하며 진행 상황을 출력
+        """
+
+        def on_progress(deleted, total):
+            self.stdout.write(f'  {label}: {deleted}/{total}')
+            if self.sleep:
+                time.sleep(self.sleep)
+
+        return delete_in_batches(queryset, self.batch_size, on_progress)
+
+    def purge_space(self, space: Space) -> None:
+        self.stdout.write(f'Purging space #{space.pk} ({space.name})')
+        self.delete('lottery requests', LotteryRequest.objects.filter(space=space))
+        self.delete('reservations', Reservation.objects.filter(space=space))
+        self.delete('archived reservations', ArchivedReservation.objects.filter(space=space))
+        self.delete('waitlist entries', WaitlistEntry.objects.filter(space=space))
+        self.delete('reservation counters', ReservationCounter.objects.filter(space=space))
+        self.delete('reservation holds', ReservationHold.objects.filter(space=space))
+        self.delete('daily usages', SpaceDailyUsage.objects.filter(space=space))
+        self.delete('daily member usages', SpaceDailyMemberUsage.objects.filter(space=space))
+        self.delete('space', Space.all_objects.filter(pk=space.pk))
+
+    def purge_group(self, group: Group) -> None:
+        self.stdout.write(f'Purging group #{group.pk} ({group.name})')
+
+        # 공간은 약관과 권한 태그를 CASCADE로 참조하므로, 약관과 권한 태그보다 먼저 삭제되어야 함
+        for space in Space.all_objects.filter(group=group).order_by('pk'):
+            self.purge_space(space)
+
+        self.delete('terms', Term.objects.filter(group=group))
+        self.delete('permission tags', PermissionTag.objects.filter(group=group))
+        self.delete('blocks', Block.objects.filter(group=group))
+        self.delete('join requests', JoinRequest.objects.filter(group=group))
+        self.delete('memberships', Group.members.through.objects.filter(group=group))
+        # 변경 내역은 공간이 삭제되어도 남아 있으므로(동기화용), 그룹을 삭제할 때 한 번의 CASCADE로 지워지지 않도록 먼저 삭제함
+        self.delete('change log entries', ChangeLogEntry.objects.filter(group=group))
+        self.delete('change log counter', ChangeLogCounter.objects.filter(group=group))
+        self.delete('backfill partitions', RollupBackfillPartition.objects.filter(group=group))
+        self.delete('group', Group.all_objects.filter(pk=group.pk))
@@ -0,0 +1,22 @@
+import random
+
+from django.core.management.base import BaseCommand
+
+from reservations.models import LotteryRequest
+
+
+class Command(BaseCommand):
+    help = '추첨 신청 기간이 끝난 공간의 추첨 대기 중인 신청을 추첨합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=None,
+                            help='추첨에 사용할 난수 seed (재현이 필요한 경우에만 사용, default: 시스템 난수)')
+
+    def handle(self, *args, **options):
+        rng = None if options['seed'] is None else random.Random(options['seed'])
+
+        LotteryRequest.resolve_all_closed(rng=rng, on_resolved=lambda space, won, lost: self.stdout.write(
+            f'Space #{space.pk} ({space.name}): {won} won, {lost} lost'
+        ))
+
+        self.stdout.write(self.style.SUCCESS('Done.'))
@@ -0,0 +1,37 @@
+# Generated by Django 4.0.4 on 2026-10-19 10:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0008_alter_space_required_permission_alter_space_term'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TermBody',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성 일시')),
+                ('digest', models.CharField(max_length=64, unique=True, verbose_name='본문 해시(SHA-256)')),
+                ('body', models.TextField(blank=True, verbose_name='본문')),
+            ],
+            options={
+                'verbose_name': '약관 본문',
+                'verbose_name_plural': '약관 본문 목록',
+            },
+        ),
+        migrations.AddField(
+            model_name='reservation',
+            name='promised_term',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='promised_reservations', to='reservations.termbody', verbose_name='동의 약관 본문'),
+        ),
+        migrations.AddField(
+            model_name='space',
+            name='term_snapshot',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='snapshot_spaces', to='reservations.termbody', verbose_name='약관 본문'),
+        ),
+    ]
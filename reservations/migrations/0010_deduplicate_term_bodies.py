@@ -0,0 +1,72 @@
+import hashlib
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def _iter_batches(queryset, field_name):
+    """
+    pk 순서대로 (pk, field_name) 튜플을 BATCH_SIZE개씩 나누어 반환하는 generator
+    """
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk).order_by('pk').values_list('pk', field_name)[:BATCH_SIZE])
+        if not batch:
+            break
+        yield batch
+        last_pk = batch[-1][0]
+
+
+def _deduplicate(model, text_field, fk_field, term_body_model, cache):
+    """
+    model의 text_field에 복사되어 있던 본문을 TermBody로 옮기고, fk_field가 해당 TermBody를 참조하도록 갱신
+    """
+    for batch in _iter_batches(model.objects.all(), text_field):
+        pks_per_term_body = dict()
+        for pk, body in batch:
+            # 본문이 없던 행은 참조하지 않음
+            if body is None:
+                continue
+
+            digest = hashlib.sha256(body.encode('utf-8')).hexdigest()
+            if digest not in cache:
+                term_body, _ = term_body_model.objects.get_or_create(digest=digest, defaults={'body': body})
+                cache[digest] = term_body.pk
+            pks_per_term_body.setdefault(cache[digest], []).append(pk)
+
+        for term_body_pk, pks in pks_per_term_body.items():
+            model.objects.filter(pk__in=pks).update(**{fk_field: term_body_pk})
+
+
+def forwards(apps, schema_editor):
+    TermBody = apps.get_model('reservations', 'TermBody')
+    Space = apps.get_model('reservations', 'Space')
+    Reservation = apps.get_model('reservations', 'Reservation')
+
+    cache = dict()
+    _deduplicate(Space, 'term_body', 'term_snapshot_id', TermBody, cache)
+    _deduplicate(Reservation, 'promised_term_body', 'promised_term_id', TermBody, cache)
+
+
+def backwards(apps, schema_editor):
+    Space = apps.get_model('reservations', 'Space')
+    Reservation = apps.get_model('reservations', 'Reservation')
+
+    for model, text_field, fk_field in ((Space, 'term_body', 'term_snapshot'),
+                                        (Reservation, 'promised_term_body', 'promised_term')):
+        queryset = model.objects.filter(**{f'{fk_field}__isnull': False})
+        for batch in _iter_batches(queryset, f'{fk_field}__body'):
+            for pk, body in batch:
+                model.objects.filter(pk=pk).update(**{text_field: body})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0009_termbody_space_term_snapshot_reservation_promised_term'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.0.4 on 2026-10-19 10:14
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0010_deduplicate_term_bodies'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='reservation',
+            name='promised_term_body',
+        ),
+        migrations.RemoveField(
+            model_name='space',
+            name='term_body',
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.0.4 on 2026-10-19 11:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0011_remove_reservation_promised_term_body_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TermVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성 일시')),
+                ('number', models.PositiveIntegerField(verbose_name='버전 번호')),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='versions', to='reservations.term', verbose_name='대상 약관')),
+                ('term_body', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='term_versions', to='reservations.termbody', verbose_name='본문')),
+            ],
+            options={
+                'verbose_name': '약관 버전',
+                'verbose_name_plural': '약관 버전 목록',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='termversion',
+            constraint=models.UniqueConstraint(fields=('term', 'number'), name='unique version number in term'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+import hashlib
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def forwards(apps, schema_editor):
+    Term = apps.get_model('reservations', 'Term')
+    TermBody = apps.get_model('reservations', 'TermBody')
+    TermVersion = apps.get_model('reservations', 'TermVersion')
+
+    # 기존 약관의 현재 본문을 1번 버전으로 등록
+    last_pk = 0
+    while True:
+        batch = list(Term.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', 'body')[:BATCH_SIZE])
+        if not batch:
+            break
+
+        new_versions = []
+        for term_pk, body in batch:
+            digest = hashlib.sha256(body.encode('utf-8')).hexdigest()
+            term_body, _ = TermBody.objects.get_or_create(digest=digest, defaults={'body': body})
+            new_versions.append(TermVersion(term_id=term_pk, number=1, term_body=term_body))
+        TermVersion.objects.bulk_create(new_versions)
+
+        last_pk = batch[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0012_termversion'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
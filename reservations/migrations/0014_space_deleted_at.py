@@ -0,0 +1,18 @@
+# Generated by Django 4.0.4 on 2026-10-19 13:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0013_create_initial_term_versions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='space',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True, verbose_name='삭제 요청 일시'),
+        ),
+    ]
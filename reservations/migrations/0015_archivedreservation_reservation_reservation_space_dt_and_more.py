@@ -0,0 +1,57 @@
+# Generated by Django 4.0.4 on 2026-10-19 14:41
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('reservations', '0014_space_deleted_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedReservation',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(verbose_name='생성 일시')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='보관 일시')),
+                ('dt_from', models.DateTimeField(verbose_name='예약 시작 일시')),
+                ('dt_to', models.DateTimeField(verbose_name='예약 해제 일시')),
+            ],
+            options={
+                'verbose_name': '보관된 예약',
+                'verbose_name_plural': '보관된 예약 목록',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['space', 'dt_from'], name='reservation_space_dt'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['dt_to'], name='reservation_dt_to'),
+        ),
+        migrations.AddField(
+            model_name='archivedreservation',
+            name='member',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_reservations_as_member', to=settings.AUTH_USER_MODEL, verbose_name='예약자'),
+        ),
+        migrations.AddField(
+            model_name='archivedreservation',
+            name='promised_term',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='promised_archived_reservations', to='reservations.termbody', verbose_name='동의 약관 본문'),
+        ),
+        migrations.AddField(
+            model_name='archivedreservation',
+            name='space',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_reservations_as_space', to='reservations.space', verbose_name='대상 공간'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedreservation',
+            index=models.Index(fields=['space', 'dt_from'], name='archived_reservation_space_dt'),
+        ),
+    ]
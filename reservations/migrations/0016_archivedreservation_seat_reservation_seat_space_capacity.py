@@ -0,0 +1,29 @@
+# Generated by Django 4.0.4 on 2026-10-19 18:52
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0015_archivedreservation_reservation_reservation_space_dt_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedreservation',
+            name='seat',
+            field=models.PositiveIntegerField(default=0, verbose_name='좌석 번호'),
+        ),
+        migrations.AddField(
+            model_name='reservation',
+            name='seat',
+            field=models.PositiveIntegerField(default=0, verbose_name='좌석 번호'),
+        ),
+        migrations.AddField(
+            model_name='space',
+            name='capacity',
+            field=models.PositiveIntegerField(default=1, validators=[django.core.validators.MinValueValidator(1)], verbose_name='수용 인원'),
+        ),
+    ]
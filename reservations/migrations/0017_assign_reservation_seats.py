@@ -0,0 +1,27 @@
+from django.db import migrations
+from django.db.models import Count
+
+
+def forwards(apps, schema_editor):
+    Reservation = apps.get_model('reservations', 'Reservation')
+
+    # 같은 공간, 같은 시간대에 이미 여러 건의 예약이 존재하는 경우 서로 다른 좌석 번호를 부여함
+    duplicated_slots = Reservation.objects.values('space_id', 'dt_from') \
+        .annotate(reservation_count=Count('id')).filter(reservation_count__gt=1)
+
+    for slot in list(duplicated_slots):
+        pks = Reservation.objects.filter(space_id=slot['space_id'], dt_from=slot['dt_from']) \
+            .order_by('pk').values_list('pk', flat=True)
+        for seat, pk in enumerate(pks):
+            Reservation.objects.filter(pk=pk).update(seat=seat)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0016_archivedreservation_seat_reservation_seat_space_capacity'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
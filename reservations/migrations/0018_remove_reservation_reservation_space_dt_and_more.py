@@ -0,0 +1,21 @@
+# Generated by Django 4.0.4 on 2026-10-19 18:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0017_assign_reservation_seats'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='reservation',
+            name='reservation_space_dt',
+        ),
+        migrations.AddConstraint(
+            model_name='reservation',
+            constraint=models.UniqueConstraint(fields=('space', 'dt_from', 'seat'), name='single reservation per seat'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.0.4 on 2026-10-19 10:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('reservations', '0018_remove_reservation_reservation_space_dt_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WaitlistEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='대기 등록 일시')),
+                ('dt_from', models.DateTimeField(verbose_name='대기 중인 예약 시작 일시')),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist_entries', to=settings.AUTH_USER_MODEL)),
+                ('space', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist_entries', to='reservations.space')),
+            ],
+            options={
+                'verbose_name': '예약 대기',
+                'verbose_name_plural': '예약 대기 목록',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='waitlistentry',
+            index=models.Index(fields=['space', 'dt_from', 'created_at'], name='waitlist_space_dt_created'),
+        ),
+        migrations.AddConstraint(
+            model_name='waitlistentry',
+            constraint=models.UniqueConstraint(fields=('space', 'dt_from', 'member'), name='single waitlist entry per slot'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.0.4 on 2026-10-19 11:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0010_group_reservation_quota'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('reservations', '0019_waitlistentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='space',
+            name='max_active_reservations',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='멤버별 최대 예약 수'),
+        ),
+        migrations.AddField(
+            model_name='space',
+            name='max_weekly_hours',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='멤버별 주간 최대 예약 시간'),
+        ),
+        migrations.CreateModel(
+            name='ReservationCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='날짜')),
+                ('hours', models.PositiveIntegerField(default=0, verbose_name='예약된 시간')),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservation_counters', to='users.group')),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservation_counters', to=settings.AUTH_USER_MODEL)),
+                ('space', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservation_counters', to='reservations.space')),
+            ],
+            options={
+                'verbose_name': '멤버 예약 카운터',
+                'verbose_name_plural': '멤버 예약 카운터 목록',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='reservationcounter',
+            index=models.Index(fields=['member', 'group', 'date'], name='counter_member_group_date'),
+        ),
+        migrations.AddConstraint(
+            model_name='reservationcounter',
+            constraint=models.UniqueConstraint(fields=('member', 'space', 'date'), name='single counter per member space date'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def forwards(apps, schema_editor):
+    Reservation = apps.get_model('reservations', 'Reservation')
+    ReservationCounter = apps.get_model('reservations', 'ReservationCounter')
+
+    # 이미 존재하는 예약 내역을 (멤버, 공간, 날짜)별로 집계해 카운터를 생성함
+    rows = Reservation.objects.annotate(date=TruncDate('dt_from')) \
+        .values('member_id', 'space_id', 'space__group_id', 'date').annotate(hours=Count('id')).order_by()
+
+    ReservationCounter.objects.bulk_create([
+        ReservationCounter(member_id=row['member_id'], space_id=row['space_id'], group_id=row['space__group_id'],
+                           date=row['date'], hours=row['hours'])
+        for row in rows
+    ], batch_size=1000)
+
+
+def backwards(apps, schema_editor):
+    ReservationCounter = apps.get_model('reservations', 'ReservationCounter')
+    ReservationCounter.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0020_reservationcounter'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
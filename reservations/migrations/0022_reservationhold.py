@@ -0,0 +1,38 @@
+# Generated by Django 4.0.4 on 2026-10-19 12:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('reservations', '0021_populate_reservation_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReservationHold',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dt_from', models.DateTimeField(verbose_name='점유한 예약 시작 일시')),
+                ('expires_at', models.DateTimeField(verbose_name='점유 만료 일시')),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservation_holds', to=settings.AUTH_USER_MODEL)),
+                ('space', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservation_holds', to='reservations.space')),
+            ],
+            options={
+                'verbose_name': '예약 임시 점유',
+                'verbose_name_plural': '예약 임시 점유 목록',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='reservationhold',
+            index=models.Index(fields=['space', 'dt_from', 'expires_at'], name='hold_space_dt_expires'),
+        ),
+        migrations.AddConstraint(
+            model_name='reservationhold',
+            constraint=models.UniqueConstraint(fields=('space', 'dt_from', 'member'), name='single hold per member and slot'),
+        ),
+    ]
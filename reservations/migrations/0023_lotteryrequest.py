@@ -0,0 +1,51 @@
+# Generated by Django 4.0.4 on 2026-10-19 13:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('reservations', '0022_reservationhold'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='space',
+            name='lottery_closes_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='추첨 신청 종료 일시'),
+        ),
+        migrations.AddField(
+            model_name='space',
+            name='lottery_opens_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='추첨 신청 시작 일시'),
+        ),
+        migrations.CreateModel(
+            name='LotteryRequest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='신청 일시')),
+                ('dt_from', models.DateTimeField(verbose_name='신청한 예약 시작 일시')),
+                ('status', models.CharField(choices=[('pending', '추첨 대기'), ('won', '당첨'), ('lost', '미당첨')], default='pending', max_length=10, verbose_name='추첨 결과')),
+                ('resolved_at', models.DateTimeField(blank=True, null=True, verbose_name='추첨 일시')),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lottery_requests', to=settings.AUTH_USER_MODEL)),
+                ('reservation', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='lottery_requests', to='reservations.reservation', verbose_name='당첨된 예약')),
+                ('space', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lottery_requests', to='reservations.space')),
+            ],
+            options={
+                'verbose_name': '추첨 예약 신청',
+                'verbose_name_plural': '추첨 예약 신청 목록',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='lotteryrequest',
+            index=models.Index(fields=['space', 'status'], name='lottery_space_status'),
+        ),
+        migrations.AddConstraint(
+            model_name='lotteryrequest',
+            constraint=models.UniqueConstraint(fields=('space', 'dt_from', 'member'), name='single lottery request per slot'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.0.4 on 2026-10-19 16:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0010_group_reservation_quota'),
+        ('reservations', '0023_lotteryrequest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLogEntry',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False, verbose_name='순번')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='기록 일시')),
+                ('object_type', models.CharField(choices=[('reservation', '예약')], max_length=20, verbose_name='대상 종류')),
+                ('object_id', models.BigIntegerField(verbose_name='대상 ID')),
+                ('action', models.CharField(choices=[('created', '생성'), ('deleted', '삭제')], max_length=10, verbose_name='변경 종류')),
+                ('data', models.JSONField(default=dict, verbose_name='변경 내용')),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='change_log_entries', to='users.group')),
+                ('space', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='reservations.space')),
+            ],
+            options={
+                'verbose_name': '변경 내역',
+                'verbose_name_plural': '변경 내역 목록',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='changelogentry',
+            index=models.Index(fields=['group', 'seq'], name='changelog_group_seq'),
+        ),
+        migrations.AddIndex(
+            model_name='changelogentry',
+            index=models.Index(fields=['space', 'seq'], name='changelog_space_seq'),
+        ),
+    ]
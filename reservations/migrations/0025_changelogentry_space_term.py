@@ -0,0 +1,23 @@
+# Generated by Django 4.0.4 on 2026-10-19 17:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0024_changelogentry'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='changelogentry',
+            name='action',
+            field=models.CharField(choices=[('created', '생성'), ('updated', '수정'), ('deleted', '삭제')], max_length=10, verbose_name='변경 종류'),
+        ),
+        migrations.AlterField(
+            model_name='changelogentry',
+            name='object_type',
+            field=models.CharField(choices=[('reservation', '예약'), ('space', '공간'), ('term', '약관')], max_length=20, verbose_name='대상 종류'),
+        ),
+    ]
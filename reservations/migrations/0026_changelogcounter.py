@@ -0,0 +1,74 @@
+# Generated by Django 4.0.4 on 2026-10-19 20:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def copy_seq(apps, schema_editor):
+    """
+    기존 변경 내역의 seq(전체 순번)를 그룹별 순번으로 그대로 사용하고, 그룹별 마지막 seq를 counter에 기록함
+    (클라이언트가 이미 받아간 token(seq) 이후의 변경 내역이 누락되지 않도록 기존 값을 유지함)
+    """
+    ChangeLogEntry = apps.get_model('reservations', 'ChangeLogEntry')
+    ChangeLogCounter = apps.get_model('reservations', 'ChangeLogCounter')
+
+    ChangeLogEntry.objects.update(seq=models.F('id'))
+    ChangeLogCounter.objects.bulk_create([
+        ChangeLogCounter(group_id=row['group_id'], last_seq=row['last_seq'])
+        for row in ChangeLogEntry.objects.values('group_id').annotate(last_seq=models.Max('id'))
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0010_group_reservation_quota'),
+        ('reservations', '0025_changelogentry_space_term'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLogCounter',
+            fields=[
+                ('group', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='users.group')),
+                ('last_seq', models.BigIntegerField(default=0, verbose_name='마지막 순번')),
+            ],
+            options={
+                'verbose_name': '변경 내역 순번',
+                'verbose_name_plural': '변경 내역 순번 목록',
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='changelogentry',
+            name='changelog_group_seq',
+        ),
+        migrations.RemoveIndex(
+            model_name='changelogentry',
+            name='changelog_space_seq',
+        ),
+        migrations.RenameField(
+            model_name='changelogentry',
+            old_name='seq',
+            new_name='id',
+        ),
+        migrations.AlterField(
+            model_name='changelogentry',
+            name='id',
+            field=models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AddField(
+            model_name='changelogentry',
+            name='seq',
+            field=models.BigIntegerField(default=0, verbose_name='순번'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_seq, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='changelogentry',
+            constraint=models.UniqueConstraint(fields=('group', 'seq'), name='single change log entry per group seq'),
+        ),
+        migrations.AddIndex(
+            model_name='changelogentry',
+            index=models.Index(fields=['space', 'seq'], name='changelog_space_seq'),
+        ),
+    ]
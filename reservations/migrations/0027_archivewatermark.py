@@ -0,0 +1,37 @@
+# Generated by Django 4.0.4 on 2026-10-19 21:00
+
+from django.db import migrations, models
+
+
+def init_watermark(apps, schema_editor):
+    """
+    이미 보관된 예약 내역의 예약 해제 일시 중 가장 늦은 일시를 기록함
+    """
+    ArchivedReservation = apps.get_model('reservations', 'ArchivedReservation')
+    ArchiveWatermark = apps.get_model('reservations', 'ArchiveWatermark')
+
+    archived_until = ArchivedReservation.objects.aggregate(latest=models.Max('dt_to'))['latest']
+    if archived_until is not None:
+        ArchiveWatermark.objects.create(pk=1, archived_until=archived_until)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0026_changelogcounter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchiveWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('archived_until', models.DateTimeField(blank=True, null=True, verbose_name='보관된 예약 해제 일시의 상한')),
+            ],
+            options={
+                'verbose_name': '보관 처리 범위',
+                'verbose_name_plural': '보관 처리 범위',
+            },
+        ),
+        migrations.RunPython(init_watermark, migrations.RunPython.noop),
+    ]
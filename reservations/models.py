@@ -1,15 +1,67 @@
-from datetime import datetime
-from typing import List, Dict
+import hashlib
+import random
+import time
+from collections import defaultdict
+from datetime import date, datetime
+from typing import List, Dict, Iterable, Optional, Tuple
 
+from django.conf import settings
 from django.contrib.auth.models import Permission
-from django.db import models, IntegrityError
+from django.core.validators import MinValueValidator
+from django.db import models, IntegrityError, transaction
+from django.db.models import F, Q, Sum, Count
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 
+from analytics.models import SpaceDailyUsage
+from commons.models import SoftDeleteModel, OutboxMessage
+from reservations.event_strategies import EventBroker, create_event_broker
+from reservations.hold_strategies import SlotHoldStore, create_slot_hold_store
 from reservations.permission_strategies import SpacePermissionChecker, IncludeSinglePermissionChecker
 from users.models import Group, SystemUser, PermissionTag
 
 
+class TermBody(models.Model):
+    """
+    내용의 해시값으로 식별되는 불변(immutable) 약관 본문
+    같은 내용의 본문은 한 번만 저장되며, Space와 Reservation은 본문을 복사하는 대신 이 instance를 참조한다.
+    - TermBody : Space = 1 : N (여러 공간이 같은 본문을 스냅샷으로 가질 수 있으므로)
+    - TermBody : Reservation = 1 : N (여러 예약이 같은 본문에 동의할 수 있으므로)
+    """
+    created_at = models.DateTimeField('생성 일시', auto_now_add=True)
+
+    digest = models.CharField('본문 해시(SHA-256)', max_length=64, unique=True)
+    body = models.TextField('본문', null=False, blank=True)
+
+    class Meta:
+        verbose_name = '약관 본문'
+        verbose_name_plural = '약관 본문 목록'
+
+    def save(self, *args, **kwargs):
+        # 한 번 저장된 본문은 여러 instance에서 공유되므로 수정할 수 없음
+        if self.pk is not None:
+            raise IntegrityError('TermBody is immutable.')
+        super(TermBody, self).save(*args, **kwargs)
+
+    @staticmethod
+    def get_digest(body: str) -> str:
+        """
+        본문의 SHA-256 해시값(hex)을 반환하는 메서드
+        """
+        return hashlib.sha256(body.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def intern(cls, body: str) -> 'TermBody':
+        """
+        같은 내용의 본문이 이미 저장되어 있으면 해당 instance를, 그렇지 않으면 새로 생성한 instance를 반환하는 메서드
+        :param body: 약관 본문
+        :return: 본문에 대응되는 TermBody instance
+        """
+        term_body, _ = cls.objects.get_or_create(digest=cls.get_digest(body), defaults={'body': body})
+        return term_body
+
+
 class Term(models.Model):
     """
     공간 예약을 위한 약관
@@ -38,32 +90,144 @@ class Term(models.Model):
     def create_term(cls, group: Group, title: str, body: str) -> 'Term':
         """
         새 term instance를 생성해 반환하는 메서드
+        첫 번째 버전(TermVersion)이 함께 생성된다.
         :param group: 약관을 등록할 그룹
         :param title: 약관명
         :param body: 약관 본무
         :return: 생성된 새 약관
         """
-        return cls.objects.create(group=group, title=title, body=body)
+        with transaction.atomic():
+            new_term = cls.objects.create(group=group, title=title, body=body)
+            TermVersion.objects.create(term=new_term, number=1, term_body=TermBody.intern(body))
+            ChangeLogEntry.record_terms([new_term], ChangeLogEntry.ACTION_CREATED)
+        return new_term
 
     def update(self, **kwargs) -> None:
         """
         인자를 전달받아 term instance의 정보를 수정하는 메서드
         그룹 정보의 수정은 지원하지 않는다.
+        본문이 변경된 경우 새 버전(TermVersion)이 추가되며, 공간에 반영된 본문은 propagate_latest_version으로 갱신한다.
         """
         if 'title' in kwargs.keys():
             self.title = kwargs['title']
         if 'body' in kwargs.keys():
             self.body = kwargs['body']
 
-        self.save()
+        with transaction.atomic():
+            # 같은 약관의 수정이 동시에 같은 최신 버전을 읽고 같은 번호의 버전을 만들지 않도록 약관 행에 lock을 걸어 순서대로 처리함
+            list(Term.objects.select_for_update().filter(pk=self.pk).values_list('pk', flat=True))
+            self.save()
+
+            term_body = TermBody.intern(self.body)
+            latest_version = self.get_latest_version()
+            if latest_version is None or latest_version.term_body_id != term_body.pk:
+                TermVersion.objects.create(
+                    term=self, term_body=term_body,
+                    number=1 if latest_version is None else latest_version.number + 1
+                )
+
+            ChangeLogEntry.record_terms([self], ChangeLogEntry.ACTION_UPDATED)
+
+    def delete(self, *args, **kwargs):
+        """
+        약관을 삭제하는 메서드
+        약관을 사용하는 공간도 함께 삭제되므로(CASCADE), 공간의 삭제도 변경 내역으로 기록한다.
+        """
+        with transaction.atomic():
+            ChangeLogEntry.record_spaces(list(self.using_spaces.all()), ChangeLogEntry.ACTION_DELETED)
+            ChangeLogEntry.record_terms([self], ChangeLogEntry.ACTION_DELETED)
+            return super(Term, self).delete(*args, **kwargs)
+
+    def get_latest_version(self) -> 'TermVersion':
+        """
+        약관의 가장 최근 버전을 반환하는 메서드
+        :return: 가장 최근 TermVersion instance (버전이 없는 경우 None)
+        """
+        return self.versions.select_related('term_body').order_by('-number').first()
+
+    def get_propagation_preview(self) -> List[Dict]:
+        """
+        약관을 사용하는 공간별로 반영되어 있는 본문이 최신 버전과 같은지를 반환하는 메서드
+        본문 전체가 아닌 본문의 해시값만을 비교한다.
+        :return: 공간별 {'pk', 'name', 'version', 'up_to_date'} 목록 (version은 반영되어 있는 버전 번호, 알 수 없는 경우 None)
+        """
+        latest_version = self.get_latest_version()
+        latest_digest = None if latest_version is None else latest_version.term_body.digest
 
+        # 본문 해시값 -> 버전 번호 (같은 본문으로 되돌아간 경우 가장 최근 번호를 사용)
+        version_of_digest = dict(
+            self.versions.order_by('number').values_list('term_body__digest', 'number')
+        )
 
-class Space(models.Model):
+        return [
+            {
+                'pk': space_pk,
+                'name': name,
+                'version': version_of_digest.get(digest),
+                'up_to_date': digest is not None and digest == latest_digest,
+            } for space_pk, name, digest in self.using_spaces.order_by('pk').values_list(
+                'pk', 'name', 'term_snapshot__digest'
+            )
+        ]
+
+    def propagate_latest_version(self, space_pks: List[int] = None) -> int:
+        """
+        약관의 최신 버전 본문을 약관을 사용하는 공간에 한 번의 UPDATE로 반영하는 메서드
+        :param space_pks: 반영할 공간의 pk 목록 (None인 경우 약관을 사용하는 모든 공간)
+        :return: 갱신된 공간의 수
+        """
+        latest_version = self.get_latest_version()
+        if latest_version is None:
+            return 0
+
+        target_spaces = self.using_spaces.all()
+        if space_pks is not None:
+            target_spaces = target_spaces.filter(pk__in=space_pks)
+        target_spaces = target_spaces.exclude(term_snapshot=latest_version.term_body_id)
+
+        with transaction.atomic():
+            # 반영 대상 공간을 잠근 뒤 갱신하여, 기록되는 공간과 갱신되는 공간이 같도록 함
+            updated_spaces = list(target_spaces.select_for_update())
+            Space.objects.filter(pk__in=[space.pk for space in updated_spaces]) \
+                .update(term_snapshot=latest_version.term_body_id)
+            ChangeLogEntry.record_spaces(updated_spaces, ChangeLogEntry.ACTION_UPDATED)
+
+        return len(updated_spaces)
+
+
+class TermVersion(models.Model):
+    """
+    약관 본문의 변경 이력
+    - TermVersion : Term = N : 1 (한 약관은 여러 버전을 가질 수 있으므로)
+    - TermVersion : TermBody = N : 1 (여러 버전이 같은 본문을 가질 수 있으므로)
+    """
+    created_at = models.DateTimeField('생성 일시', auto_now_add=True)
+
+    term = models.ForeignKey(Term, null=False, on_delete=models.CASCADE,
+                             verbose_name='대상 약관', related_name='versions')
+    number = models.PositiveIntegerField('버전 번호')
+    term_body = models.ForeignKey(TermBody, null=False, on_delete=models.PROTECT,
+                                  verbose_name='본문', related_name='term_versions')
+
+    class Meta:
+        verbose_name = '약관 버전'
+        verbose_name_plural = '약관 버전 목록'
+        constraints = (
+            # 약관 내에서 버전 번호는 유일함
+            models.UniqueConstraint(
+                fields=['term', 'number'],
+                name='unique version number in term',
+            ),
+        )
+
+
+class Space(SoftDeleteModel):
     """
     예약의 대상이 되는 공간
     - Space : Group = N : 1 (한 그룹에 여러 공간이 등록될 수 있으므로)
     - Space : Term = N : 1 (한 약관이 여러 공간에서 사용될 수 있으므로)
     - Space : PermissionTag = N : 1 (한 권한 태그가 여러 공간에서 요구될 수 있으므로)
+    삭제 요청된 공간은 즉시 숨겨지며, 연결된 예약 내역은 purge_deleted_objects 명령으로 삭제된다.
     """
     created_at = models.DateTimeField('생성 일시', auto_now_add=True)
 
@@ -75,9 +239,21 @@ class Space(models.Model):
 
     name = models.CharField('공간 이름', max_length=255)
 
+    # 한 시간대에 동시에 예약할 수 있는 수 (좌석 수)
+    capacity = models.PositiveIntegerField('수용 인원', default=1, validators=[MinValueValidator(1)])
+
+    # 멤버별 예약 한도 (None인 경우 제한하지 않음, 그룹의 예약 한도와 함께 적용됨)
+    max_active_reservations = models.PositiveIntegerField('멤버별 최대 예약 수', null=True, blank=True)
+    max_weekly_hours = models.PositiveIntegerField('멤버별 주간 최대 예약 시간', null=True, blank=True)
+
+    # 추첨 예약 기간 (설정된 경우 기간 중의 예약 요청은 LotteryRequest로 모인 뒤, 기간이 끝나면 한 번에 추첨됨)
+    lottery_opens_at = models.DateTimeField('추첨 신청 시작 일시', null=True, blank=True)
+    lottery_closes_at = models.DateTimeField('추첨 신청 종료 일시', null=True, blank=True)
+
     # term과의 연결은 유지하되, Term의 내용이 변경되었을 때 선택적으로 내용을
-    # Space instance에 반영할 수 있도록 구현
-    term_body = models.TextField('약관 본문', null=True, blank=True)
+    # Space instance에 반영할 수 있도록 구현 (본문은 TermBody로 공유되어 저장됨)
+    term_snapshot = models.ForeignKey(TermBody, null=True, on_delete=models.PROTECT,
+                                      verbose_name='약관 본문', related_name='snapshot_spaces')
 
     required_permission = models.ForeignKey(PermissionTag, on_delete=models.CASCADE, null=True,
                                             related_name='requiring_spaces', verbose_name='요구 권한')
@@ -94,21 +270,44 @@ class Space(models.Model):
             self.space = target_space
             self.context['space'] = self.space
 
+    @property
+    def is_lottery_open(self) -> bool:
+        """
+        현재 추첨 신청 기간인지 여부
+        """
+        if self.lottery_opens_at is None or self.lottery_closes_at is None:
+            return False
+        return self.lottery_opens_at <= timezone.now() < self.lottery_closes_at
+
+    @property
+    def term_body(self) -> str:
+        """
+        공간에 반영되어 있는 약관 본문
+        """
+        return '' if self.term_snapshot_id is None else self.term_snapshot.body
+
     @classmethod
-    def create_space(cls, name: str, group: Group, term: Term, required_permission: PermissionTag) -> 'Space':
+    def create_space(cls, name: str, group: Group, term: Term, required_permission: PermissionTag,
+                     capacity: int = 1, max_active_reservations: int = None, max_weekly_hours: int = None) -> 'Space':
         """
         새 space instance를 생성해 반환하는 메서드
         :param name: 공간명
         :param group: 공간을 등록할 그룹
         :param term: 공간에 등록할 약관
         :param required_permission: 공간에서 예약을 하기 위해 필요한 권한
+        :param capacity: 한 시간대에 동시에 예약할 수 있는 수
+        :param max_active_reservations: 멤버별 최대 예약 수 (None인 경우 제한하지 않음)
+        :param max_weekly_hours: 멤버별 주간 최대 예약 시간 (None인 경우 제한하지 않음)
         :return: 생성된 새 공간
         """
-        new_space = cls.objects.create(
-            group=group, term=term, name=name,
-            term_body='' if term is None else term.body,
-            required_permission=required_permission
-        )
+        with transaction.atomic():
+            new_space = cls.objects.create(
+                group=group, term=term, name=name, capacity=capacity,
+                max_active_reservations=max_active_reservations, max_weekly_hours=max_weekly_hours,
+                term_snapshot=None if term is None else TermBody.intern(term.body),
+                required_permission=required_permission
+            )
+            ChangeLogEntry.record_spaces([new_space], ChangeLogEntry.ACTION_CREATED)
         return new_space
 
     def update(self, **kwargs) -> None:
@@ -119,11 +318,89 @@ class Space(models.Model):
         if 'name' in kwargs.keys():
             self.name = kwargs['name']
         if 'term' in kwargs.keys():
-            self.term = kwargs['term']
+            # 약관이 교체된 경우에만 새 약관의 최신 본문을 반영함
+            # (같은 약관의 본문 변경은 Term.propagate_latest_version으로 반영)
+            if self.term != kwargs['term']:
+                self.term = kwargs['term']
+                latest_version = None if self.term is None else self.term.get_latest_version()
+                self.term_snapshot = None if latest_version is None else latest_version.term_body
         if 'required_permission' in kwargs.keys():
             self.required_permission = kwargs['required_permission']
+        if 'capacity' in kwargs.keys():
+            self.capacity = kwargs['capacity']
+        if 'max_active_reservations' in kwargs.keys():
+            self.max_active_reservations = kwargs['max_active_reservations']
+        if 'max_weekly_hours' in kwargs.keys():
+            self.max_weekly_hours = kwargs['max_weekly_hours']
+        if 'lottery_opens_at' in kwargs.keys():
+            self.lottery_opens_at = kwargs['lottery_opens_at']
+        if 'lottery_closes_at' in kwargs.keys():
+            self.lottery_closes_at = kwargs['lottery_closes_at']
+
+        with transaction.atomic():
+            self.save()
+            ChangeLogEntry.record_spaces([self], ChangeLogEntry.ACTION_UPDATED)
 
-        self.save()
+    def soft_delete(self) -> None:
+        """
+        공간을 삭제 요청 상태로 변경하고, 공간의 삭제를 변경 내역으로 기록하는 메서드
+        """
+        with transaction.atomic():
+            super(Space, self).soft_delete()
+            ChangeLogEntry.record_spaces([self], ChangeLogEntry.ACTION_DELETED)
+
+
+class ReservationHold(models.Model):
+    """
+    예약 페이지를 연 멤버를 위해 시간대의 좌석 하나를 임시로 점유한 내역
+    RESERVATION_HOLD_STRATEGY가 'database'인 경우에만 사용되며, 만료된 점유는 조회 시점에 정리된다.
+    """
+    space = models.ForeignKey(Space, on_delete=models.CASCADE, related_name='reservation_holds')
+    member = models.ForeignKey(SystemUser, on_delete=models.CASCADE, related_name='reservation_holds')
+    dt_from = models.DateTimeField('점유한 예약 시작 일시', blank=False, null=False)
+    expires_at = models.DateTimeField('점유 만료 일시', blank=False, null=False)
+
+    class Meta:
+        verbose_name = '예약 임시 점유'
+        verbose_name_plural = '예약 임시 점유 목록'
+        constraints = (
+            models.UniqueConstraint(fields=['space', 'dt_from', 'member'], name='single hold per member and slot'),
+        )
+        indexes = (
+            # 시간대별 유효한 점유 조회 및 만료된 점유 정리에 사용
+            models.Index(fields=['space', 'dt_from', 'expires_at'], name='hold_space_dt_expires'),
+        )
+
+    @classmethod
+    def delete_expired(cls) -> int:
+        """
+        만료된 점유를 삭제하는 메서드
+        조회 시점에 정리되지 않은 점유(다시 조회되지 않은 시간대의 점유)를 주기적으로 정리하는 데 사용된다.
+        :return: 삭제된 점유의 수
+        """
+        deleted, _ = cls.objects.filter(expires_at__lte=timezone.now()).delete()
+        return deleted
+
+
+class ReservationQuotaExceeded(Exception):
+    """
+    멤버별 예약 한도를 넘어 예약하려는 경우 발생하는 예외
+    """
+
+    def __init__(self, message: str):
+        super(ReservationQuotaExceeded, self).__init__(message)
+        self.message = message
+
+
+class ReservationBatchConflict(Exception):
+    """
+    여러 시간대를 한 번에 예약할 때, 좌석이 모두 예약된 시간대가 있어 아무것도 예약하지 않은 경우 발생하는 예외
+    - conflicts: 예약할 수 없었던 (공간, 예약 시작 일시) 목록
+    """
+
+    def __init__(self, conflicts: List[Tuple[Space, datetime]]):
+        super(ReservationBatchConflict, self).__init__(conflicts)
+        self.conflicts = conflicts
 
 
 class Reservation(models.Model):
@@ -140,64 +417,279 @@ class Reservation(models.Model):
     member = models.ForeignKey(SystemUser, null=False, on_delete=models.CASCADE,
                                verbose_name='예약자', related_name='reservations_as_member')
 
-    promised_term_body = models.TextField('동의 약관 본문', null=True, blank=True)
+    promised_term = models.ForeignKey(TermBody, null=True, on_delete=models.PROTECT,
+                                      verbose_name='동의 약관 본문', related_name='promised_reservations')
 
     dt_from = models.DateTimeField('예약 시작 일시', blank=False, null=False)
     dt_to = models.DateTimeField('예약 해제 일시', blank=False, null=False)
 
+    # 같은 시간대의 예약 중 몇 번째 좌석인지 (0 ~ space.capacity - 1)
+    seat = models.PositiveIntegerField('좌석 번호', default=0)
+
     class Meta:
         verbose_name = '예약'
         verbose_name_plural = '예약 목록'
+        indexes = (
+            # 보관 처리 대상 검색에 사용
+            models.Index(fields=['dt_to'], name='reservation_dt_to'),
+        )
+        constraints = (
+            # 한 좌석은 한 번만 예약될 수 있으므로, 동시에 요청되어도 수용 인원을 넘어 예약되지 않음
+            # (공간, 예약 시작 일시) 검색에도 사용됨
+            models.UniqueConstraint(
+                fields=['space', 'dt_from', 'seat'],
+                name='single reservation per seat',
+            ),
+        )
 
     class FindingSingleInstance:
         def init_reservation(self, request, *args, **kwargs):
-            target_reservation = get_object_or_404(Reservation, pk=kwargs['reservation_pk'])
+            try:
+                target_reservation = Reservation.objects.get(pk=kwargs['reservation_pk'])
+            # 보관 처리된 예약 내역은 ArchivedReservation에서 같은 pk로 조회됨
+            except Reservation.DoesNotExist:
+                target_reservation = get_object_or_404(ArchivedReservation, pk=kwargs['reservation_pk'])
             self.reservation = target_reservation
             self.context['reservation'] = self.reservation
 
+    # 보관 처리된 예약 내역(ArchivedReservation)과 구분하기 위해 사용
+    is_archived = False
+
+    # 예약자에게 보내는 알림 종류 (OutboxMessage.topic)
+    NOTIFICATION_CONFIRMED = 'reservation.confirmed'
+    NOTIFICATION_CANCELLED = 'reservation.cancelled'
+
+    # 예약 페이지를 연 멤버의 임시 점유를 저장하는 곳 (RESERVATION_HOLD_STRATEGY에 따라 결정됨)
+    hold_store: SlotHoldStore = create_slot_hold_store(settings.RESERVATION_HOLD_STRATEGY, ReservationHold)
+
     def __str__(self):
         return self.member.username
 
+    @property
+    def promised_term_body(self) -> str:
+        """
+        예약 당시 동의한 약관 본문
+        """
+        return '' if self.promised_term_id is None else self.promised_term.body
+
     @classmethod
     def create_reservation(cls, space: Space, member: SystemUser, target_dt: datetime):
         """
         새 예약 내역을 생성하는 메서드
+        비어 있는 좌석 중 가장 앞의 좌석을 예약하며, 동시에 같은 좌석이 예약된 경우 다음 좌석으로 다시 시도한다.
         :param space: 예약을 생성할 공간
         :param member: 예약자
         :param target_dt: 예약 시작 일시
         :return: 생성된 새 예약 내역
-        :raises IntegrityError: 선택된 일시로부터 1시간 간격 안에 예약 내역이 존재하는 경우
+        :raises IntegrityError: 선택된 일시의 좌석이 모두 예약된 경우
+        :raises ReservationQuotaExceeded: 그룹 또는 공간의 멤버별 예약 한도를 넘는 경우
         :raises Http404: member check에 실패한 경우
         """
-        if cls.already_booked(space, target_dt):
-            raise IntegrityError
-        else:
-            member = space.group.member_check(member)
-            new_reservation = cls.objects.create(space=space, member=member,
-                                                 promised_term_body='' if space.term is None else space.term.body,
-                                                 dt_from=target_dt,
-                                                 dt_to=target_dt + timezone.timedelta(minutes=59))
-            return new_reservation
+        member = space.group.member_check(member)
+
+        with transaction.atomic():
+            ReservationCounter.check_quota(space, member, target_dt)
+
+            free_seats = cls.get_free_seats(space, target_dt)
+            # 다른 멤버가 임시 점유 중인 수 만큼의 좌석은 남겨둠
+            if len(free_seats) <= cls.count_holds(space, target_dt, exclude_member=member):
+                raise IntegrityError
+
+            for seat in free_seats:
+                try:
+                    with transaction.atomic():
+                        # 예약자에게 보여지는 본문은 공간에 반영된 본문이므로, 해당 본문을 동의 약관으로 기록함
+                        new_reservation = cls.objects.create(space=space, member=member,
+                                                             promised_term_id=space.term_snapshot_id,
+                                                             dt_from=target_dt,
+                                                             dt_to=cls.get_end_dt(target_dt),
+                                                             seat=seat)
+                except IntegrityError:
+                    # 다른 요청이 같은 좌석을 먼저 예약한 경우
+                    continue
+                break
+            else:
+                raise IntegrityError
+
+            SpaceDailyUsage.record_reservations([new_reservation], 1)
+            ReservationCounter.record_reservations([new_reservation], 1)
+            ChangeLogEntry.record_reservations([new_reservation], ChangeLogEntry.ACTION_CREATED)
+            cls.enqueue_notifications([new_reservation], cls.NOTIFICATION_CONFIRMED)
+
+        cls.hold_store.release(space, member, target_dt)
+
+        return new_reservation
 
     @classmethod
-    def already_booked(cls, space: Space, target_dt: datetime) -> bool:
+    def create_reservations(cls, member: SystemUser, slots: List[Tuple[Space, datetime]]) -> List['Reservation']:
         """
-        target_dt로 선택된 일시 기준 1시간 이내에 space에 등록된 예약이 있는지 확인하는 메서드
+        여러 공간, 여러 시간대의 예약 내역을 한 번에 생성하는 메서드 (전부 생성되거나, 하나도 생성되지 않음)
+        모든 시간대의 예약 현황을 한 번에 조회해 좌석을 배정한 뒤, 하나의 transaction에서 한 번에 생성한다(bulk insert).
+        예약 자격(사용 제한, 권한) 검사는 호출하는 쪽에서 공간마다 한 번씩 수행해야 한다.
+        :param member: 예약자
+        :param slots: (공간, 예약 시작 일시) 목록 (같은 그룹의 공간이어야 하며, 중복되지 않아야 함)
+        :return: slots와 같은 순서로 생성된 예약 내역 목록
+        :raises ReservationBatchConflict: 좌석이 모두 예약(또는 다른 멤버가 임시 점유)된 시간대가 있는 경우
+        :raises ReservationQuotaExceeded: 그룹 또는 공간의 멤버별 예약 한도를 넘는 경우
+        :raises Http404: member check에 실패한 경우
+        """
+        if not slots:
+            return []
+        member = slots[0][0].group.member_check(member)
+        spaces = {space.pk: space for space, _ in slots}
+
+        with transaction.atomic():
+            # 먼저 요청된 시간대를 함께 생성될 예약으로 간주하여 시간대마다 예약 한도를 검사함
+            for index, (space, target_dt) in enumerate(slots):
+                ReservationCounter.check_quota(
+                    space, member, target_dt,
+                    extra_dts=[dt for other, dt in slots[:index] if other.pk == space.pk],
+                    extra_group_dts=[dt for other, dt in slots[:index] if other.pk != space.pk],
+                )
+
+            # 요청된 모든 시간대의 예약된 좌석을 한 번에 조회함
+            slot_filter = models.Q()
+            for space_pk in spaces:
+                slot_filter |= models.Q(space_id=space_pk,
+                                        dt_from__in=[dt for space, dt in slots if space.pk == space_pk])
+            taken_seats = defaultdict(set)
+            for space_pk, dt_from, seat in cls.objects.filter(slot_filter).values_list('space_id', 'dt_from', 'seat'):
+                taken_seats[(space_pk, dt_from)].add(seat)
+
+            # 다른 멤버의 임시 점유는 공간마다 요청된 범위를 한 번에 조회함
+            holds = {}
+            for space_pk, space in spaces.items():
+                dts = [dt for other, dt in slots if other.pk == space_pk]
+                for held_dt, count in cls.hold_store.count_holds(space, min(dts), max(dts),
+                                                                 exclude_member=member).items():
+                    holds[(space_pk, held_dt)] = count
+
+            new_reservations = []
+            conflicts = []
+            for space, target_dt in slots:
+                free_seats = [seat for seat in range(space.capacity) if seat not in taken_seats[(space.pk, target_dt)]]
+                if len(free_seats) <= holds.get((space.pk, target_dt), 0):
+                    conflicts.append((space, target_dt))
+                    continue
+                new_reservations.append(cls(space=space, member=member, promised_term_id=space.term_snapshot_id,
+                                            dt_from=target_dt, dt_to=cls.get_end_dt(target_dt), seat=free_seats[0]))
+            if conflicts:
+                raise ReservationBatchConflict(conflicts)
+
+            try:
+                with transaction.atomic():
+                    new_reservations = cls.objects.bulk_create(new_reservations)
+            except IntegrityError:
+                # 조회 이후 다른 요청이 같은 좌석을 먼저 예약한 경우
+                raise ReservationBatchConflict(slots)
+
+            SpaceDailyUsage.record_reservations(new_reservations, 1)
+            ReservationCounter.record_reservations(new_reservations, 1)
+            ChangeLogEntry.record_reservations(new_reservations, ChangeLogEntry.ACTION_CREATED)
+            cls.enqueue_notifications(new_reservations, cls.NOTIFICATION_CONFIRMED)
+
+        for space, target_dt in slots:
+            cls.hold_store.release(space, member, target_dt)
+
+        return new_reservations
+
+    def cancel(self) -> None:
+        """
+        예약을 취소(삭제)하는 메서드
+        비게 된 좌석은 대기열(WaitlistEntry)의 대기자에게 자동으로 배정된다.
+        """
+        with transaction.atomic():
+            # 삭제된 instance는 pk를 잃으므로 변경 내역과 알림을 먼저 만듦
+            change_log_entries = ChangeLogEntry.get_reservation_entries([self], ChangeLogEntry.ACTION_DELETED)
+            self.enqueue_notifications([self], self.NOTIFICATION_CANCELLED)
+            self.delete()
+            SpaceDailyUsage.record_reservations([self], -1)
+            ReservationCounter.record_reservations([self], -1)
+            WaitlistEntry.promote(self.space, self.dt_from)
+            # 대기자의 예약 생성(멤버 row 잠금)보다 나중에 변경 내역의 seq를 발급받아,
+            # create_reservation과 같은 순서로 잠금 (대기자에게 배정된 예약이 취소보다 작은 seq로 기록됨)
+            ChangeLogEntry.record(change_log_entries)
+
+    @classmethod
+    def enqueue_notifications(cls, reservations: Iterable['Reservation'], topic: str) -> None:
+        """
+        예약자에게 보낼 알림(예약 확정/취소)을 outbox에 추가하는 메서드
+        예약 내역을 생성/삭제하는 transaction 안에서 호출되어야 한다.
+        :param reservations: 생성 또는 취소된 예약 내역 목록 (space가 로드되어 있어야 함)
+        :param topic: NOTIFICATION_CONFIRMED 또는 NOTIFICATION_CANCELLED
+        """
+        OutboxMessage.enqueue(topic, [
+            (reservation.member_id, {
+                'reservation': reservation.pk,
+                'group': reservation.space.group_id,
+                'space': reservation.space_id,
+                'space_name': reservation.space.name,
+                'start': reservation.dt_from,
+                'end': reservation.dt_to,
+                'seat': reservation.seat,
+            }) for reservation in reservations
+        ])
+
+    @staticmethod
+    def get_end_dt(target_dt: datetime) -> datetime:
+        """
+        예약 시작 일시로부터 예약 해제 일시를 구하는 메서드 (예약은 1시간 단위로 이루어짐)
+        """
+        return target_dt + timezone.timedelta(minutes=59)
+
+    @classmethod
+    def get_free_seats(cls, space: Space, target_dt: datetime) -> List[int]:
+        """
+        target_dt로 선택된 일시에 space에서 예약되지 않은 좌석 번호 목록을 반환하는 메서드
+        """
+        taken_seats = set(cls.objects.filter(space=space, dt_from=target_dt).values_list('seat', flat=True))
+        return [seat for seat in range(space.capacity) if seat not in taken_seats]
+
+    @classmethod
+    def already_booked(cls, space: Space, target_dt: datetime, member: SystemUser = None) -> bool:
+        """
+        target_dt로 선택된 일시 기준 1시간 이내에 space의 좌석이 모두 예약(또는 임시 점유)되어 있는지 확인하는 메서드
         :param space: 예약 유무를 검사할 공간
         :param target_dt: 예약 유무를 검사하기 위한 datetime 객체
-        :return: 예약이 있으면 True, 없으면 False를 반환
+        :param member: 전달된 경우 해당 멤버의 임시 점유는 비어 있는 좌석으로 간주함
+        :return: 좌석이 모두 예약되어 있으면 True, 그렇지 않으면 False를 반환
+        """
+        booked = cls.objects.filter(space=space, dt_from__gte=target_dt,
+                                    dt_to__lt=target_dt + timezone.timedelta(hours=1)).count()
+        return booked + cls.count_holds(space, target_dt, exclude_member=member) >= space.capacity
+
+    @classmethod
+    def count_holds(cls, space: Space, target_dt: datetime, exclude_member: SystemUser = None) -> int:
+        """
+        target_dt 시간대에 space의 좌석을 임시 점유 중인 수를 반환하는 메서드
+        :param exclude_member: 점유 수에서 제외할 멤버
+        """
+        return cls.hold_store.count_holds(space, target_dt, target_dt, exclude_member=exclude_member).get(target_dt, 0)
+
+    @classmethod
+    def hold_slot(cls, space: Space, member: SystemUser, target_dt: datetime) -> bool:
         """
-        return cls.objects.filter(space=space, dt_from__gte=target_dt,
-                                  dt_to__lt=target_dt + timezone.timedelta(hours=1))
+        예약 페이지를 연 member를 위해 target_dt 시간대의 좌석 하나를 RESERVATION_HOLD_TTL_SECONDS 동안 점유하는 메서드
+        점유 중인 좌석은 다른 멤버에게 예약된 것으로 보이며, member가 예약하거나 만료되면 해제된다.
+        멤버는 한 번에 한 시간대만 점유할 수 있으며, 새 시간대를 점유하면 이전에 점유한 시간대는 해제된다.
+        :return: 점유에 성공한 경우(이미 점유 중인 경우 포함) True, 비어 있는 좌석이 없는 경우 False
+        """
+        if cls.already_booked(space, target_dt, member=member):
+            return False
+
+        expires_at = timezone.now() + timezone.timedelta(seconds=settings.RESERVATION_HOLD_TTL_SECONDS)
+        cls.hold_store.acquire(space, member, target_dt, expires_at)
+        return True
 
     @classmethod
-    def get_reservation_of_week(cls, target_dt: timezone.datetime, space: Space) -> List[Dict[int, 'Reservation']]:
+    def get_reservation_of_week(cls, target_dt: timezone.datetime,
+                                space: Space) -> List[Dict[int, List['Reservation']]]:
         """
         target_day가 포함된 주의 월요일부터 일요일까지의 예약 내역 중 space에 연결된 reservation instance를
         월요일(reservation_per_weekdays[0])부터 일요일(reservation_per_weekdays[6])까지, 한시간 단위로 모아서 반환하는 메서드
         :param target_dt: 검색할 일주일이 포함하는 날짜
         :param space: Reservation instance를 검색할 space
-        :return: 2중첩 리스트(바깥 인덱스: 일주일, 안쪽 인덱스: 0시~23시)
+        :return: 2중첩 리스트(바깥 인덱스: 일주일, 안쪽 인덱스: 0시~23시), 각 시간대에는 좌석 번호 순의 예약 내역 목록이 담김
         """
         # target_day의 요일을 구함
         target_weekday = target_dt.weekday()
@@ -205,29 +697,134 @@ class Reservation(models.Model):
         monday_start = target_dt - timezone.timedelta(days=target_weekday)
         sunday_end = monday_start + timezone.timedelta(days=7) - timezone.timedelta(seconds=1)
 
-        # 기준일이 포함된 일주일 안에 포함되어 있는 Reservation instance들을 검색
-        in_range_reservations = Reservation.objects.filter(space=space, dt_from__gte=monday_start,
-                                                           dt_to__lte=sunday_end)
-
-        # 날짜별 reservation instance 정리
-        reservation_per_weekdays = []
-        for i in range(7):
-            # 해당 날짜의 시간대별(1시간 간격) Reservation instance 정리
-            tmp = {_h: None for _h in range(24)}
+        # 날짜별, 시간대별(1시간 간격) reservation instance 정리
+        reservation_per_weekdays = [{_h: [] for _h in range(24)} for _ in range(7)]
 
-            start = monday_start + timezone.timedelta(days=i)
-            end = start + timezone.timedelta(days=1)
+        # 기준일이 포함된 일주일 안에 포함되어 있는 Reservation instance들을 한 번에 검색한 후 분류함
+        for reservation in cls.get_reservations_in_range(space, monday_start, sunday_end):
+            weekday = (reservation.dt_from - monday_start).days
+            reservation_per_weekdays[weekday][reservation.dt_from.hour].append(reservation)
 
-            h = start
-            while h < end:
-                for reservation in in_range_reservations.filter(dt_from__gte=h,
-                                                                dt_to__lt=h + timezone.timedelta(hours=1)):
-                    tmp[h.hour] = reservation
-                h += timezone.timedelta(hours=1)
-            reservation_per_weekdays.append(tmp)
+        for reservations_of_day in reservation_per_weekdays:
+            for reservations in reservations_of_day.values():
+                reservations.sort(key=lambda r: r.seat)
 
         return reservation_per_weekdays
 
+    @classmethod
+    def get_holds_of_week(cls, target_dt: timezone.datetime, space: Space,
+                          exclude_member: SystemUser = None) -> List[List[int]]:
+        """
+        target_dt가 포함된 주의 시간대별 임시 점유 수를 get_reservation_of_week와 같은 형태로 반환하는 메서드
+        :param exclude_member: 점유 수에서 제외할 멤버
+        :return: 2중첩 리스트(바깥 인덱스: 일주일, 안쪽 인덱스: 0시~23시), 각 시간대에는 점유 수가 담김
+        """
+        monday_start = (target_dt - timezone.timedelta(days=target_dt.weekday())).replace(hour=0, minute=0, second=0,
+                                                                                            microsecond=0)
+        sunday_end = monday_start + timezone.timedelta(days=7) - timezone.timedelta(seconds=1)
+
+        holds_per_weekdays = [[0] * 24 for _ in range(7)]
+        for held_dt, count in cls.hold_store.count_holds(space, monday_start, sunday_end,
+                                                         exclude_member=exclude_member).items():
+            holds_per_weekdays[(held_dt - monday_start).days][held_dt.hour] = count
+
+        return holds_per_weekdays
+
+    @classmethod
+    def get_availability(cls, space: Space, date_from: date, days: int,
+                         exclude_member: SystemUser = None) -> Tuple[List[int], List[int]]:
+        """
+        date_from부터 days일 동안의 공간 예약 현황을 날짜별 24bit bitmask로 반환하는 메서드
+        (bit h: h시 ~ h+1시 시간대) 시간대별 예약 수를 한 번의 범위 조회로 집계하므로, 조회 기간이 길어도 instance를 만들지 않는다.
+        :param date_from: 조회 시작 날짜
+        :param days: 조회할 날짜 수
+        :param exclude_member: 점유 수에서 제외할 멤버 (자신의 임시 점유는 비어 있는 좌석으로 간주함)
+        :return: (full, booked) - full: 좌석이 모두 예약(또는 임시 점유)된 시간대, booked: 하나 이상 예약된 시간대
+        """
+        dt_from = datetime.combine(date_from, datetime.min.time())
+        dt_to = dt_from + timezone.timedelta(days=days) - timezone.timedelta(seconds=1)
+
+        counts = defaultdict(int)
+        querysets = [cls.objects]
+        if cls.includes_archived(dt_from):
+            querysets.append(ArchivedReservation.objects)
+        for queryset in querysets:
+            for dt, count in queryset.filter(space=space, dt_from__range=(dt_from, dt_to)) \
+                    .values('dt_from').annotate(count=Count('id')).order_by().values_list('dt_from', 'count'):
+                counts[dt] += count
+        holds = cls.hold_store.count_holds(space, dt_from, dt_to, exclude_member=exclude_member)
+
+        full = [0] * days
+        booked = [0] * days
+        for dt in set(counts) | set(holds):
+            day, bit = (dt - dt_from).days, 1 << dt.hour
+            if counts[dt]:
+                booked[day] |= bit
+            if counts[dt] + holds.get(dt, 0) >= space.capacity:
+                full[day] |= bit
+
+        return full, booked
+
+    @staticmethod
+    def get_archive_boundary() -> datetime:
+        """
+        보관 처리 기준 일시를 반환하는 메서드
+        예약 해제 일시가 기준 일시 이전인 예약 내역은 archive_reservations 명령에 의해 ArchivedReservation으로 옮겨진다.
+        (조회 시에는 기준 일시 대신 실제로 옮겨진 범위(ArchiveWatermark)로 ArchivedReservation을 함께 조회할지 결정함)
+        """
+        boundary = timezone.now() - timezone.timedelta(days=settings.RESERVATION_ARCHIVE_HORIZON_DAYS)
+        return boundary.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    @staticmethod
+    def includes_archived(dt_from: datetime) -> bool:
+        """
+        dt_from 이후의 예약 내역을 조회할 때 ArchivedReservation도 함께 조회해야 하는지 여부를 반환하는 메서드
+        보관된 예약 내역은 모두 예약 해제 일시가 ArchiveWatermark 이전이므로, 조회 시작 일시가 그 이후인 경우에는 조회하지 않는다.
+        """
+        archived_until = ArchiveWatermark.get_archived_until()
+        return archived_until is not None and dt_from < archived_until
+
+    @classmethod
+    def get_reservations_in_range(cls, space: Space, dt_from: datetime, dt_to: datetime) -> List['Reservation']:
+        """
+        space에 등록된 예약 내역 중 dt_from ~ dt_to 사이의 예약 내역을 반환하는 메서드
+        조회 범위가 보관된 예약 내역의 범위(ArchiveWatermark)를 포함하는 경우에만 ArchivedReservation을 함께 조회한다.
+        :param space: 예약 내역을 검색할 공간
+        :param dt_from: 검색 시작 일시
+        :param dt_to: 검색 종료 일시
+        :return: 예약 시작 일시 순으로 정렬된 Reservation(또는 ArchivedReservation) instance 목록
+        """
+        reservations = list(
+            cls.objects.filter(space=space, dt_from__gte=dt_from, dt_to__lte=dt_to).select_related('member')
+        )
+
+        if cls.includes_archived(dt_from):
+            reservations += list(
+                ArchivedReservation.objects.filter(space=space, dt_from__gte=dt_from, dt_to__lte=dt_to)
+                .select_related('member')
+            )
+            reservations.sort(key=lambda r: r.dt_from)
+
+        return reservations
+
+    @classmethod
+    def get_reservation_values_in_range(cls, space: Space, dt_from: datetime, dt_to: datetime,
+                                        lookups: Iterable[str]) -> List[Dict]:
+        """
+        get_reservations_in_range와 같은 범위의 예약 내역을 instance 대신 lookups의 값만 조회하여 반환하는 메서드
+        :param lookups: values()로 조회할 필드 목록 (예: 'seat', 'member__username')
+        :return: 예약 시작 일시 순으로 정렬된 dict 목록 (dt_from은 항상 포함됨)
+        """
+        lookups = {'dt_from', *lookups}
+        rows = list(cls.objects.filter(space=space, dt_from__gte=dt_from, dt_to__lte=dt_to).values(*lookups))
+
+        if cls.includes_archived(dt_from):
+            rows += list(ArchivedReservation.objects.filter(space=space, dt_from__gte=dt_from, dt_to__lte=dt_to)
+                         .values(*lookups))
+
+        rows.sort(key=lambda row: row['dt_from'])
+        return rows
+
     @staticmethod
     def get_datetime(year, month, day) -> datetime:
         """
@@ -244,3 +841,781 @@ class Reservation(models.Model):
 
         target_day = target_day.replace(hour=0, minute=0, second=0, microsecond=0)
         return target_day
+
+
+class ArchivedReservation(models.Model):
+    """
+    보관 처리된 예약 내역
+    예약 해제 일시가 보관 처리 기준 일시(Reservation.get_archive_boundary) 이전인 예약 내역이 Reservation에서 옮겨지며,
+    Reservation에서 사용하던 pk를 그대로 사용한다.
+    - ArchivedReservation : Space = N : 1
+    - ArchivedReservation : SystemUser = N : 1
+    """
+    id = models.BigIntegerField('ID', primary_key=True)
+    created_at = models.DateTimeField('생성 일시')
+    archived_at = models.DateTimeField('보관 일시', auto_now_add=True)
+
+    space = models.ForeignKey(Space, null=False, on_delete=models.CASCADE,
+                              verbose_name='대상 공간', related_name='archived_reservations_as_space')
+
+    member = models.ForeignKey(SystemUser, null=False, on_delete=models.CASCADE,
+                               verbose_name='예약자', related_name='archived_reservations_as_member')
+
+    promised_term = models.ForeignKey(TermBody, null=True, on_delete=models.PROTECT,
+                                      verbose_name='동의 약관 본문', related_name='promised_archived_reservations')
+
+    dt_from = models.DateTimeField('예약 시작 일시', blank=False, null=False)
+    dt_to = models.DateTimeField('예약 해제 일시', blank=False, null=False)
+
+    seat = models.PositiveIntegerField('좌석 번호', default=0)
+
+    class Meta:
+        verbose_name = '보관된 예약'
+        verbose_name_plural = '보관된 예약 목록'
+        indexes = (
+            models.Index(fields=['space', 'dt_from'], name='archived_reservation_space_dt'),
+        )
+
+    is_archived = True
+
+    def __str__(self):
+        return self.member.username
+
+    @property
+    def promised_term_body(self) -> str:
+        """
+        예약 당시 동의한 약관 본문
+        """
+        return '' if self.promised_term_id is None else self.promised_term.body
+
+    @classmethod
+    def archive_before(cls, boundary: datetime, batch_size: int) -> int:
+        """
+        예약 해제 일시가 boundary 이전인 예약 내역을 batch_size개 만큼 Reservation에서 옮기는 메서드
+        옮기기와 삭제는 하나의 transaction에서 수행된다.
+        :param boundary: 보관 처리 기준 일시
+        :param batch_size: 한 번에 옮길 예약 내역의 수
+        :return: 옮겨진 예약 내역의 수 (0인 경우 더 이상 옮길 예약 내역이 없음)
+        :raises IntegrityError: 옮길 예약 내역 중 이미 같은 pk로 보관된 예약 내역이 있는 경우
+        """
+        with transaction.atomic():
+            targets = list(Reservation.objects.filter(dt_to__lt=boundary).order_by('pk')[:batch_size])
+            if not targets:
+                return 0
+
+            # 이미 같은 pk로 보관된 예약 내역이 있으면 IntegrityError로 batch 전체를 되돌림 (원본을 지우지 않음)
+            cls.objects.bulk_create([
+                cls(id=r.pk, created_at=r.created_at, space_id=r.space_id, member_id=r.member_id,
+                    promised_term_id=r.promised_term_id, dt_from=r.dt_from, dt_to=r.dt_to, seat=r.seat)
+                for r in targets
+            ])
+            Reservation.objects.filter(pk__in=[r.pk for r in targets]).delete()
+            ArchiveWatermark.advance(max(r.dt_to for r in targets))
+
+        return len(targets)
+
+    @classmethod
+    def archive_all_before(cls, boundary: datetime, batch_size: int, sleep_seconds: float = 0.0,
+                           on_progress=None) -> int:
+        """
+        예약 해제 일시가 boundary 이전인 예약 내역을 더 이상 남지 않을 때까지 batch_size개씩 옮기는 메서드
+        archive_reservations 명령과 주기 작업에서 함께 사용된다.
+        :param sleep_seconds: batch 사이에 대기할 시간(초)
+        :param on_progress: batch를 옮긴 뒤 지금까지 옮겨진 수를 인자로 호출될 함수
+        :return: 옮겨진 예약 내역의 수
+        """
+        archived = 0
+        while True:
+            moved = cls.archive_before(boundary, batch_size)
+            if not moved:
+                break
+
+            archived += moved
+            if on_progress is not None:
+                on_progress(archived)
+            if sleep_seconds:
+                time.sleep(sleep_seconds)
+        return archived
+
+
+class ArchiveWatermark(models.Model):
+    """
+    보관 처리된(ArchivedReservation으로 옮겨진) 예약 내역의 예약 해제 일시 중 가장 늦은 일시 (row는 하나만 사용됨)
+    예약 내역을 조회할 때 이 일시를 기준으로 ArchivedReservation을 함께 조회할지 결정하므로, 보관 기준
+    (RESERVATION_ARCHIVE_HORIZON_DAYS, archive_reservations --horizon-days)을 바꾸어도 보관된 예약 내역이 조회에서 빠지지 않는다.
+    """
+    archived_until = models.DateTimeField('보관된 예약 해제 일시의 상한', null=True, blank=True)
+
+    class Meta:
+        verbose_name = '보관 처리 범위'
+        verbose_name_plural = '보관 처리 범위'
+
+    @classmethod
+    def get_archived_until(cls) -> Optional[datetime]:
+        """
+        보관된 예약 내역의 예약 해제 일시 중 가장 늦은 일시를 반환하는 메서드 (보관된 예약 내역이 없는 경우 None)
+        """
+        return cls.objects.filter(pk=1).values_list('archived_until', flat=True).first()
+
+    @classmethod
+    def advance(cls, archived_until: datetime) -> None:
+        """
+        보관된 범위를 archived_until까지 넓히는 메서드 (예약 내역을 옮기는 transaction 안에서 호출되어야 함)
+        """
+        if not cls.objects.filter(pk=1).filter(Q(archived_until__isnull=True) | Q(archived_until__lt=archived_until)) \
+                .update(archived_until=archived_until):
+            cls.objects.get_or_create(pk=1, defaults={'archived_until': archived_until})
+
+
+class WaitlistEntry(models.Model):
+    """
+    좌석이 모두 예약된 시간대의 예약 대기열
+    예약이 취소되면 먼저 등록된 대기자부터 자동으로 예약된다.
+    """
+    created_at = models.DateTimeField('대기 등록 일시', auto_now_add=True)
+
+    space = models.ForeignKey(Space, on_delete=models.CASCADE, related_name='waitlist_entries')
+    member = models.ForeignKey(SystemUser, on_delete=models.CASCADE, related_name='waitlist_entries')
+    dt_from = models.DateTimeField('대기 중인 예약 시작 일시', blank=False, null=False)
+
+    class Meta:
+        verbose_name = '예약 대기'
+        verbose_name_plural = '예약 대기 목록'
+        constraints = (
+            models.UniqueConstraint(fields=['space', 'dt_from', 'member'], name='single waitlist entry per slot'),
+        )
+        indexes = (
+            # 시간대별 대기 순서 조회에 사용
+            models.Index(fields=['space', 'dt_from', 'created_at'], name='waitlist_space_dt_created'),
+        )
+
+    def __str__(self):
+        return self.member.username
+
+    @classmethod
+    def join(cls, space: Space, member: SystemUser, target_dt: datetime) -> 'WaitlistEntry':
+        """
+        target_dt 시간대의 대기열에 member를 등록하는 메서드
+        :param space: 대기할 공간
+        :param member: 대기자
+        :param target_dt: 대기할 예약 시작 일시
+        :return: 생성된 대기열 등록 내역
+        :raises IntegrityError: 이미 대기열에 등록되어 있는 경우
+        :raises Http404: member check에 실패한 경우
+        """
+        member = space.group.member_check(member)
+        return cls.objects.create(space=space, member=member, dt_from=target_dt)
+
+    @classmethod
+    def get_position(cls, space: Space, member: SystemUser, target_dt: datetime) -> int:
+        """
+        target_dt 시간대의 대기열에서 member의 대기 순번(1부터 시작)을 반환하는 메서드
+        :return: 대기 순번, 대기열에 등록되어 있지 않은 경우 0
+        """
+        try:
+            entry = cls.objects.get(space=space, member=member, dt_from=target_dt)
+        except cls.DoesNotExist:
+            return 0
+        ahead = cls.objects.filter(space=space, dt_from=target_dt).filter(
+            models.Q(created_at__lt=entry.created_at) | models.Q(created_at=entry.created_at, pk__lt=entry.pk)
+        )
+        return ahead.count() + 1
+
+    @classmethod
+    def promote(cls, space: Space, target_dt: datetime) -> 'Reservation':
+        """
+        비어 있는 좌석을 target_dt 시간대의 대기자에게 등록 순서대로 배정하는 메서드
+        예약할 수 없게 된 대기자(그룹 탈퇴, 차단, 권한 변경, 예약 한도 도달)는 건너뛰며, 그룹 멤버가 아닌 대기자의 대기 내역은 삭제된다.
+        예약이 취소된 transaction 안에서 호출되므로, 취소와 자동 예약은 함께 반영된다.
+        :param space: 좌석이 비게 된 공간
+        :param target_dt: 좌석이 비게 된 예약 시작 일시
+        :return: 대기자에게 생성된 예약 내역, 배정받은 대기자가 없는 경우 None
+        """
+        # 이미 시작된 시간대는 더 이상 예약할 수 없으므로 대기열을 정리함
+        if target_dt < timezone.now():
+            cls.objects.filter(space=space, dt_from=target_dt).delete()
+            return None
+
+        entries = cls.objects.filter(space=space, dt_from=target_dt).select_related('member').order_by('created_at',
+                                                                                                       'pk')
+        for entry in entries:
+            try:
+                member = space.group.member_check(entry.member)
+            except Http404:
+                # 그룹에서 나간 대기자
+                entry.delete()
+                continue
+
+            if member.get_valid_blocks_in_group(space.group) or not Space.permission_checker.check(space, member):
+                continue
+
+            try:
+                new_reservation = Reservation.create_reservation(space=space, member=member, target_dt=target_dt)
+            except ReservationQuotaExceeded:
+                # 예약 한도에 도달한 대기자
+                continue
+            except IntegrityError:
+                # 다른 요청이 빈 좌석을 먼저 예약한 경우
+                return None
+
+            entry.delete()
+            return new_reservation
+
+        return None
+
+
+class ReservationCounter(models.Model):
+    """
+    멤버의 공간별, 날짜별 예약 시간 카운터
+    예약 생성/취소 시 F expression으로 갱신되며, 예약 한도 검사는 내일 이후의 예약 시간을 예약 내역 대신 이 카운터로 합산한다.
+    (합산되는 행의 수는 검사 기간 내 멤버가 예약한 공간과 날짜의 수로 제한됨)
+    """
+    member = models.ForeignKey(SystemUser, on_delete=models.CASCADE, related_name='reservation_counters')
+    group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name='reservation_counters')
+    space = models.ForeignKey(Space, on_delete=models.CASCADE, related_name='reservation_counters')
+    date = models.DateField('날짜')
+
+    hours = models.PositiveIntegerField('예약된 시간', default=0)
+
+    class Meta:
+        verbose_name = '멤버 예약 카운터'
+        verbose_name_plural = '멤버 예약 카운터 목록'
+        constraints = (
+            models.UniqueConstraint(fields=['member', 'space', 'date'], name='single counter per member space date'),
+        )
+        indexes = (
+            # 그룹 단위 예약 한도 검사에 사용
+            models.Index(fields=['member', 'group', 'date'], name='counter_member_group_date'),
+        )
+
+    @classmethod
+    def check_quota(cls, space: Space, member: SystemUser, target_dt: datetime,
+                    extra_dts: Iterable[datetime] = (), extra_group_dts: Iterable[datetime] = ()) -> None:
+        """
+        target_dt 시간대를 예약하면 그룹 또는 공간의 멤버별 예약 한도를 넘는지 검사하는 메서드
+        - max_active_reservations: 아직 끝나지 않은 예약 시간 합계
+          (카운터는 날짜 단위이므로, 오늘의 예약은 이미 끝난 시간대를 빼기 위해 예약 내역에서 센다)
+        - max_weekly_hours: target_dt가 포함된 주(월요일 ~ 일요일)의 예약 시간 합계
+        멤버 행에 lock을 건 뒤 한도가 설정된 범위(그룹, 공간)와 한도마다 카운터의 합계를 조회하므로,
+        한도가 설정되지 않은 경우를 제외하면 예약 요청마다 1개의 lock과 최대 6개의 query가 추가된다.
+        예약 내역을 생성하는 transaction 안에서 호출되어야 한다.
+        :param extra_dts: 아직 카운터에 반영되지 않았지만 함께 생성될 같은 공간의 예약 시작 일시 목록
+        :param extra_group_dts: 아직 카운터에 반영되지 않았지만 함께 생성될 같은 그룹의 다른 공간의 예약 시작 일시 목록
+                                (그룹의 예약 한도에만 반영됨)
+        :raises ReservationQuotaExceeded: 예약 한도를 넘는 경우
+        """
+        scopes = [(scope_name, scope, scope_filter, reservation_filter)
+                  for scope_name, scope, scope_filter, reservation_filter in (
+                      ('그룹', space.group, {'group_id': space.group_id}, {'space__group_id': space.group_id}),
+                      ('공간', space, {'space_id': space.pk}, {'space_id': space.pk}),
+                  ) if scope.max_active_reservations is not None or scope.max_weekly_hours is not None]
+        if not scopes:
+            return
+
+        # 같은 멤버의 예약 요청이 동시에 한도를 검사하지 않도록 멤버 행에 lock을 걸어 순서대로 처리함
+        list(SystemUser.objects.select_for_update().filter(pk=member.pk).values_list('pk', flat=True))
+
+        now = timezone.now()
+        today = now.date()
+        tomorrow = datetime.combine(today + timezone.timedelta(days=1), datetime.min.time())
+        monday = target_dt.date() - timezone.timedelta(days=target_dt.weekday())
+        sunday = monday + timezone.timedelta(days=6)
+        space_extra_dates = [extra_dt.date() for extra_dt in extra_dts]
+        group_extra_dates = space_extra_dates + [extra_dt.date() for extra_dt in extra_group_dts]
+        space_extra_ends = [Reservation.get_end_dt(extra_dt) for extra_dt in extra_dts]
+        group_extra_ends = space_extra_ends + [Reservation.get_end_dt(extra_dt) for extra_dt in extra_group_dts]
+        for scope_name, scope, scope_filter, reservation_filter in scopes:
+            counters = cls.objects.filter(member=member, **scope_filter)
+            extra_dates = group_extra_dates if scope is space.group else space_extra_dates
+            if scope.max_active_reservations is not None:
+                active = counters.filter(date__gt=today).aggregate(total=Sum('hours'))['total'] or 0
+                active += Reservation.objects.filter(member=member, dt_to__gte=now, dt_from__lt=tomorrow,
+                                                     **reservation_filter).count()
+                extra_ends = group_extra_ends if scope is space.group else space_extra_ends
+                active += sum(1 for extra_end in extra_ends if extra_end >= now)
+                if active >= scope.max_active_reservations:
+                    raise ReservationQuotaExceeded(
+                        f'{scope_name}의 최대 예약 수({scope.max_active_reservations}건)에 도달했습니다.'
+                    )
+            if scope.max_weekly_hours is not None:
+                weekly = counters.filter(date__range=(monday, sunday)).aggregate(total=Sum('hours'))['total'] or 0
+                weekly += sum(1 for extra_date in extra_dates if monday <= extra_date <= sunday)
+                if weekly >= scope.max_weekly_hours:
+                    raise ReservationQuotaExceeded(
+                        f'{scope_name}의 주간 최대 예약 시간({scope.max_weekly_hours}시간)에 도달했습니다.'
+                    )
+
+    @classmethod
+    def record_reservations(cls, reservations: Iterable, delta: int) -> None:
+        """
+        생성 또는 취소된 예약 내역을 카운터에 반영하는 메서드
+        예약 내역을 생성/삭제하는 transaction 안에서 호출되어야 한다.
+        :param reservations: 생성 또는 취소된 예약 내역 목록
+        :param delta: 생성된 경우 1, 취소된 경우 -1
+        """
+        # (멤버 pk, 공간 pk, 날짜)별 변경량
+        deltas = defaultdict(int)
+        for reservation in reservations:
+            deltas[(reservation.member_id, reservation.space_id, reservation.dt_from.date())] += delta
+
+        space_groups = dict(Space.all_objects.filter(
+            pk__in={space_id for _, space_id, _ in deltas.keys()}
+        ).values_list('pk', 'group_id'))
+
+        with transaction.atomic():
+            for (member_id, space_id, target_date), hours_delta in deltas.items():
+                counter = cls.objects.filter(member_id=member_id, space_id=space_id, date=target_date)
+                if hours_delta < 0:
+                    counter.filter(hours__gte=-hours_delta).update(hours=F('hours') + hours_delta)
+                    continue
+                if counter.update(hours=F('hours') + hours_delta):
+                    continue
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(member_id=member_id, space_id=space_id, group_id=space_groups[space_id],
+                                           date=target_date, hours=hours_delta)
+                except IntegrityError:
+                    # 다른 요청이 같은 카운터를 먼저 생성한 경우
+                    counter.update(hours=F('hours') + hours_delta)
+
+
+class LotteryRequest(models.Model):
+    """
+    추첨 예약 기간 중에 모인 예약 요청
+    기간이 끝나면 resolve에 의해 한 번에 추첨되며, 결과(당첨/미당첨)는 신청한 멤버에게 공간 페이지에서 안내된다.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_WON = 'won'
+    STATUS_LOST = 'lost'
+    STATUS_CHOICES = (
+        (STATUS_PENDING, '추첨 대기'),
+        (STATUS_WON, '당첨'),
+        (STATUS_LOST, '미당첨'),
+    )
+
+    created_at = models.DateTimeField('신청 일시', auto_now_add=True)
+
+    space = models.ForeignKey(Space, on_delete=models.CASCADE, related_name='lottery_requests')
+    member = models.ForeignKey(SystemUser, on_delete=models.CASCADE, related_name='lottery_requests')
+    dt_from = models.DateTimeField('신청한 예약 시작 일시', blank=False, null=False)
+
+    status = models.CharField('추첨 결과', max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    resolved_at = models.DateTimeField('추첨 일시', null=True, blank=True)
+    reservation = models.ForeignKey(Reservation, null=True, blank=True, on_delete=models.SET_NULL,
+                                    related_name='lottery_requests', verbose_name='당첨된 예약')
+
+    class Meta:
+        verbose_name = '추첨 예약 신청'
+        verbose_name_plural = '추첨 예약 신청 목록'
+        constraints = (
+            models.UniqueConstraint(fields=['space', 'dt_from', 'member'], name='single lottery request per slot'),
+        )
+        indexes = (
+            # 추첨 대상(추첨 대기 중인 신청) 검색에 사용
+            models.Index(fields=['space', 'status'], name='lottery_space_status'),
+        )
+
+    # 미당첨된 멤버에게 보내는 알림 종류 (OutboxMessage.topic)
+    NOTIFICATION_LOST = 'lottery.lost'
+
+    def __str__(self):
+        return self.member.username
+
+    @classmethod
+    def enter(cls, space: Space, member: SystemUser, target_dt: datetime) -> 'LotteryRequest':
+        """
+        target_dt 시간대의 추첨에 member를 신청하는 메서드
+        :raises IntegrityError: 이미 신청한 경우
+        :raises Http404: member check에 실패한 경우
+        """
+        member = space.group.member_check(member)
+        return cls.objects.create(space=space, member=member, dt_from=target_dt)
+
+    @classmethod
+    def is_awaiting_draw(cls, space: Space, target_dt: datetime) -> bool:
+        """
+        추첨 신청 기간이 끝났지만 target_dt 시간대의 신청이 아직 추첨되지 않았는지 확인하는 메서드
+        추첨은 주기 작업(resolve_booking_lotteries)으로 수행되며,
+        추첨되지 않은 시간대가 일반 예약으로 먼저 채워지지 않도록 예약 요청 전에 호출된다.
+        """
+        if space.lottery_closes_at is None or space.lottery_closes_at > timezone.now():
+            return False
+        return cls.objects.filter(space=space, status=cls.STATUS_PENDING, dt_from=target_dt).exists()
+
+    @classmethod
+    def resolve_all_closed(cls, rng: random.Random = None, on_resolved=None) -> Tuple[int, int, int]:
+        """
+        추첨 신청 기간이 끝난 모든 공간의 추첨 대기 중인 신청을 공간별로 추첨하는 메서드
+        resolve_booking_lotteries 명령과 주기 작업에서 함께 사용된다.
+        :param rng: 추첨에 사용할 난수 생성기 (기본값: random.SystemRandom)
+        :param on_resolved: 공간마다 추첨한 뒤 (공간, 당첨된 신청 수, 미당첨된 신청 수)를 인자로 호출될 함수
+        :return: (추첨한 공간 수, 당첨된 신청 수, 미당첨된 신청 수)
+        """
+        spaces = list(Space.objects.filter(
+            lottery_closes_at__lte=timezone.now(),
+            lottery_requests__status=cls.STATUS_PENDING,
+        ).distinct())
+
+        total_won, total_lost = 0, 0
+        for space in spaces:
+            won, lost = cls.resolve(space, rng=rng)
+            total_won += won
+            total_lost += lost
+            if on_resolved is not None:
+                on_resolved(space, won, lost)
+        return len(spaces), total_won, total_lost
+
+    @classmethod
+    def resolve(cls, space: Space, rng: random.Random = None) -> Tuple[int, int]:
+        """
+        space에 모인 추첨 대기 중인 신청을 한 번에 추첨하는 메서드
+        멤버의 순서를 무작위로 정한 뒤, 한 바퀴에 멤버마다 신청한 시간대 중 하나씩(무작위 순서) 좌석을 배정하므로
+        먼저 신청했거나 많이 신청한 멤버가 유리하지 않다.
+        예약할 수 없는 멤버(그룹 탈퇴, 차단, 권한 없음, 예약 한도 도달)의 신청은 미당첨 처리된다.
+        당첨된 예약 내역은 한 번에 생성되며(bulk insert), 당첨/미당첨된 멤버에게 알림이 보내진다.
+        :param space: 추첨할 공간
+        :param rng: 추첨에 사용할 난수 생성기 (기본값: random.SystemRandom)
+        :return: (당첨된 신청 수, 미당첨된 신청 수)
+        """
+        rng = rng or random.SystemRandom()
+        now = timezone.now()
+
+        with transaction.atomic():
+            # 같은 공간의 추첨이 동시에 수행되지 않도록 공간 행에 lock을 걸어 순서대로 처리함
+            list(Space.all_objects.select_for_update().filter(pk=space.pk).values_list('pk', flat=True))
+            entries = list(cls.objects.filter(space=space, status=cls.STATUS_PENDING).select_related('member'))
+            if not entries:
+                return 0, 0
+
+            # 시간대별로 이미 예약된 좌석
+            taken_seats = defaultdict(set)
+            for dt_from, seat in Reservation.objects.filter(
+                    space=space, dt_from__in={entry.dt_from for entry in entries}
+            ).values_list('dt_from', 'seat'):
+                taken_seats[dt_from].add(seat)
+
+            member_ids = set(space.group.members.values_list('pk', flat=True))
+            blocked_member_ids = set(space.group.blocks_in_group.filter(dt_from__lte=now, dt_to__gte=now)
+                                     .values_list('member_id', flat=True))
+
+            entries_per_member = defaultdict(list)
+            lost = []
+            for entry in entries:
+                eligible = entry.member_id in member_ids and entry.member_id not in blocked_member_ids \
+                    and entry.dt_from >= now
+                if eligible:
+                    entries_per_member[entry.member_id].append(entry)
+                else:
+                    lost.append(entry)
+
+            member_order = list(entries_per_member.keys())
+            rng.shuffle(member_order)
+            for member_id in member_order:
+                member_entries = entries_per_member[member_id]
+                if not Space.permission_checker.check(space, member_entries[0].member):
+                    lost += member_entries
+                    del entries_per_member[member_id]
+                else:
+                    rng.shuffle(member_entries)
+            member_order = [member_id for member_id in member_order if member_id in entries_per_member]
+
+            won = []
+            won_dts = defaultdict(list)
+            assigned = True
+            while assigned:
+                assigned = False
+                # 한 바퀴에 멤버마다 최대 하나의 좌석을 배정함
+                for member_id in member_order:
+                    member_entries = entries_per_member[member_id]
+                    while member_entries:
+                        entry = member_entries.pop()
+                        free_seats = [seat for seat in range(space.capacity) if seat not in taken_seats[entry.dt_from]]
+                        if not free_seats:
+                            lost.append(entry)
+                            continue
+                        try:
+                            ReservationCounter.check_quota(space, entry.member, entry.dt_from,
+                                                           extra_dts=won_dts[member_id])
+                        except ReservationQuotaExceeded:
+                            lost.append(entry)
+                            continue
+
+                        taken_seats[entry.dt_from].add(free_seats[0])
+                        won_dts[member_id].append(entry.dt_from)
+                        won.append((entry, free_seats[0]))
+                        assigned = True
+                        break
+
+            new_reservations = Reservation.objects.bulk_create([
+                Reservation(space=space, member_id=entry.member_id, promised_term_id=space.term_snapshot_id,
+                            dt_from=entry.dt_from, dt_to=Reservation.get_end_dt(entry.dt_from), seat=seat)
+                for entry, seat in won
+            ])
+            SpaceDailyUsage.record_reservations(new_reservations, 1)
+            ReservationCounter.record_reservations(new_reservations, 1)
+            ChangeLogEntry.record_reservations(new_reservations, ChangeLogEntry.ACTION_CREATED)
+            Reservation.enqueue_notifications(new_reservations, Reservation.NOTIFICATION_CONFIRMED)
+
+            for (entry, _), new_reservation in zip(won, new_reservations):
+                entry.status = cls.STATUS_WON
+                entry.resolved_at = now
+                # bulk_create에서 pk가 반환되지 않는 DB에서는 당첨된 예약과 연결하지 않음
+                entry.reservation_id = new_reservation.pk
+            for entry in lost:
+                entry.status = cls.STATUS_LOST
+                entry.resolved_at = now
+            cls.objects.bulk_update([entry for entry, _ in won] + lost, ['status', 'resolved_at', 'reservation'])
+            OutboxMessage.enqueue(cls.NOTIFICATION_LOST, [
+                (entry.member_id, {
+                    'lottery_request': entry.pk,
+                    'group': space.group_id,
+                    'space': space.pk,
+                    'space_name': space.name,
+                    'start': entry.dt_from,
+                }) for entry in lost
+            ])
+
+        return len(won), len(lost)
+
+
+class ChangeLogCounter(models.Model):
+    """
+    그룹별로 마지막으로 발급된 변경 내역의 seq
+    변경 내역을 기록하는 transaction은 이 row를 갱신하여(commit될 때까지 잠김) seq를 발급받으므로,
+    같은 그룹의 변경 내역은 seq 순서대로 commit된다.
+    """
+    group = models.OneToOneField(Group, primary_key=True, on_delete=models.CASCADE, related_name='+')
+    last_seq = models.BigIntegerField('마지막 순번', default=0)
+
+    class Meta:
+        verbose_name = '변경 내역 순번'
+        verbose_name_plural = '변경 내역 순번 목록'
+
+    @classmethod
+    def allocate(cls, group_id: int, count: int) -> int:
+        """
+        그룹의 seq를 count개 발급하는 메서드
+        변경을 수행하는 transaction 안에서 호출되어야 하며, 다른 row를 잠그는 작업보다 나중에(transaction의 마지막에)
+        호출되어야 한다. (잠그는 순서가 달라 교착 상태가 되지 않도록)
+        :return: 발급된 seq 중 마지막 seq (발급된 seq: 반환값 - count + 1 ~ 반환값)
+        """
+        if not cls.objects.filter(group_id=group_id).update(last_seq=F('last_seq') + count):
+            try:
+                with transaction.atomic():
+                    cls.objects.create(group_id=group_id, last_seq=count)
+                return count
+            except IntegrityError:
+                cls.objects.filter(group_id=group_id).update(last_seq=F('last_seq') + count)
+        return cls.objects.filter(group_id=group_id).values_list('last_seq', flat=True).get()
+
+
+class ChangeLogEntry(models.Model):
+    """
+    그룹의 예약, 공간, 약관 변경 내역 (append-only)
+    변경과 같은 transaction에서 기록되며, 같은 그룹의 seq는 기록(commit)된 순서대로 증가한다. (ChangeLogCounter)
+    - 변경 내역 API(changes since token)에서 클라이언트가 마지막으로 받은 seq 이후의 변경만 받아가는 데 사용된다.
+    - 실시간 예약 현황(SSE)에서 재연결한 구독자에게 놓친 이벤트를 전달하거나,
+      다른 worker 프로세스의 변경을 전달하는 데(LIVE_UPDATES['broker'] = 'database') 사용된다.
+    """
+    ACTION_CREATED = 'created'
+    ACTION_UPDATED = 'updated'
+    ACTION_DELETED = 'deleted'
+    ACTION_CHOICES = (
+        (ACTION_CREATED, '생성'),
+        (ACTION_UPDATED, '수정'),
+        (ACTION_DELETED, '삭제'),
+    )
+
+    OBJECT_RESERVATION = 'reservation'
+    OBJECT_SPACE = 'space'
+    OBJECT_TERM = 'term'
+    OBJECT_TYPE_CHOICES = (
+        (OBJECT_RESERVATION, '예약'),
+        (OBJECT_SPACE, '공간'),
+        (OBJECT_TERM, '약관'),
+    )
+
+    # 그룹 안에서의 순번 (ChangeLogCounter에서 발급됨)
+    seq = models.BigIntegerField('순번')
+    created_at = models.DateTimeField('기록 일시', auto_now_add=True)
+
+    group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name='change_log_entries')
+    # 공간이 삭제(purge)되어도 변경 내역은 남겨둠
+    space = models.ForeignKey(Space, null=True, on_delete=models.DO_NOTHING, db_constraint=False,
+                              related_name='+')
+
+    object_type = models.CharField('대상 종류', max_length=20, choices=OBJECT_TYPE_CHOICES)
+    object_id = models.BigIntegerField('대상 ID')
+    action = models.CharField('변경 종류', max_length=10, choices=ACTION_CHOICES)
+    data = models.JSONField('변경 내용', default=dict)
+
+    # commit된 변경 이벤트를 실시간 구독자에게 전달하는 곳 (LIVE_UPDATES['broker']에 따라 결정됨, 아래에서 설정)
+    event_broker: EventBroker = None
+
+    class Meta:
+        verbose_name = '변경 내역'
+        verbose_name_plural = '변경 내역 목록'
+        constraints = (
+            models.UniqueConstraint(fields=['group', 'seq'], name='single change log entry per group seq'),
+        )
+        indexes = (
+            models.Index(fields=['space', 'seq'], name='changelog_space_seq'),
+        )
+
+    def __str__(self):
+        return f'#{self.seq} {self.object_type}.{self.action}'
+
+    @staticmethod
+    def get_channels(group_id: int, space_id: int = None) -> List[str]:
+        """
+        변경 내역을 구독할 수 있는 channel 목록을 반환하는 메서드
+        """
+        channels = [f'group:{group_id}']
+        if space_id is not None:
+            channels.append(f'space:{space_id}')
+        return channels
+
+    def to_event(self) -> Dict:
+        """
+        구독자에게 전달할 이벤트를 반환하는 메서드
+        """
+        return {
+            'seq': self.seq,
+            'type': f'{self.object_type}.{self.action}',
+            'group': self.group_id,
+            'space': self.space_id,
+            'id': self.object_id,
+            'data': self.data,
+        }
+
+    @classmethod
+    def record(cls, entries: List['ChangeLogEntry']) -> List['ChangeLogEntry']:
+        """
+        변경 내역을 기록하는 메서드
+        변경을 수행하는 transaction 안에서, 다른 row를 잠그는 작업을 모두 마친 뒤에 호출되어야 하며,
+        이벤트는 commit된 후에 전달된다.
+        seq는 그룹의 ChangeLogCounter에서 발급받으므로, 같은 그룹의 변경 내역은 seq 순서대로 commit된다.
+        (먼저 commit된 내역보다 작은 seq가 나중에 commit되면, 그 사이에 변경 내역을 받아간 클라이언트가 이를 놓치게 됨)
+        """
+        if not entries:
+            return entries
+
+        entries_per_group = defaultdict(list)
+        for entry in entries:
+            entries_per_group[entry.group_id].append(entry)
+        # 여러 그룹의 counter를 잠그는 경우 항상 같은 순서로 잠금
+        for group_id in sorted(entries_per_group.keys()):
+            group_entries = entries_per_group[group_id]
+            last_seq = ChangeLogCounter.allocate(group_id, len(group_entries))
+            for seq, entry in enumerate(group_entries, start=last_seq - len(group_entries) + 1):
+                entry.seq = seq
+
+        entries = cls.objects.bulk_create(entries)
+        transaction.on_commit(lambda: cls.publish(entries))
+        return entries
+
+    @classmethod
+    def record_reservations(cls, reservations: Iterable, action: str) -> List['ChangeLogEntry']:
+        """
+        생성 또는 취소된 예약 내역을 변경 내역으로 기록하는 메서드
+        :param reservations: 생성 또는 취소된 예약 내역 목록 (space가 로드되어 있어야 함)
+        :param action: ACTION_CREATED 또는 ACTION_DELETED
+        """
+        return cls.record(cls.get_reservation_entries(reservations, action))
+
+    @classmethod
+    def get_reservation_entries(cls, reservations: Iterable, action: str) -> List['ChangeLogEntry']:
+        """
+        예약 내역의 변경 내역을 기록하지 않고 만드는 메서드
+        예약 내역을 삭제한 뒤(pk를 잃은 뒤)에 기록해야 하는 경우 삭제하기 전에 만들어 둔다.
+        """
+        return [
+            cls(group_id=reservation.space.group_id, space_id=reservation.space_id,
+                object_type=cls.OBJECT_RESERVATION, object_id=reservation.pk, action=action,
+                data={
+                    'start': reservation.dt_from.isoformat(),
+                    'end': reservation.dt_to.isoformat(),
+                    'seat': reservation.seat,
+                    'member': reservation.member_id,
+                })
+            for reservation in reservations
+        ]
+
+    @classmethod
+    def record_spaces(cls, spaces: Iterable[Space], action: str) -> List['ChangeLogEntry']:
+        """
+        생성, 수정 또는 삭제된 공간을 변경 내역으로 기록하는 메서드
+        삭제된 공간의 예약 내역은 따로 기록되지 않으므로, 클라이언트는 공간의 삭제 내역을 받으면 공간의 예약 내역도 지워야 한다.
+        :param action: ACTION_CREATED, ACTION_UPDATED 또는 ACTION_DELETED
+        """
+        return cls.record([
+            cls(group_id=space.group_id, space_id=space.pk,
+                object_type=cls.OBJECT_SPACE, object_id=space.pk, action=action,
+                data={'name': space.name} if action == cls.ACTION_DELETED else {
+                    'name': space.name,
+                    'capacity': space.capacity,
+                    'term': space.term_id,
+                    'required_permission': space.required_permission_id,
+                    'max_active_reservations': space.max_active_reservations,
+                    'max_weekly_hours': space.max_weekly_hours,
+                    'lottery_opens_at': None if space.lottery_opens_at is None else space.lottery_opens_at.isoformat(),
+                    'lottery_closes_at': None if space.lottery_closes_at is None else space.lottery_closes_at.isoformat(),
+                })
+            for space in spaces
+        ])
+
+    @classmethod
+    def record_terms(cls, terms: Iterable[Term], action: str) -> List['ChangeLogEntry']:
+        """
+        생성, 수정 또는 삭제된 약관을 변경 내역으로 기록하는 메서드
+        :param action: ACTION_CREATED, ACTION_UPDATED 또는 ACTION_DELETED
+        """
+        return cls.record([
+            cls(group_id=term.group_id, space_id=None,
+                object_type=cls.OBJECT_TERM, object_id=term.pk, action=action,
+                data={'title': term.title})
+            for term in terms
+        ])
+
+    @classmethod
+    def publish(cls, entries: List['ChangeLogEntry']) -> None:
+        """
+        commit된 변경 내역을 channel별로 모아 event_broker로 전달하는 메서드
+        """
+        events_per_channel = defaultdict(list)
+        for entry in entries:
+            for channel in cls.get_channels(entry.group_id, entry.space_id):
+                events_per_channel[channel].append(entry.to_event())
+        for channel, events in events_per_channel.items():
+            cls.event_broker.publish([channel], events)
+
+    @classmethod
+    def get_events_since(cls, channel: str, after_seq: int, limit: int = 500) -> List[Dict]:
+        """
+        channel의 변경 내역 중 after_seq 이후의 내역을 이벤트로 반환하는 메서드
+        """
+        kind, pk = channel.split(':', 1)
+        entries = cls.objects.filter(seq__gt=after_seq, **{f'{kind}_id': int(pk)}).order_by('seq')[:limit]
+        return [entry.to_event() for entry in entries]
+
+    @classmethod
+    def get_group_changes(cls, group: Group, after_seq: int, limit: int) -> Tuple[List[Dict], bool]:
+        """
+        그룹의 변경 내역 중 after_seq 이후의 내역을 기록된 순서대로 반환하는 메서드
+        :return: (이벤트 목록, 더 남아 있는 내역이 있는지 여부)
+        """
+        entries = list(cls.objects.filter(group=group, seq__gt=after_seq).order_by('seq')[:limit + 1])
+        return [entry.to_event() for entry in entries[:limit]], len(entries) > limit
+
+    @classmethod
+    def get_latest_seq(cls, channel: str) -> int:
+        """
+        channel의 변경 내역 중 마지막으로 기록된 내역의 seq를 반환하는 메서드 (기록된 내역이 없는 경우 0)
+        """
+        kind, pk = channel.split(':', 1)
+        entries = cls.objects.filter(**{f'{kind}_id': int(pk)})
+        return entries.aggregate(latest=models.Max('seq'))['latest'] or 0
+
+
+ChangeLogEntry.event_broker = create_event_broker(settings.LIVE_UPDATES['broker'], ChangeLogEntry,
+                                                  settings.LIVE_UPDATES['poll_seconds'])
@@ -11,3 +11,13 @@ def index(indexable, i):
 @register.filter
 def zero_left_padding(target):
     return '{:0>2s}'.format(str(target))
+
+
+@register.filter
+def remaining_capacity(reservations, capacity):
+    return capacity - len(reservations)
+
+
+@register.filter
+def subtract(value, arg):
+    return value - arg
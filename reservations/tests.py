@@ -1,3 +1,967 @@
-from django.test import TestCase
+import datetime
+import json
+import random
+from io import StringIO
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, models, transaction
+from django.http import Http404
+from django.test import TestCase, TransactionTestCase, RequestFactory, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from commons.models import OutboxMessage
+from commons.views import AsyncViewWithContext
+from reservations import views
+from reservations.event_strategies import SUBSCRIBER_QUEUE_SIZE, EventStreamOverflow, InMemoryEventBroker, \
+    create_event_broker
+from reservations.hold_strategies import InMemorySlotHoldStore
+from reservations.models import TermBody, Term, Space, Reservation, ReservationCounter, ReservationQuotaExceeded, \
+    ReservationHold, WaitlistEntry, LotteryRequest, ArchivedReservation, ArchiveWatermark, ChangeLogEntry, \
+    ChangeLogCounter
+from users.models import SystemUser, Group
+from users.views import AsyncGroupListView
+
+
+class ReservationTestCase(TestCase):
+    """
+    그룹 관리자, 멤버, 약관이 준비된 상태에서 예약 관련 동작을 검사하는 TestCase
+    """
+
+    def setUp(self):
+        self.manager = SystemUser.signup('manager', 'password1234', 'manager@example.com', 'manager')
+        self.member = SystemUser.signup('member', 'password1234', 'member@example.com', 'member')
+        self.other = SystemUser.signup('other', 'password1234', 'other@example.com', 'other')
+        self.group = Group.start_new_group(self.manager, 'group', False)
+        self.group.add_member(self.member)
+        self.group.add_member(self.other)
+        self.term = Term.create_term(self.group, 'term', 'body')
+
+    def create_space(self, name: str = 'space', **kwargs) -> Space:
+        return Space.create_space(name, self.group, self.term, None, **kwargs)
+
+    @staticmethod
+    def get_slot(days: int = 1, hour: int = 10):
+        """
+        days일 후 hour시의 예약 시작 일시를 반환하는 메서드
+        """
+        return (timezone.now() + timezone.timedelta(days=days)).replace(hour=hour, minute=0, second=0, microsecond=0)
+
+
+class ReservationCapacityTest(ReservationTestCase):
+    """
+    공간의 좌석 수(capacity)에 따른 예약 생성
+    """
+
+    def test_seats_are_assigned_in_order(self):
+        space = self.create_space(capacity=2)
+        target_dt = self.get_slot()
+
+        first = Reservation.create_reservation(space, self.member, target_dt)
+        second = Reservation.create_reservation(space, self.other, target_dt)
+        self.assertEqual((first.seat, second.seat), (0, 1))
+        self.assertEqual(Reservation.get_free_seats(space, target_dt), [])
+
+    def test_full_slot_raises_integrity_error(self):
+        space = self.create_space(capacity=2)
+        target_dt = self.get_slot()
+        Reservation.create_reservation(space, self.member, target_dt)
+        Reservation.create_reservation(space, self.other, target_dt)
+
+        with self.assertRaises(IntegrityError):
+            Reservation.create_reservation(space, self.manager, target_dt)
+        self.assertEqual(Reservation.objects.filter(space=space, dt_from=target_dt).count(), 2)
+
+    def test_seat_is_unique_per_slot(self):
+        space = self.create_space()
+        target_dt = self.get_slot()
+        Reservation.create_reservation(space, self.member, target_dt)
+
+        # 좌석 배정을 거치지 않고 같은 좌석을 예약하려는 경우에도 DB 제약 조건에 의해 거부됨
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Reservation.objects.create(space=space, member=self.other, promised_term_id=space.term_snapshot_id,
+                                       dt_from=target_dt, dt_to=Reservation.get_end_dt(target_dt), seat=0)
+
+
+class WaitlistPromotionTest(ReservationTestCase):
+    """
+    예약 취소 시 대기열(WaitlistEntry)의 대기자에게 좌석이 배정되는지 검사
+    """
+
+    def setUp(self):
+        super(WaitlistPromotionTest, self).setUp()
+        self.space = self.create_space()
+        self.target_dt = self.get_slot()
+        self.reservation = Reservation.create_reservation(self.space, self.manager, self.target_dt)
+
+    def test_cancel_promotes_first_waiter(self):
+        WaitlistEntry.join(self.space, self.member, self.target_dt)
+        WaitlistEntry.join(self.space, self.other, self.target_dt)
+        self.assertEqual(WaitlistEntry.get_position(self.space, self.other, self.target_dt), 2)
+
+        self.reservation.cancel()
+
+        promoted = Reservation.objects.get(space=self.space, dt_from=self.target_dt)
+        self.assertEqual(promoted.member, self.member)
+        self.assertEqual(WaitlistEntry.get_position(self.space, self.member, self.target_dt), 0)
+        self.assertEqual(WaitlistEntry.get_position(self.space, self.other, self.target_dt), 1)
+
+    def test_waiter_over_quota_is_skipped(self):
+        self.space.update(max_active_reservations=1)
+        Reservation.create_reservation(self.space, self.member, self.get_slot(hour=11))
+        WaitlistEntry.join(self.space, self.member, self.target_dt)
+        WaitlistEntry.join(self.space, self.other, self.target_dt)
+
+        self.reservation.cancel()
+
+        promoted = Reservation.objects.get(space=self.space, dt_from=self.target_dt)
+        self.assertEqual(promoted.member, self.other)
+        # 건너뛴 대기자는 대기열에 남아 있음
+        self.assertEqual(WaitlistEntry.get_position(self.space, self.member, self.target_dt), 1)
+
+    def test_cancel_without_waiters_frees_seat(self):
+        self.reservation.cancel()
+        self.assertEqual(Reservation.get_free_seats(self.space, self.target_dt), [0])
+
+
+class ReservationQuotaTest(ReservationTestCase):
+    """
+    ReservationCounter.check_quota에 의한 멤버별 예약 한도 검사
+    """
+
+    def test_space_max_active_reservations(self):
+        space = self.create_space(max_active_reservations=2)
+        Reservation.create_reservation(space, self.member, self.get_slot(hour=10))
+        Reservation.create_reservation(space, self.member, self.get_slot(hour=11))
+
+        with self.assertRaises(ReservationQuotaExceeded):
+            Reservation.create_reservation(space, self.member, self.get_slot(hour=12))
+        # 다른 멤버의 예약 한도에는 영향을 주지 않음
+        Reservation.create_reservation(space, self.other, self.get_slot(hour=12))
+
+    def test_group_max_weekly_hours(self):
+        self.group.update_info(max_weekly_hours=1)
+        space = self.create_space()
+        other_space = self.create_space('other space')
+        target_dt = self.get_slot(days=7)
+        Reservation.create_reservation(space, self.member, target_dt)
+
+        # 그룹의 한도는 같은 그룹의 다른 공간의 예약에도 적용됨
+        with self.assertRaises(ReservationQuotaExceeded):
+            Reservation.create_reservation(other_space, self.member, target_dt + timezone.timedelta(hours=1))
+        # 다른 주의 예약은 주간 한도에 포함되지 않음
+        Reservation.create_reservation(other_space, self.member, target_dt + timezone.timedelta(days=7))
+
+    def test_cancel_releases_quota(self):
+        space = self.create_space(max_active_reservations=1)
+        reservation = Reservation.create_reservation(space, self.member, self.get_slot(hour=10))
+        with self.assertRaises(ReservationQuotaExceeded):
+            ReservationCounter.check_quota(space, self.member, self.get_slot(hour=11))
+
+        reservation.cancel()
+        ReservationCounter.check_quota(space, self.member, self.get_slot(hour=11))
+
+    def test_ended_slots_today_are_not_active(self):
+        space = self.create_space(max_active_reservations=1)
+        # 오늘 이미 끝난 시간대의 예약 (예약 요청으로는 지난 시간대를 예약할 수 없으므로 직접 생성함)
+        ended_dt = timezone.now().replace(minute=0, second=0, microsecond=0) - timezone.timedelta(hours=1)
+        ended = Reservation.objects.create(space=space, member=self.member, dt_from=ended_dt,
+                                           dt_to=Reservation.get_end_dt(ended_dt))
+        ReservationCounter.record_reservations([ended], 1)
+
+        Reservation.create_reservation(space, self.member, self.get_slot(hour=10))
+        with self.assertRaises(ReservationQuotaExceeded):
+            ReservationCounter.check_quota(space, self.member, self.get_slot(hour=11))
+
+    def test_extra_dts_count_toward_quota(self):
+        space = self.create_space(max_weekly_hours=2)
+        target_dt = self.get_slot(days=7)
+
+        ReservationCounter.check_quota(space, self.member, target_dt, extra_dts=[target_dt])
+        with self.assertRaises(ReservationQuotaExceeded):
+            ReservationCounter.check_quota(space, self.member, target_dt,
+                                           extra_dts=[target_dt + timezone.timedelta(hours=h) for h in (1, 2)])
+
+
+class ReservationHoldTest(ReservationTestCase):
+    """
+    예약 페이지를 연 멤버를 위한 좌석의 임시 점유(hold)
+    """
+
+    def setUp(self):
+        super(ReservationHoldTest, self).setUp()
+        self.space = self.create_space()
+        self.target_dt = self.get_slot()
+
+    def test_hold_blocks_other_members_until_booked(self):
+        self.assertTrue(Reservation.hold_slot(self.space, self.member, self.target_dt))
+
+        # 점유한 멤버에게는 비어 있는 좌석으로 보이지만, 다른 멤버는 예약할 수 없음
+        self.assertFalse(Reservation.already_booked(self.space, self.target_dt, member=self.member))
+        self.assertFalse(Reservation.hold_slot(self.space, self.other, self.target_dt))
+        with self.assertRaises(IntegrityError):
+            Reservation.create_reservation(self.space, self.other, self.target_dt)
+
+        Reservation.create_reservation(self.space, self.member, self.target_dt)
+        self.assertFalse(ReservationHold.objects.exists())
+
+    def test_new_hold_releases_previous_one(self):
+        next_dt = self.target_dt + timezone.timedelta(hours=1)
+        Reservation.hold_slot(self.space, self.member, self.target_dt)
+        Reservation.hold_slot(self.space, self.member, next_dt)
+
+        self.assertEqual(list(ReservationHold.objects.values_list('dt_from', flat=True)), [next_dt])
+        Reservation.create_reservation(self.space, self.other, self.target_dt)
+
+    def test_expired_hold_does_not_block(self):
+        Reservation.hold_slot(self.space, self.member, self.target_dt)
+        ReservationHold.objects.update(expires_at=timezone.now() - timezone.timedelta(seconds=1))
+
+        self.assertTrue(Reservation.hold_slot(self.space, self.other, self.target_dt))
+        self.assertEqual(list(ReservationHold.objects.values_list('member', flat=True)), [self.other.pk])
+
+    def test_in_memory_store_expires_and_excludes_holder(self):
+        store = InMemorySlotHoldStore()
+        now = timezone.now()
+        store.acquire(self.space, self.member, self.target_dt, now + timezone.timedelta(minutes=5))
+        store.acquire(self.space, self.other, self.target_dt, now - timezone.timedelta(seconds=1))
+
+        self.assertEqual(store.count_holds(self.space, self.target_dt, self.target_dt), {self.target_dt: 1})
+        self.assertEqual(store.count_holds(self.space, self.target_dt, self.target_dt, exclude_member=self.member),
+                         {self.target_dt: 0})
+
+        store.release(self.space, self.member, self.target_dt)
+        self.assertEqual(store.count_holds(self.space, self.target_dt, self.target_dt), {})
+
+
+class ReservationAvailabilityTest(ReservationTestCase):
+    """
+    기간별 공간 예약 현황의 날짜별 bitmask
+    """
+
+    def setUp(self):
+        super(ReservationAvailabilityTest, self).setUp()
+        self.space = self.create_space(capacity=2)
+        self.target_dt = self.get_slot(days=2, hour=10)
+        self.date_from = self.target_dt.date() - timezone.timedelta(days=1)
+
+    def test_bits_mark_booked_and_full_slots(self):
+        next_dt = self.target_dt + timezone.timedelta(hours=1)
+        Reservation.create_reservation(self.space, self.member, self.target_dt)
+        Reservation.create_reservation(self.space, self.other, self.target_dt)
+        Reservation.create_reservation(self.space, self.other, next_dt)
+
+        full, booked = Reservation.get_availability(self.space, self.date_from, 3)
+
+        self.assertEqual(full, [0, 1 << 10, 0])
+        self.assertEqual(booked, [0, 1 << 10 | 1 << 11, 0])
+
+    def test_holds_fill_slots_for_other_members_only(self):
+        Reservation.create_reservation(self.space, self.other, self.target_dt)
+        Reservation.hold_slot(self.space, self.member, self.target_dt)
+
+        self.assertEqual(Reservation.get_availability(self.space, self.date_from, 3)[0], [0, 1 << 10, 0])
+        self.assertEqual(Reservation.get_availability(self.space, self.date_from, 3, exclude_member=self.member)[0],
+                         [0, 0, 0])
+
+    def test_api_returns_requested_range(self):
+        Reservation.create_reservation(self.space, self.other, self.target_dt)
+        self.client.force_login(self.member)
+        url = reverse('api_v1:space_availability', args=[self.group.pk, self.space.pk])
+
+        response = self.client.get(url, {'from': self.date_from.isoformat(),
+                                          'to': self.target_dt.date().isoformat()})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({key: response.json()[key] for key in ('days', 'full', 'booked')},
+                         {'days': 2, 'full': [0, 0], 'booked': [0, 1 << 10]})
+
+        response = self.client.get(url, {'from': self.target_dt.date().isoformat(),
+                                          'to': self.date_from.isoformat()})
+        self.assertEqual((response.status_code, response.json()['error']), (400, 'invalid_range'))
+
+
+class LotteryResolveTest(ReservationTestCase):
+    """
+    LotteryRequest.resolve에 의한 추첨과 좌석 배정
+    """
+
+    def setUp(self):
+        super(LotteryResolveTest, self).setUp()
+        self.space = self.create_space()
+        self.slots = [self.get_slot(hour=hour) for hour in (10, 11, 12)]
+
+    def test_each_member_wins_before_anyone_wins_twice(self):
+        # 두 멤버가 같은 두 시간대를 모두 신청한 경우, 한 멤버가 두 좌석을 모두 가져가지 않음
+        for seed in range(10):
+            LotteryRequest.objects.all().delete()
+            Reservation.objects.all().delete()
+            for member in (self.member, self.other):
+                for target_dt in self.slots[:2]:
+                    LotteryRequest.enter(self.space, member, target_dt)
+
+            won, lost = LotteryRequest.resolve(self.space, rng=random.Random(seed))
+
+            self.assertEqual((won, lost), (2, 2))
+            self.assertEqual(Reservation.objects.filter(member=self.member).count(), 1)
+            self.assertEqual(Reservation.objects.filter(member=self.other).count(), 1)
+
+    def test_booked_seats_are_not_drawn(self):
+        Reservation.create_reservation(self.space, self.manager, self.slots[0])
+        LotteryRequest.enter(self.space, self.member, self.slots[0])
+        LotteryRequest.enter(self.space, self.member, self.slots[1])
+
+        won, lost = LotteryRequest.resolve(self.space, rng=random.Random(0))
+
+        self.assertEqual((won, lost), (1, 1))
+        won_request = LotteryRequest.objects.get(status=LotteryRequest.STATUS_WON)
+        self.assertEqual(won_request.dt_from, self.slots[1])
+        self.assertEqual(won_request.reservation.member, self.member)
+
+    def test_ineligible_requests_lose(self):
+        self.space.update(max_active_reservations=1)
+        LotteryRequest.enter(self.space, self.member, self.slots[0])
+        LotteryRequest.enter(self.space, self.member, self.slots[1])
+        LotteryRequest.enter(self.space, self.other, self.slots[2])
+        self.group.remove_member(self.other)
+
+        won, lost = LotteryRequest.resolve(self.space, rng=random.Random(0))
+
+        self.assertEqual((won, lost), (1, 2))
+        self.assertFalse(Reservation.objects.filter(member=self.other).exists())
+        self.assertFalse(LotteryRequest.objects.filter(status=LotteryRequest.STATUS_PENDING).exists())
+        self.assertEqual(LotteryRequest.resolve(self.space), (0, 0))
+
+    def test_losers_are_notified(self):
+        Reservation.create_reservation(self.space, self.manager, self.slots[0])
+        lost_request = LotteryRequest.enter(self.space, self.member, self.slots[0])
+        LotteryRequest.enter(self.space, self.other, self.slots[1])
+        OutboxMessage.objects.all().delete()
+
+        LotteryRequest.resolve(self.space, rng=random.Random(0))
+
+        self.assertEqual(sorted(OutboxMessage.objects.values_list('topic', 'recipient_id')), [
+            (LotteryRequest.NOTIFICATION_LOST, self.member.pk),
+            (Reservation.NOTIFICATION_CONFIRMED, self.other.pk),
+        ])
+        payload = OutboxMessage.objects.get(topic=LotteryRequest.NOTIFICATION_LOST).payload
+        self.assertEqual((payload['lottery_request'], payload['space']), (lost_request.pk, self.space.pk))
+
+    def test_undrawn_slot_is_not_booked_before_resolution(self):
+        LotteryRequest.enter(self.space, self.member, self.slots[0])
+        self.space.lottery_closes_at = timezone.now() - timezone.timedelta(minutes=1)
+        self.space.save()
+
+        # 예약 요청은 추첨을 수행하지 않고, 추첨 결과가 나올 때까지 해당 시간대만 예약할 수 없음
+        self.assertTrue(LotteryRequest.is_awaiting_draw(self.space, self.slots[0]))
+        self.assertFalse(LotteryRequest.is_awaiting_draw(self.space, self.slots[1]))
+
+        call_command('resolve_booking_lotteries', stdout=StringIO())
+        self.assertFalse(LotteryRequest.is_awaiting_draw(self.space, self.slots[0]))
+        self.assertEqual(LotteryRequest.objects.get().status, LotteryRequest.STATUS_WON)
+
+
+class ArchiveReadRoutingTest(ReservationTestCase):
+    """
+    보관된 예약 내역(ArchivedReservation)을 포함하는 조회 범위의 판단과 조회 결과
+    """
+
+    def setUp(self):
+        super(ArchiveReadRoutingTest, self).setUp()
+        self.space = self.create_space()
+        self.old_dt = self.get_slot(days=-30)
+        self.recent_dt = self.get_slot(days=-2)
+        for target_dt in (self.old_dt, self.recent_dt):
+            Reservation.objects.create(space=self.space, member=self.member,
+                                       promised_term_id=self.space.term_snapshot_id,
+                                       dt_from=target_dt, dt_to=Reservation.get_end_dt(target_dt), seat=0)
+
+    def archive(self):
+        return ArchivedReservation.archive_before(self.get_slot(days=-7, hour=0), batch_size=100)
+
+    def test_archive_advances_watermark(self):
+        self.assertIsNone(ArchiveWatermark.get_archived_until())
+        self.assertFalse(Reservation.includes_archived(self.old_dt))
+
+        self.assertEqual(self.archive(), 1)
+
+        self.assertEqual(ArchiveWatermark.get_archived_until(), Reservation.get_end_dt(self.old_dt))
+        self.assertTrue(Reservation.includes_archived(self.old_dt))
+        self.assertFalse(Reservation.includes_archived(self.recent_dt))
+        self.assertEqual(self.archive(), 0)
+
+    def test_watermark_never_moves_back(self):
+        self.archive()
+        ArchiveWatermark.advance(self.get_slot(days=-60))
+        self.assertEqual(ArchiveWatermark.get_archived_until(), Reservation.get_end_dt(self.old_dt))
+
+        # 보관 기준을 줄여 더 최근의 예약 내역을 옮기면 보관된 범위가 넓어짐
+        output = StringIO()
+        call_command('archive_reservations', horizon_days=1, batch_size=1, stdout=output)
+        self.assertIn('1 reservations archived.', output.getvalue())
+        self.assertEqual(ArchiveWatermark.get_archived_until(), Reservation.get_end_dt(self.recent_dt))
+        self.assertEqual(ArchiveWatermark.objects.count(), 1)
+
+    def test_range_reads_include_archived_rows(self):
+        self.archive()
+        dt_from, dt_to = self.get_slot(days=-60, hour=0), self.get_slot(days=0, hour=0)
+
+        reservations = Reservation.get_reservations_in_range(self.space, dt_from, dt_to)
+        self.assertEqual([r.dt_from for r in reservations], [self.old_dt, self.recent_dt])
+        self.assertIsInstance(reservations[0], ArchivedReservation)
+
+        rows = Reservation.get_reservation_values_in_range(self.space, dt_from, dt_to, ['member__username'])
+        self.assertEqual([row['dt_from'] for row in rows], [self.old_dt, self.recent_dt])
+
+    def test_horizon_change_keeps_archived_rows_visible(self):
+        self.archive()
+        dt_from, dt_to = self.get_slot(days=-60, hour=0), self.get_slot(days=0, hour=0)
+
+        # 보관 기준(horizon)을 바꾸어도 조회 여부는 보관된 범위(watermark)로 판단함
+        with self.settings(RESERVATION_ARCHIVE_HORIZON_DAYS=1):
+            reservations = Reservation.get_reservations_in_range(self.space, dt_from, dt_to)
+        self.assertEqual(len(reservations), 2)
+
+    def test_recent_range_reads_hot_table_only(self):
+        self.archive()
+        dt_from, dt_to = self.get_slot(days=-3, hour=0), self.get_slot(days=0, hour=0)
+
+        # 예약 내역 조회 + watermark 조회
+        with self.assertNumQueries(2):
+            reservations = Reservation.get_reservations_in_range(self.space, dt_from, dt_to)
+        self.assertEqual([r.dt_from for r in reservations], [self.recent_dt])
+
+    def test_conflicting_archive_keeps_hot_rows(self):
+        self.archive()
+        hot = Reservation.objects.get(dt_from=self.recent_dt)
+        ArchivedReservation.objects.create(id=hot.pk, created_at=hot.created_at, space=self.space,
+                                           member=self.member, dt_from=hot.dt_from, dt_to=hot.dt_to, seat=0)
+
+        with self.assertRaises(IntegrityError):
+            ArchivedReservation.archive_before(self.get_slot(days=0, hour=0), batch_size=100)
+        self.assertTrue(Reservation.objects.filter(pk=hot.pk).exists())
+
+
+class ReservationApiTest(ReservationTestCase):
+    """
+    JSON API(/api/v1/)의 예약 생성 요청 검사
+    """
+
+    def setUp(self):
+        super(ReservationApiTest, self).setUp()
+        self.space = self.create_space()
+        self.client.force_login(self.member)
+        self.url = reverse('api_v1:reservation_create', args=[self.group.pk, self.space.pk])
+
+    def post_start(self, start):
+        return self.client.post(self.url, json.dumps({'start': start}), content_type='application/json')
+
+    def test_start_with_offset_is_converted_to_local_time(self):
+        target_dt = self.get_slot()
+        # 같은 시각을 UTC offset으로 전달함
+        start = timezone.make_aware(target_dt).astimezone(datetime.timezone.utc).isoformat()
+
+        response = self.post_start(start)
+
+        self.assertEqual(response.status_code, 201)
+        reservation = Reservation.objects.get(pk=response.json()['id'])
+        self.assertEqual(reservation.dt_from, target_dt)
+        self.assertIsNone(reservation.dt_from.tzinfo)
+
+    def test_malformed_start_is_rejected(self):
+        for start in ('tomorrow', '2030-13-01T10:00:00', '2030-01-01T10:30:00', None):
+            response = self.post_start(start)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json()['error'], 'invalid_start')
+        self.assertFalse(Reservation.objects.exists())
+
+
+    def test_space_list_is_paginated_by_cursor(self):
+        self.create_space('second')
+        self.create_space('third')
+        url = reverse('api_v1:space_list', args=[self.group.pk])
+
+        first_page = self.client.get(url, {'limit': 2, 'fields': 'id,name'}).json()
+        self.assertEqual([space['name'] for space in first_page['results']], ['space', 'second'])
+
+        # 다음 페이지를 조회하기 전에 앞쪽의 공간이 삭제되어도 중복/누락되지 않음
+        self.space.soft_delete()
+        second_page = self.client.get(url, {'limit': 2, 'cursor': first_page['next_cursor']}).json()
+        self.assertEqual([space['name'] for space in second_page['results']], ['third'])
+        self.assertIsNone(second_page['next_cursor'])
+
+        response = self.client.get(url, {'cursor': 'not a cursor'})
+        self.assertEqual((response.status_code, response.json()['error']), (400, 'invalid_cursor'))
+
+    def test_unchanged_response_is_not_modified(self):
+        url = reverse('api_v1:space_week', args=[self.group.pk, self.space.pk])
+        response = self.client.get(url)
+        etag = response['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((response.status_code, response.content), (304, b''))
+        self.assertEqual(response['ETag'], etag)
+
+        # 예약 현황이 바뀌면 새 ETag와 함께 본문을 응답함
+        target_dt = self.get_slot(days=0, hour=0)
+        Reservation.objects.create(space=self.space, member=self.other, dt_from=target_dt,
+                                   dt_to=Reservation.get_end_dt(target_dt), seat=0)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class ReservationBatchApiTest(ReservationTestCase):
+    """
+    여러 공간, 여러 시간대의 예약을 한 번에 생성하는 API (전부 예약되거나, 하나도 예약되지 않음)
+    """
+
+    def setUp(self):
+        super(ReservationBatchApiTest, self).setUp()
+        self.space = self.create_space()
+        self.other_space = self.create_space('other space')
+        self.client.force_login(self.member)
+        self.url = reverse('api_v1:reservation_batch', args=[self.group.pk])
+
+    def post_slots(self, slots):
+        return self.client.post(self.url, json.dumps({
+            'slots': [{'space': space.pk, 'start': target_dt.isoformat()} for space, target_dt in slots],
+        }), content_type='application/json')
+
+    def test_all_slots_are_booked_in_order(self):
+        slots = [(self.other_space, self.get_slot(hour=11)), (self.space, self.get_slot(hour=10)),
+                 (self.space, self.get_slot(hour=11))]
+
+        response = self.post_slots(slots)
+
+        self.assertEqual(response.status_code, 201)
+        reservations = response.json()['reservations']
+        self.assertEqual([(r['space'], r['start']) for r in reservations],
+                         [(space.pk, target_dt.isoformat()) for space, target_dt in slots])
+        self.assertEqual(ReservationCounter.objects.filter(member=self.member).aggregate(
+            total=models.Sum('hours'))['total'], 3)
+
+    def test_conflicting_slot_books_nothing(self):
+        booked_dt = self.get_slot(hour=11)
+        Reservation.create_reservation(self.other_space, self.other, booked_dt)
+
+        response = self.post_slots([(self.space, self.get_slot(hour=10)), (self.other_space, booked_dt)])
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['conflicts'], [{'space': self.other_space.pk, 'start': booked_dt.isoformat()}])
+        self.assertFalse(Reservation.objects.filter(member=self.member).exists())
+
+    def test_quota_counts_every_slot_in_batch(self):
+        self.group.update_info(max_active_reservations=2)
+
+        response = self.post_slots([(self.space, self.get_slot(hour=hour)) for hour in (10, 11, 12)])
+
+        self.assertEqual((response.status_code, response.json()['error']), (422, 'quota_exceeded'))
+        self.assertFalse(Reservation.objects.exists())
+
+    def test_invalid_batches_are_rejected(self):
+        target_dt = self.get_slot()
+        for slots, error in (([(self.space, target_dt), (self.space, target_dt)], 'duplicate_slots'),
+                             ([], 'invalid_slots')):
+            response = self.post_slots(slots)
+            self.assertEqual((response.status_code, response.json()['error']), (400, error))
+
+
+class EventBrokerTest(ReservationTestCase):
+    """
+    예약 현황 변경 이벤트를 실시간 구독자(SSE)에게 전달하는 EventBroker
+    """
+
+    def setUp(self):
+        super(EventBrokerTest, self).setUp()
+        self.space = self.create_space()
+        self.channel = f'space:{self.space.pk}'
+        Reservation.create_reservation(self.space, self.member, self.get_slot())
+        self.first_seq = ChangeLogEntry.get_latest_seq(self.channel)
+
+    async def test_memory_broker_replays_missed_events_without_duplicates(self):
+        broker = InMemoryEventBroker(ChangeLogEntry)
+        events = broker.listen(self.channel, self.first_seq - 1, idle_timeout=1)
+
+        # 재연결 시 Last-Event-ID 이후의 내역을 change log에서 먼저 받음
+        replayed = await events.__anext__()
+        self.assertEqual((replayed['seq'], replayed['type']), (self.first_seq, 'reservation.created'))
+
+        broker.publish([self.channel, 'space:0'], [replayed, {**replayed, 'seq': self.first_seq + 1}])
+        self.assertEqual((await events.__anext__())['seq'], self.first_seq + 1)
+
+        await events.aclose()
+        self.assertFalse(broker._subscribers)
+
+    async def test_memory_broker_keeps_alive_and_drops_slow_subscriber(self):
+        broker = InMemoryEventBroker(ChangeLogEntry)
+        events = broker.listen(self.channel, None, idle_timeout=0.01)
+        self.assertIsNone(await events.__anext__())
+
+        # 대기열이 넘친 구독자는 연결을 끊음 (재연결 시 change log에서 다시 받음)
+        broker.publish([self.channel], [{'seq': seq} for seq in range(1, SUBSCRIBER_QUEUE_SIZE + 2)])
+        with self.assertRaises(EventStreamOverflow):
+            async for _ in events:
+                pass
+        self.assertFalse(broker._subscribers)
+
+    async def test_database_broker_polls_change_log(self):
+        broker = create_event_broker('database', ChangeLogEntry, poll_seconds=0)
+        events = broker.listen(self.channel, None, idle_timeout=0)
+
+        # 구독을 시작한 뒤에 기록된 내역부터 전달함
+        self.assertIsNone(await events.__anext__())
+        await sync_to_async(Reservation.create_reservation)(self.space, self.other, self.get_slot(hour=11))
+        self.assertEqual((await events.__anext__())['seq'], self.first_seq + 1)
+        await events.aclose()
+
+
+class ChangeLogTest(ReservationTestCase):
+    """
+    그룹별 순번(seq)으로 기록되는 변경 내역과 변경 내역 API(changes since token)
+    """
+
+    def setUp(self):
+        super(ChangeLogTest, self).setUp()
+        self.space = self.create_space()
+        self.client.force_login(self.member)
+        self.url = reverse('api_v1:change_list', args=[self.group.pk])
+
+    def get_seqs(self, group: Group):
+        return list(ChangeLogEntry.objects.filter(group=group).order_by('seq').values_list('seq', flat=True))
+
+    def test_seq_is_allocated_per_group_without_gaps(self):
+        other_group = Group.start_new_group(self.other, 'other group', False)
+        other_space = Space.create_space('space', other_group, Term.create_term(other_group, 'term', 'body'), None)
+        Reservation.create_reservations(self.member, [(self.space, self.get_slot(hour=hour)) for hour in (10, 11)])
+        Reservation.create_reservation(other_space, self.other, self.get_slot())
+        Reservation.objects.filter(member=self.member).first().cancel()
+
+        for group in (self.group, other_group):
+            seqs = self.get_seqs(group)
+            self.assertEqual(seqs, list(range(1, len(seqs) + 1)))
+            self.assertEqual(ChangeLogCounter.objects.get(group=group).last_seq, seqs[-1])
+
+        # 여러 개를 한 번에 발급받은 경우 마지막 seq를 반환함
+        last_seq = self.get_seqs(self.group)[-1]
+        self.assertEqual(ChangeLogCounter.allocate(self.group.pk, 3), last_seq + 3)
+        self.assertEqual(ChangeLogCounter.allocate(self.group.pk, 1), last_seq + 4)
+
+    def test_changes_are_returned_since_token(self):
+        token = self.client.get(self.url).json()['next_token']
+        reservations = Reservation.create_reservations(self.member, [(self.space, self.get_slot(hour=hour))
+                                                                      for hour in (10, 11)])
+        first_pk, second_pk = (reservation.pk for reservation in reservations)
+        reservations[0].cancel()
+
+        response = self.client.get(self.url, {'since': token, 'limit': 2}).json()
+        self.assertEqual([(change['type'], change['id']) for change in response['changes']],
+                         [('reservation.created', first_pk), ('reservation.created', second_pk)])
+        self.assertTrue(response['has_more'])
+
+        response = self.client.get(self.url, {'since': response['next_token']}).json()
+        self.assertEqual([(change['type'], change['id']) for change in response['changes']],
+                         [('reservation.deleted', first_pk)])
+        self.assertFalse(response['has_more'])
+
+        # 새로운 변경 내역이 없으면 같은 token을 다시 받음
+        next_token = response['next_token']
+        self.assertEqual(self.client.get(self.url, {'since': next_token}).json(),
+                         {'changes': [], 'next_token': next_token, 'has_more': False})
+
+
+class TermBodyTest(ReservationTestCase):
+    """
+    같은 내용의 약관 본문을 하나의 TermBody로 공유하여 저장
+    """
+
+    def test_same_body_shares_row(self):
+        first = self.create_space('first')
+        second = self.create_space('second')
+        reservation = Reservation.create_reservation(first, self.member, self.get_slot())
+
+        self.assertEqual(TermBody.intern('body').pk, first.term_snapshot_id)
+        self.assertEqual({first.term_snapshot_id, second.term_snapshot_id, reservation.promised_term_id},
+                         {first.term_snapshot_id})
+        self.assertEqual(TermBody.objects.filter(body='body').count(), 1)
+
+    def test_different_body_creates_row(self):
+        other_term = Term.create_term(self.group, 'other term', 'other body')
+        space = self.create_space()
+        other_space = Space.create_space('other space', self.group, other_term, None)
+
+        self.assertNotEqual(space.term_snapshot_id, other_space.term_snapshot_id)
+        self.assertEqual(TermBody.objects.get(pk=other_space.term_snapshot_id).body, 'other body')
+        self.assertEqual(TermBody.objects.count(), 2)
+        # 저장된 본문은 공유되므로 수정할 수 없음
+        with self.assertRaises(IntegrityError):
+            term_body = TermBody.objects.get(pk=space.term_snapshot_id)
+            term_body.body = 'changed'
+            term_body.save()
+
+
+class TermVersionTest(ReservationTestCase):
+    """
+    약관 본문의 버전 관리와 공간으로의 최신 버전 반영
+    """
+
+    def setUp(self):
+        super(TermVersionTest, self).setUp()
+        self.space = self.create_space('space')
+        self.other_space = self.create_space('other space')
+
+    def get_version_numbers(self):
+        return list(self.term.versions.order_by('number').values_list('number', 'term_body__body'))
+
+    def test_version_is_added_only_when_body_changes(self):
+        self.term.update(title='new title')
+        self.assertEqual(self.get_version_numbers(), [(1, 'body')])
+
+        self.term.update(body='body v2')
+        self.term.update(body='body v2')
+        self.assertEqual(self.get_version_numbers(), [(1, 'body'), (2, 'body v2')])
+
+    def test_reverted_body_reuses_stored_body(self):
+        self.term.update(body='body v2')
+        self.term.update(body='body')
+
+        versions = list(self.term.versions.order_by('number'))
+        self.assertEqual([version.number for version in versions], [1, 2, 3])
+        self.assertEqual(versions[0].term_body_id, versions[2].term_body_id)
+        self.assertEqual(TermBody.objects.filter(body='body').count(), 1)
+
+    def test_propagation_preview_and_propagate(self):
+        self.term.update(body='body v2')
+        self.assertEqual(self.term.get_propagation_preview(), [
+            {'pk': self.space.pk, 'name': 'space', 'version': 1, 'up_to_date': False},
+            {'pk': self.other_space.pk, 'name': 'other space', 'version': 1, 'up_to_date': False},
+        ])
+
+        self.assertEqual(self.term.propagate_latest_version([self.space.pk]), 1)
+        self.assertEqual([(p['version'], p['up_to_date']) for p in self.term.get_propagation_preview()],
+                         [(2, True), (1, False)])
+
+        self.assertEqual(self.term.propagate_latest_version(), 1)
+        self.assertEqual(self.term.propagate_latest_version(), 0)
+        self.space.refresh_from_db()
+        self.assertEqual(self.space.term_snapshot.body, 'body v2')
+
+    def test_reservation_keeps_promised_body(self):
+        # 예약자는 예약한 시점에 공간에 반영되어 있던 본문에 동의한 것으로 기록됨
+        reservation = Reservation.create_reservation(self.space, self.member, self.get_slot(hour=10))
+        self.term.update(body='body v2')
+        self.term.propagate_latest_version()
+        self.space.refresh_from_db()
+        new_reservation = Reservation.create_reservation(self.space, self.member, self.get_slot(hour=11))
+
+        reservation.refresh_from_db()
+        self.assertEqual(reservation.promised_term_body, 'body')
+        self.assertEqual(new_reservation.promised_term_body, 'body v2')
+
+
+class PurgeDeletedObjectsTest(ReservationTestCase):
+    """
+    공간과 그룹의 삭제 요청(soft delete)과 purge_deleted_objects 명령에 의한 batch 삭제
+    """
+
+    def test_deleted_space_is_hidden_until_purged(self):
+        space = self.create_space()
+        other_space = self.create_space('other space')
+        for target_space in (space, other_space):
+            Reservation.create_reservation(target_space, self.member, self.get_slot())
+
+        self.client.force_login(self.manager)
+        response = self.client.get(reverse('reservations:space_delete', args=[self.group.pk, space.pk]))
+        self.assertEqual(response.status_code, 302)
+
+        # 삭제 요청된 공간은 바로 숨겨지지만, 연결된 예약 내역은 purge될 때까지 남아 있음
+        self.assertFalse(Space.objects.filter(pk=space.pk).exists())
+        self.assertEqual(list(self.group.registered_spaces.all()), [other_space])
+        self.assertTrue(Space.all_objects.filter(pk=space.pk).exists())
+        self.assertTrue(Reservation.objects.filter(space_id=space.pk).exists())
+
+        call_command('purge_deleted_objects', stdout=StringIO())
+
+        self.assertFalse(Space.all_objects.filter(pk=space.pk).exists())
+        self.assertFalse(Reservation.objects.filter(space_id=space.pk).exists())
+        self.assertTrue(Reservation.objects.filter(space=other_space).exists())
+        self.assertTrue(Group.objects.filter(pk=self.group.pk).exists())
+
+    def test_group_with_change_log_is_purged_in_batches(self):
+        space = self.create_space()
+        for hour in (10, 11, 12):
+            Reservation.create_reservation(space, self.member, self.get_slot(hour=hour))
+        other_group = Group.start_new_group(self.other, 'other group', False)
+        Term.create_term(other_group, 'term', 'body')
+        self.group.soft_delete()
+        self.assertFalse(Group.objects.filter(pk=self.group.pk).exists())
+        self.assertGreater(ChangeLogEntry.objects.filter(group=self.group).count(), 2)
+
+        output = StringIO()
+        call_command('purge_deleted_objects', batch_size=2, stdout=output)
+
+        self.assertFalse(Group.all_objects.filter(pk=self.group.pk).exists())
+        self.assertFalse(ChangeLogEntry.objects.filter(group_id=self.group.pk).exists())
+        self.assertFalse(ChangeLogCounter.objects.filter(group_id=self.group.pk).exists())
+        # 변경 내역도 batch 단위로 나누어 삭제됨
+        self.assertIn('change log entries: 2/', output.getvalue())
+        # 삭제 요청되지 않은 그룹의 변경 내역은 남아 있음
+        self.assertTrue(ChangeLogEntry.objects.filter(group=other_group).exists())
+
+
+# 테스트는 DEBUG=False로 실행되므로, collectstatic으로 만들어지는 manifest 없이 페이지를 렌더링할 수 있도록 함
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class ReservationImportViewTest(ReservationTestCase):
+    """
+    CSV 파일로부터의 예약 내역 가져오기와 가져오기 결과 보고
+    """
+
+    def setUp(self):
+        super(ReservationImportViewTest, self).setUp()
+        self.space = self.create_space()
+        self.target_date = self.get_slot().date()
+        self.client.force_login(self.manager)
+
+    def upload(self, content: bytes):
+        csv_file = SimpleUploadedFile('reservations.csv', content, content_type='text/csv')
+        response = self.client.post(reverse('reservations:reservation_import', args=[self.group.pk]),
+                                    {'csv_file': csv_file})
+        self.assertEqual(response.status_code, 200)
+        return response.context['report']
+
+    def test_valid_rows_are_imported_and_invalid_rows_reported(self):
+        Reservation.create_reservation(self.space, self.other, datetime.datetime.combine(
+            self.target_date, datetime.time(12)))
+        content = '\n'.join([
+            'space,username,date,hour',
+            f'space,member,{self.target_date},10',
+            f'space,member,{self.target_date},11',
+            f'unknown,member,{self.target_date},10',
+            f'space,stranger,{self.target_date},10',
+            f'space,member,{self.target_date},10',
+            f'space,member,{self.target_date},12',
+            f'space,member,{self.target_date},24',
+        ]).encode('utf-8')
+
+        report = self.upload(content)
+
+        self.assertEqual((report.rows, report.created), (7, 2))
+        self.assertEqual(report.errors, [
+            (4, 'Unknown or ambiguous space: unknown'),
+            (5, 'Not a member of this group: stranger'),
+            (6, 'Duplicated in file'),
+            (7, 'Already booked'),
+            (8, 'Invalid row: Invalid hour: 24'),
+        ])
+        self.assertEqual(sorted(Reservation.objects.filter(member=self.member).values_list('dt_from__hour', flat=True)),
+                         [10, 11])
+        # 가져온 예약 내역도 예약 한도 카운터에 반영됨
+        self.assertEqual(ReservationCounter.objects.get(member=self.member).hours, 2)
+
+    def test_undecodable_file_is_reported(self):
+        report = self.upload(f'space,username,date,hour\nspace,member,{self.target_date},10\n'.encode('utf-16'))
+
+        self.assertEqual(report.created, 0)
+        self.assertIn('not a UTF-8 encoded CSV file', report.errors[0][1])
+        self.assertFalse(Reservation.objects.filter(member=self.member).exists())
+
+
+# 테스트는 DEBUG=False로 실행되므로, collectstatic으로 만들어지는 manifest 없이 페이지를 렌더링할 수 있도록 함
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class SpaceWeekGridViewTest(ReservationTestCase):
+    """
+    주 이동 시 공간 상세 페이지 대신 받아 교체하는 week grid fragment
+    """
+
+    def setUp(self):
+        super(SpaceWeekGridViewTest, self).setUp()
+        self.space = self.create_space()
+        self.target_dt = self.get_slot(days=7)
+        self.query = {'year': self.target_dt.year, 'month': self.target_dt.month, 'day': self.target_dt.day}
+        self.client.force_login(self.member)
+
+    def test_fragment_is_the_grid_of_detail_page(self):
+        Reservation.create_reservation(self.space, self.other, self.target_dt)
+
+        response = self.client.get(reverse('reservations:space_week_grid', args=[self.group.pk, self.space.pk]),
+                                   self.query)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([template.name for template in response.templates], ['reservations/space_week_grid.html'])
+        self.assertContains(response, 'class="table-danger booked"', count=1)
+        monday = self.target_dt - timezone.timedelta(days=self.target_dt.weekday())
+        self.assertEqual(response.context['monday_dt'], monday.strftime('%Y/%m/%d'))
+
+        # 공간 상세 페이지는 같은 fragment를 포함하여 렌더링함
+        detail = self.client.get(reverse('reservations:space_detail', args=[self.group.pk, self.space.pk]),
+                                 self.query)
+        self.assertIn(response.content.decode(), detail.content.decode())
+
+    def test_invalid_date_is_not_found(self):
+        response = self.client.get(reverse('reservations:space_week_grid', args=[self.group.pk, self.space.pk]),
+                                   {'year': self.target_dt.year, 'month': 13, 'day': 1})
+
+        # handler404는 오류 페이지를 렌더링함
+        self.assertTemplateUsed(response, 'commons/errors/404.html')
+        self.assertTemplateNotUsed(response, 'reservations/space_week_grid.html')
+
+
+# 테스트는 DEBUG=False로 실행되므로, collectstatic으로 만들어지는 manifest 없이 페이지를 렌더링할 수 있도록 함
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class AsyncViewTest(TransactionTestCase):
+    """
+    ASGI로 실행하는 경우 사용되는 읽기 위주 페이지의 async view (ASYNC_VIEWS)
+    async view는 조회를 thread pool의 다른 DB 연결로 실행하므로, 준비한 데이터를 commit하는 TransactionTestCase를 사용함
+    """
+
+    def setUp(self):
+        self.manager = SystemUser.signup('manager', 'password1234', 'manager@example.com', 'manager')
+        self.member = SystemUser.signup('member', 'password1234', 'member@example.com', 'member')
+        self.group = Group.start_new_group(self.manager, 'group', False)
+        self.group.add_member(self.member)
+        term = Term.create_term(self.group, 'term', 'body')
+        self.space = Space.create_space('space', self.group, term, None, capacity=2)
+        self.target_dt = ReservationTestCase.get_slot()
+        Reservation.create_reservation(self.space, self.manager, self.target_dt)
+        LotteryRequest.objects.create(space=self.space, member=self.member, dt_from=self.target_dt)
+
+    def render(self, view_class, user, path: str = '/', **kwargs):
+        """
+        view를 실행하여 응답을 반환하는 메서드 (async view는 event loop에서 실행함)
+        """
+        request = RequestFactory().get(path, {'year': self.target_dt.year, 'month': self.target_dt.month,
+                                              'day': self.target_dt.day})
+        request.user = user
+        view = view_class.as_view()
+        if issubclass(view_class, AsyncViewWithContext):
+            view = async_to_sync(view)
+        return view(request, **kwargs)
+
+    def test_async_views_render_same_pages(self):
+        space_kwargs = {'group_pk': self.group.pk, 'space_pk': self.space.pk}
+        for sync_view, async_view, kwargs in (
+                (views.SpaceListView, views.AsyncSpaceListView, {'group_pk': self.group.pk}),
+                (views.SpaceDetailView, views.AsyncSpaceDetailView, space_kwargs)):
+            expected = self.render(sync_view, self.member, **kwargs)
+            response = self.render(async_view, self.member, **kwargs)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.content, expected.content)
+
+        # 동시에 조회한 주간 예약 현황과 추첨 신청이 함께 렌더링됨
+        self.assertContains(response, 'class="table-warning not-booked"><div>manager</div>', count=1)
+        self.assertContains(response, self.target_dt.strftime('%Y/%m/%d %H:%M'))
+
+    def test_async_group_list_shows_groups(self):
+        response = self.render(AsyncGroupListView, self.member)
+
+        self.assertContains(response, f'href="{reverse("users:group_detail", args=[self.group.pk])}"')
+
+    def test_async_views_check_membership(self):
+        stranger = SystemUser.signup('stranger', 'password1234', 'stranger@example.com', 'stranger')
+
+        with self.assertRaises(Http404):
+            self.render(views.AsyncSpaceListView, stranger, group_pk=self.group.pk)
+        response = self.render(views.AsyncSpaceListView, AnonymousUser(), group_pk=self.group.pk)
+        self.assertEqual(response.status_code, 302)
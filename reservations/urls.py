@@ -1,7 +1,12 @@
+from django.conf import settings
 from django.urls import path, include
 
 from . import views
 
+# ASGI로 실행하는 경우 읽기 위주의 페이지는 async view로 처리함 (ASYNC_VIEWS)
+SpaceListView = views.AsyncSpaceListView if settings.ASYNC_VIEWS else views.SpaceListView
+SpaceDetailView = views.AsyncSpaceDetailView if settings.ASYNC_VIEWS else views.SpaceDetailView
+
 app_name = 'reservations'
 
 terms_urlpatterns = [
@@ -13,13 +18,19 @@ terms_urlpatterns = [
     path('<int:group_pk>/delete/<int:term_pk>/', views.TermDeleteView.as_view(), name='term_delete'),
     # 약관 수정
     path('<int:group_pk>/update/<int:term_pk>/', views.TermUpdateView.as_view(), name='term_update'),
+    # 약관 최신 버전 반영
+    path('<int:group_pk>/propagate/<int:term_pk>/', views.TermPropagateView.as_view(), name='term_propagate'),
 ]
 
 spaces_urlpatterns = [
     # 그룹 내 공간 목록
-    path('<int:group_pk>/', views.SpaceListView.as_view(), name='space_list'),
+    path('<int:group_pk>/', SpaceListView.as_view(), name='space_list'),
     # 공간 상세 정보 (공간 메인 페이지)
-    path('<int:group_pk>/<int:space_pk>/', views.SpaceDetailView.as_view(), name='space_detail'),
+    path('<int:group_pk>/<int:space_pk>/', SpaceDetailView.as_view(), name='space_detail'),
+    # 공간 상세 정보의 week grid (주 이동 시 교체되는 fragment)
+    path('<int:group_pk>/<int:space_pk>/week/', views.SpaceWeekGridView.as_view(), name='space_week_grid'),
+    # 공간의 월별 예약 현황 (달력)
+    path('<int:group_pk>/<int:space_pk>/calendar/', views.SpaceCalendarView.as_view(), name='space_calendar'),
     # 공간 등록
     path('<int:group_pk>/create/', views.SpaceCreateView.as_view(), name='space_create'),
     # 공간 정보 갱신
@@ -27,9 +38,15 @@ spaces_urlpatterns = [
     # 공간 삭제
     path('<int:group_pk>/<int:space_pk>/delete/', views.SpaceDeleteView.as_view(), name='space_delete'),
 
+    # 예약 내역 가져오기 (CSV)
+    path('<int:group_pk>/import/', views.ReservationImportView.as_view(), name='reservation_import'),
+
     # 예약 생성
     path('<int:group_pk>/<int:space_pk>/reservation/create/',
          views.CreateReservationView.as_view(), name='reservation_create'),
+    # 예약 대기열 등록/취소
+    path('<int:group_pk>/<int:space_pk>/reservation/waitlist/',
+         views.WaitlistView.as_view(), name='reservation_waitlist'),
     # 예약 상세
     path('<int:group_pk>/<int:space_pk>/reservation/<int:reservation_pk>/',
          views.ReservationDetailView.as_view(), name='reservation_detail'),
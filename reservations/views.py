@@ -1,12 +1,23 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.db import IntegrityError
 from django.http import Http404
 from django.shortcuts import render, get_object_or_404, redirect
-from django.utils import timezone
+from django.urls import reverse
+from django.utils import timezone, dateparse
+from django.utils.decorators import method_decorator
 
+from commons.idempotency import idempotent
+from commons.ratelimit import rate_limit
 from commons.views import handler_500_view
-from reservations.models import Term, Space, Reservation
+from reservations.importers import ReservationCsvImporter
+from reservations.models import Term, Space, Reservation, WaitlistEntry, ReservationQuotaExceeded, LotteryRequest
 from users.models import PermissionTag
-from users.views import ManagerOnlyView, MemberOnlyView
+from users.views import ManagerOnlyView, MemberOnlyView, AsyncMemberOnlyView
+from utils.database import database_sync_to_async
+from utils.validation import parse_optional_positive_int
 
 
 class TermListView(ManagerOnlyView):
@@ -69,19 +80,78 @@ class TermUpdateView(ManagerOnlyView, Term.FindingSingleInstance):
         return redirect('reservations:term_list', group_pk=self.group.pk)
 
 
+class TermPropagateView(ManagerOnlyView, Term.FindingSingleInstance):
+    """
+    약관의 최신 버전을 약관을 사용하는 공간에 반영하는 View
+    """
+
+    def get(self, request, *args, **kwargs):
+        self.init_term(request, *args, **kwargs)
+
+        # 반영 요청 후 redirect된 경우 반영된 공간의 수가 전달됨
+        propagated_count = request.GET.get('propagated', '')
+        self.context['propagated_count'] = int(propagated_count) if propagated_count.isdigit() else None
+
+        return self.render_page(request)
+
+    def post(self, request, *args, **kwargs):
+        """
+        최신 버전 반영 요청
+        - apply_all: 전달된 경우 약관을 사용하는 모든 공간에 반영
+        - space: 반영할 공간의 pk (여러 개 전달 가능)
+        => 반영 후 반영된 공간의 수와 함께 같은 페이지로 redirect
+        """
+        self.init_term(request, *args, **kwargs)
+
+        if request.POST.get('apply_all') is not None:
+            space_pks = None
+        else:
+            space_pks = request.POST.getlist('space')
+            if not space_pks or not all(pk.isdigit() for pk in space_pks):
+                self.context['invalid_space'] = True
+                return self.render_page(request)
+            space_pks = [int(pk) for pk in space_pks]
+
+        propagated_count = self.term.propagate_latest_version(space_pks)
+
+        return redirect(reverse('reservations:term_propagate',
+                                kwargs={'group_pk': self.group.pk, 'term_pk': self.term.pk}) +
+                        f'?propagated={propagated_count}')
+
+    def render_page(self, request):
+        """
+        약관의 최신 버전과 공간별 반영 현황을 보여주는 페이지를 반환하는 메서드
+        """
+        self.context['latest_version'] = self.term.get_latest_version()
+        self.context['space_previews'] = self.term.get_propagation_preview()
+        return render(request, 'reservations/term_propagate.html', self.context)
+
+
 class SpaceListView(MemberOnlyView):
     """
     그룹에 등록된 공간 목록을 보여주는 View
     """
+    query_budget = 12
 
     def get(self, request, *args, **kwargs):
         return render(request, 'reservations/space_list.html', self.context)
 
 
+class AsyncSpaceListView(AsyncMemberOnlyView):
+    """
+    SpaceListView의 async 버전 (ASYNC_VIEWS)
+    """
+
+    async def get(self, request, *args, **kwargs):
+        return await sync_to_async(render)(request, 'reservations/space_list.html', self.context)
+
+
 class SpaceDetailView(MemberOnlyView, Space.FindingSingleInstance):
     """
     그룹에 등록된 공간의 세부 정보 및 예약 정보를 보여주는 View
     """
+    query_budget = 20
+    template_name = 'reservations/space_detail.html'
 
     def get(self, request, *args, **kwargs):
         self.init_space(request, *args, **kwargs)
@@ -94,11 +164,37 @@ class SpaceDetailView(MemberOnlyView, Space.FindingSingleInstance):
         if target_day is None:
             raise Http404()
 
+        self.init_week(request, target_day)
+        self.context['lottery_requests'] = self.get_lottery_requests(request)
+
+        return render(request, self.template_name, self.context)
+
+    def get_lottery_requests(self, request):
+        """
+        멤버가 신청한 추첨의 결과 (추첨 대기 중인 신청 포함)
+        """
+        return LotteryRequest.objects.filter(
+            space=self.space, member=request.user, dt_from__gte=timezone.now() - timezone.timedelta(days=7)
+        ).order_by('dt_from')
+
+    def init_week(self, request, target_day) -> None:
+        """
+        target_day가 포함된 주의 예약 현황(week grid)을 렌더링하는 데 필요한 context를 준비하는 메서드
+        """
         # target_day가 포함된 주의 reservation instance들을 날짜별, 시간별로 정리
         reservation_of_week = Reservation.get_reservation_of_week(target_day, self.space)
+        # 다른 멤버가 예약 페이지를 보며 임시 점유 중인 좌석 수
+        holds_of_week = Reservation.get_holds_of_week(target_day, self.space, exclude_member=request.user)
+
+        self.set_week_context(target_day, reservation_of_week, holds_of_week)
 
+    def set_week_context(self, target_day, reservation_of_week, holds_of_week) -> None:
+        """
+        조회된 주의 예약 현황으로 week grid를 렌더링하는 데 필요한 context를 설정하는 메서드
+        """
         # 이하 Page rendering에 필요 ==========================================
         self.context['reservation_of_week'] = reservation_of_week
+        self.context['holds_of_week'] = holds_of_week
         self.context['hour_24'] = list(range(24))
         self.context['weekday_7'] = list(range(7))
 
@@ -126,7 +222,68 @@ class SpaceDetailView(MemberOnlyView, Space.FindingSingleInstance):
         self.context['today_querystring'] = f"year={today.year}&month={today.month}&day={today.day}"
         # 이상 Page rendering에 필요 ==========================================
 
-        return render(request, 'reservations/space_detail.html', self.context)
+
+class AsyncSpaceDetailView(AsyncMemberOnlyView, SpaceDetailView):
+    """
+    SpaceDetailView의 async 버전 (ASYNC_VIEWS)
+    서로 관계없는 주간 예약 현황, 임시 점유 현황, 추첨 결과 조회를 동시에 실행한다.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        target_day = Reservation.get_datetime(request.GET.get('year'), request.GET.get('month'), request.GET.get('day'))
+        if target_day is None:
+            raise Http404()
+
+        await database_sync_to_async(self.init_space)(request, *args, **kwargs)
+        reservation_of_week, holds_of_week, lottery_requests = await asyncio.gather(
+            database_sync_to_async(Reservation.get_reservation_of_week)(target_day, self.space),
+            database_sync_to_async(Reservation.get_holds_of_week)(target_day, self.space,
+                                                                  exclude_member=request.user),
+            database_sync_to_async(lambda: list(self.get_lottery_requests(request)))(),
+        )
+        self.set_week_context(target_day, reservation_of_week, holds_of_week)
+        self.context['lottery_requests'] = lottery_requests
+
+        return await sync_to_async(render)(request, self.template_name, self.context)
+
+
+class SpaceWeekGridView(SpaceDetailView):
+    """
+    공간 상세 페이지의 week grid(예약 현황 표와 주 이동 링크)만을 렌더링하는 View
+    주를 이동할 때 페이지 전체 대신 이 fragment만 받아 교체한다. (space_detail.js)
+    """
+    query_budget = 15
+    template_name = 'reservations/space_week_grid.html'
+
+    def get(self, request, *args, **kwargs):
+        self.init_space(request, *args, **kwargs)
+
+        target_day = Reservation.get_datetime(request.GET.get('year'), request.GET.get('month'), request.GET.get('day'))
+        if target_day is None:
+            raise Http404()
+
+        self.init_week(request, target_day)
+        return render(request, self.template_name, self.context)
+
+
+class SpaceCalendarView(MemberOnlyView, Space.FindingSingleInstance):
+    """
+    공간의 월별 예약 현황을 달력으로 보여주는 View
+    페이지에는 달력의 틀만 렌더링되며, 달마다 예약 현황 API(날짜별 bitmask)를 조회하여 채운다.
+    """
+    query_budget = 10
+
+    def get(self, request, *args, **kwargs):
+        self.init_space(request, *args, **kwargs)
+
+        today = timezone.now()
+        try:
+            self.context['calendar_year'] = int(request.GET.get('year', today.year))
+            self.context['calendar_month'] = min(max(int(request.GET.get('month', today.month)), 1), 12)
+        except ValueError:
+            raise Http404()
+
+        return render(request, 'reservations/space_calendar.html', self.context)
 
 
 class SpaceCreateView(ManagerOnlyView):
@@ -147,6 +304,9 @@ class SpaceCreateView(ManagerOnlyView):
         term_pk = int(request.POST['term'])
         permission_pk = int(request.POST['permission'])
         name = request.POST['name']
+        capacity = max(int(request.POST.get('capacity', 1)), 1)
+        max_active_reservations = parse_optional_positive_int(request.POST.get('max_active_reservations'))
+        max_weekly_hours = parse_optional_positive_int(request.POST.get('max_weekly_hours'))
 
         if term_pk != -1:
             term = get_object_or_404(Term, pk=term_pk)
@@ -159,7 +319,9 @@ class SpaceCreateView(ManagerOnlyView):
             permission_tag = None
 
         new_space = Space.create_space(group=self.group, term=term, name=name,
-                                       required_permission=permission_tag)
+                                       required_permission=permission_tag, capacity=capacity,
+                                       max_active_reservations=max_active_reservations,
+                                       max_weekly_hours=max_weekly_hours)
 
         return redirect('reservations:space_list', group_pk=self.group.pk)
 
@@ -188,6 +350,15 @@ class SpaceUpdateView(ManagerOnlyView, Space.FindingSingleInstance):
         term_pk = int(request.POST['term'])
         permission_pk = int(request.POST['permission'])
         new_name = request.POST['name']
+        new_capacity = max(int(request.POST.get('capacity', self.space.capacity)), 1)
+        new_max_active_reservations = parse_optional_positive_int(request.POST.get('max_active_reservations'))
+        new_max_weekly_hours = parse_optional_positive_int(request.POST.get('max_weekly_hours'))
+        new_lottery_opens_at = dateparse.parse_datetime(request.POST.get('lottery_opens_at') or '')
+        new_lottery_closes_at = dateparse.parse_datetime(request.POST.get('lottery_closes_at') or '')
+        # 시작/종료 일시가 모두 올바르게 입력된 경우에만 추첨 예약 기간을 설정함
+        if new_lottery_opens_at is None or new_lottery_closes_at is None \
+                or new_lottery_opens_at >= new_lottery_closes_at:
+            new_lottery_opens_at = new_lottery_closes_at = None
 
         if term_pk != -1:
             new_term = get_object_or_404(Term, pk=term_pk)
@@ -199,7 +370,10 @@ class SpaceUpdateView(ManagerOnlyView, Space.FindingSingleInstance):
         else:
             new_permission_tag = None
 
-        self.space.update(name=new_name, term=new_term, required_permission=new_permission_tag)
+        self.space.update(name=new_name, term=new_term, required_permission=new_permission_tag,
+                          capacity=new_capacity, max_active_reservations=new_max_active_reservations,
+                          max_weekly_hours=new_max_weekly_hours,
+                          lottery_opens_at=new_lottery_opens_at, lottery_closes_at=new_lottery_closes_at)
 
         return redirect('reservations:space_detail', group_pk=self.group.pk, space_pk=self.space.pk)
 
@@ -207,14 +381,53 @@ class SpaceUpdateView(ManagerOnlyView, Space.FindingSingleInstance):
 class SpaceDeleteView(ManagerOnlyView, Space.FindingSingleInstance):
     """
     공간 삭제를 수행하는 View
+    공간은 즉시 숨겨지며, 연결된 예약 내역의 삭제는 purge_deleted_objects 명령에서 수행된다.
     """
 
     def get(self, request, *args, **kwargs):
         self.init_space(request, *args, **kwargs)
-        self.space.delete()
+        self.space.soft_delete()
         return redirect('reservations:space_list', group_pk=self.group.pk)
 
 
+class ReservationImportView(ManagerOnlyView):
+    """
+    CSV 파일로부터 그룹의 예약 내역을 가져오는 View
+    """
+
+    def get(self, request, *args, **kwargs):
+        return render(request, 'reservations/reservation_import.html', self.context)
+
+    def post(self, request, *args, **kwargs):
+        """
+        예약 내역 가져오기 요청
+        - csv_file: space, username, date(YYYY-MM-DD), hour 열을 포함하는 CSV 파일
+        => 가져오기 결과(생성된 수, 실패한 행과 사유)를 같은 페이지에 보여줌
+        """
+        csv_file = request.FILES.get('csv_file')
+        if csv_file is None:
+            self.context['no_file'] = True
+            return render(request, 'reservations/reservation_import.html', self.context)
+
+        # 업로드된 파일을 한 줄씩 읽어 처리함
+        lines = (line.decode('utf-8-sig') for line in csv_file)
+        self.context['report'] = ReservationCsvImporter(self.group).run(lines)
+
+        return render(request, 'reservations/reservation_import.html', self.context)
+
+
+def get_reservation_create_url(group, space, target_dt) -> str:
+    """
+    target_dt 시간대의 예약 페이지 URL을 반환하는 함수
+    """
+    monday = target_dt - timezone.timedelta(days=target_dt.weekday())
+    return reverse('reservations:reservation_create', kwargs={'group_pk': group.pk, 'space_pk': space.pk}) + \
+        f'?monday_year={monday.year}&monday_month={monday.month}&monday_day={monday.day}' \
+        f'&wd={target_dt.weekday()}&hour={target_dt.hour}'
+
+
+@method_decorator(rate_limit('reservation_create'), name='post')
+@method_decorator(idempotent('reservation_create'), name='post')
 class CreateReservationView(MemberOnlyView, Space.FindingSingleInstance):
     def get(self, request, *args, **kwargs):
         self.init_space(request, *args, **kwargs)
@@ -232,37 +445,57 @@ class CreateReservationView(MemberOnlyView, Space.FindingSingleInstance):
             self.context['permission_rejected'] = True
             return render(request, 'reservations/reservation_create.html', self.context)
 
-        # 월요일, 그리고 월요일부터 몇일 만큼 떨어진 요일인지를 기준으로 time table을 렌더링함
-        monday_year = request.GET.get('monday_year')
-        monday_month = request.GET.get('monday_month')
-        monday_day = request.GET.get('monday_day')
-        wd = int(request.GET.get('wd', 0))
-        hour = request.GET.get('hour')
-
-        target_monday = Reservation.get_datetime(monday_year, monday_month, monday_day)
-        if target_monday is None:
-            raise Http404()
-        target_day = target_monday + timezone.timedelta(days=wd)
-
-        try:
-            hour = int(hour)
-            if hour < 0:
-                raise Exception
-        except Exception:
-            return handler_500_view(request, *args, **kwargs)
+        # 예약 요청(POST)이 실패하여 호출된 경우 요청했던 일시를 그대로 사용함
+        target_dt = kwargs.get('target_dt')
+        if target_dt is None:
+            # 월요일, 그리고 월요일부터 몇일 만큼 떨어진 요일인지를 기준으로 time table을 렌더링함
+            monday_year = request.GET.get('monday_year')
+            monday_month = request.GET.get('monday_month')
+            monday_day = request.GET.get('monday_day')
+            wd = int(request.GET.get('wd', 0))
+            hour = request.GET.get('hour')
+
+            target_monday = Reservation.get_datetime(monday_year, monday_month, monday_day)
+            if target_monday is None:
+                raise Http404()
+            target_day = target_monday + timezone.timedelta(days=wd)
+
+            try:
+                hour = int(hour)
+                if hour < 0:
+                    raise Exception
+            except Exception:
+                return handler_500_view(request, *args, **kwargs)
+
+            target_dt = target_day.replace(hour=hour, minute=0, second=0, microsecond=0)
+
+        self.context['reservation_year'] = target_dt.year
+        self.context['reservation_month'] = target_dt.month
+        self.context['reservation_day'] = target_dt.day
+        self.context['reservation_hour'] = target_dt.hour
+        self.context['reservation_weekday'] = '월화수목금토일'[target_dt.weekday()]
+
+        # 추첨 신청 기간인 경우 좌석을 점유하지 않고 추첨 신청 여부를 보여줌
+        if self.space.is_lottery_open:
+            self.context['lottery_open'] = True
+            self.context['lottery_requested'] = LotteryRequest.objects.filter(
+                space=self.space, member=request.user, dt_from=target_dt
+            ).exists()
+            return render(request, 'reservations/reservation_create.html', self.context)
+        # 추첨 신청 기간이 끝났지만 아직 추첨되지 않은 시간대인 경우 추첨 결과가 나올 때까지 예약할 수 없음
+        if LotteryRequest.is_awaiting_draw(self.space, target_dt):
+            self.context['lottery_pending'] = True
+            return render(request, 'reservations/reservation_create.html', self.context)
 
-        target_dt = target_day.replace(hour=hour, minute=0, second=0, microsecond=0)
-        # 이미 예약되어 있는 경우
-        if Reservation.already_booked(space=self.space, target_dt=target_dt) or kwargs.get('already_booked'):
+        # 이미 예약(또는 다른 멤버가 임시 점유)되어 있는 경우
+        # 그렇지 않은 경우 약관을 확인하는 동안 다른 멤버가 예약하지 않도록 좌석 하나를 임시 점유함
+        if kwargs.get('already_booked') or not Reservation.hold_slot(self.space, request.user, target_dt):
             self.context['already_booked'] = True
+            # 대기열에 등록되어 있는 경우 대기 순번을 보여줌
+            self.context['waitlist_position'] = WaitlistEntry.get_position(self.space, request.user, target_dt)
         else:
             self.context['already_booked'] = False
-
-            self.context['reservation_year'] = target_dt.year
-            self.context['reservation_month'] = target_dt.month
-            self.context['reservation_day'] = target_dt.day
-            self.context['reservation_hour'] = hour
-            self.context['reservation_weekday'] = '월화수목금토일'[target_dt.weekday()]
+            self.context['hold_minutes'] = settings.RESERVATION_HOLD_TTL_SECONDS // 60
 
         return render(request, 'reservations/reservation_create.html', self.context)
 
@@ -274,12 +507,31 @@ class CreateReservationView(MemberOnlyView, Space.FindingSingleInstance):
         day = int(request.POST.get('day'))
         hour = int(request.POST.get('hour'))
 
-        # 이미 예약되어 있는 경우
         target_dt = timezone.datetime(year, month, day, hour)
+
+        # 추첨 신청 기간인 경우 바로 예약하지 않고 추첨 신청으로 모아둠
+        if self.space.is_lottery_open:
+            try:
+                LotteryRequest.enter(self.space, request.user, target_dt)
+            # 이미 신청한 경우
+            except IntegrityError:
+                pass
+            return redirect(get_reservation_create_url(self.group, self.space, target_dt))
+        # 아직 추첨되지 않은 시간대인 경우 예약하지 않음
+        if LotteryRequest.is_awaiting_draw(self.space, target_dt):
+            return redirect(get_reservation_create_url(self.group, self.space, target_dt))
+
+        # 이미 예약되어 있는 경우
         try:
             new_reservation = Reservation.create_reservation(space=self.space, member=request.user, target_dt=target_dt)
         except IntegrityError:
             kwargs['already_booked'] = True
+            kwargs['target_dt'] = target_dt
+            return self.get(request, *args, **kwargs)
+        # 멤버별 예약 한도에 도달한 경우
+        except ReservationQuotaExceeded as e:
+            self.context['quota_exceeded_message'] = e.message
+            kwargs['target_dt'] = target_dt
             return self.get(request, *args, **kwargs)
         # 정상 예약
         else:
@@ -287,6 +539,40 @@ class CreateReservationView(MemberOnlyView, Space.FindingSingleInstance):
                             group_pk=self.group.pk, space_pk=self.space.pk, reservation_pk=new_reservation.pk)
 
 
+class WaitlistView(MemberOnlyView, Space.FindingSingleInstance):
+    """
+    예약이 가득 찬 시간대의 대기열 등록 및 취소를 수행하는 View
+    """
+
+    def post(self, request, *args, **kwargs):
+        """
+        대기열 등록/취소 요청
+        - year, month, day, hour: 대기할 시간대
+        - leave: 전달된 경우 대기열에서 나감
+        => 성공/실패 여부와 관계없이 해당 시간대의 예약 페이지로 이동됨
+        """
+        self.init_space(request, *args, **kwargs)
+
+        year = int(request.POST.get('year'))
+        month = int(request.POST.get('month'))
+        day = int(request.POST.get('day'))
+        hour = int(request.POST.get('hour'))
+        target_dt = timezone.datetime(year, month, day, hour)
+
+        if request.POST.get('leave') is not None:
+            WaitlistEntry.objects.filter(space=self.space, member=request.user, dt_from=target_dt).delete()
+        # 예약할 수 있는 멤버만 대기열에 등록될 수 있음
+        elif not request.user.get_valid_blocks_in_group(self.group) \
+                and Space.permission_checker.check(self.space, request.user):
+            try:
+                WaitlistEntry.join(self.space, request.user, target_dt)
+            # 이미 대기열에 등록되어 있는 경우
+            except IntegrityError:
+                pass
+
+        return redirect(get_reservation_create_url(self.group, self.space, target_dt))
+
+
 class ReservationDetailView(MemberOnlyView, Space.FindingSingleInstance, Reservation.FindingSingleInstance):
     """
     예약 한 건에 대한 상세 정보 조회를 수행하는 View
@@ -311,6 +597,6 @@ class ReservationDeleteView(MemberOnlyView, Space.FindingSingleInstance):
             reservation = get_object_or_404(Reservation, space=self.space, pk=reservation_pk)
         else:
             reservation = get_object_or_404(Reservation, space=self.space, pk=reservation_pk, member=request.user)
-        reservation.delete()
+        reservation.cancel()
 
         return redirect('reservations:space_detail', group_pk=self.group.pk, space_pk=self.space.pk)
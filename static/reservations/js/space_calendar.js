@@ -0,0 +1,106 @@
+const calendar = document.getElementById('space-calendar');
+const calendarBody = document.getElementById('calendar-body');
+const calendarTitle = document.getElementById('calendar-title');
+
+// 한 번 조회한 달의 예약 현황은 다시 요청하지 않음
+const availabilityCache = new Map();
+
+let year = Number(calendar.dataset.year);
+let month = Number(calendar.dataset.month);
+
+const countBits = function (mask) {
+    let count = 0;
+    for (; mask; mask >>= 1) {
+        count += mask & 1;
+    }
+    return count;
+};
+
+const fetchAvailability = function (targetYear, targetMonth) {
+    const key = `${targetYear}-${targetMonth}`;
+    if (!availabilityCache.has(key)) {
+        const url = `${calendar.dataset.availabilityUrl}?year=${targetYear}&month=${targetMonth}`;
+        availabilityCache.set(key, fetch(url, {credentials: 'same-origin'}).then((response) => {
+            if (!response.ok) {
+                availabilityCache.delete(key);
+                throw new Error(`availability request failed: ${response.status}`);
+            }
+            return response.json();
+        }));
+    }
+    return availabilityCache.get(key);
+};
+
+const renderCalendar = function (availability) {
+    const first = new Date(`${availability.from}T00:00:00`);
+    // 월요일부터 시작하도록 첫 주의 빈 칸 수를 구함
+    const offset = (first.getDay() + 6) % 7;
+
+    calendarTitle.innerText = `${year}/${String(month).padStart(2, '0')}`;
+    calendarBody.replaceChildren();
+
+    let row = document.createElement('tr');
+    for (let i = 0; i < offset; i++) {
+        row.appendChild(document.createElement('td'));
+    }
+    for (let day = 0; day < availability.days; day++) {
+        const free = 24 - countBits(availability.full[day]);
+        const cell = document.createElement('td');
+        cell.classList.add('day');
+        if (free === 0) {
+            cell.classList.add('table-danger');
+        } else if (availability.booked[day]) {
+            cell.classList.add('table-warning');
+        } else {
+            cell.classList.add('table-success');
+        }
+        cell.innerHTML = `<div>${day + 1}</div><div>${free}</div>`;
+        cell.addEventListener('click', () => {
+            location.assign(`${calendar.dataset.detailUrl}?year=${year}&month=${month}&day=${day + 1}`);
+        });
+        row.appendChild(cell);
+
+        if ((offset + day + 1) % 7 === 0) {
+            calendarBody.appendChild(row);
+            row = document.createElement('tr');
+        }
+    }
+    if (row.children.length) {
+        while (row.children.length < 7) {
+            row.appendChild(document.createElement('td'));
+        }
+        calendarBody.appendChild(row);
+    }
+};
+
+const showMonth = function (delta) {
+    month += delta;
+    if (month < 1) {
+        month = 12;
+        year -= 1;
+    } else if (month > 12) {
+        month = 1;
+        year += 1;
+    }
+    history.replaceState(null, '', `?year=${year}&month=${month}`);
+
+    const [shownYear, shownMonth] = [year, month];
+    fetchAvailability(shownYear, shownMonth).then((availability) => {
+        // 응답을 기다리는 동안 다른 달로 이동한 경우 무시함
+        if (shownYear === year && shownMonth === month) {
+            renderCalendar(availability);
+        }
+    });
+};
+
+document.getElementById('prev-month').addEventListener('click', (e) => {
+    e.preventDefault();
+    showMonth(-1);
+});
+
+document.getElementById('next-month').addEventListener('click', (e) => {
+    e.preventDefault();
+    showMonth(1);
+});
+
+showMonth(0);
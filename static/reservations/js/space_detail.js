@@ -1,30 +1,119 @@
-const bookedCells = document.getElementsByClassName('booked');
-const notBookedCells = document.getElementsByClassName('not-booked');
+const weekGrid = document.getElementById('week-grid');
 
-for (let cell of bookedCells) {
-    cell.addEventListener('mouseover', (e) => {
-        e.target.style.border = '2px solid #ff0000';
-    });
+// 주 이동 시 받아온 week grid fragment (fragment URL -> {promise, fetchedAt})
+const fragmentCache = new Map();
+// 임시 점유 현황이 바뀌므로 오래된 fragment는 다시 요청함
+const FRAGMENT_MAX_AGE_MS = 30 * 1000;
 
-    cell.addEventListener('mouseout', (e) => {
-        e.target.style.border = null;
-    })
+const fetchFragment = function (url) {
+    const cached = fragmentCache.get(url);
+    if (cached && Date.now() - cached.fetchedAt < FRAGMENT_MAX_AGE_MS) {
+        return cached.promise;
+    }
 
-    cell.addEventListener('click', (e) => {
-        location.replace(e.target.getAttribute('detail-link'));
-    })
-}
+    const promise = fetch(url, {credentials: 'same-origin'}).then((response) => {
+        if (!response.ok) {
+            throw new Error(`week grid request failed: ${response.status}`);
+        }
+        return response.text();
+    });
+    promise.catch(() => fragmentCache.delete(url));
+    fragmentCache.set(url, {promise: promise, fetchedAt: Date.now()});
+    return promise;
+};
+
+// 현재 보이는 주의 이전주, 다음주 fragment를 미리 받아둠
+const prefetchAdjacentWeeks = function () {
+    for (let link of weekGrid.querySelectorAll('.week-nav')) {
+        fetchFragment(link.dataset.fragmentUrl).catch(() => null);
+    }
+};
 
-for (let cell of notBookedCells) {
-    cell.addEventListener('mouseover', (e) => {
-        e.target.style.border = '2px solid #00ff00';
+const showWeek = function (fragmentUrl, pageUrl, push) {
+    return fetchFragment(fragmentUrl).then((html) => {
+        weekGrid.innerHTML = html;
+        if (push) {
+            history.pushState({fragmentUrl: fragmentUrl}, '', pageUrl);
+        }
+        prefetchAdjacentWeeks();
+    }).catch(() => {
+        // fragment를 받지 못한 경우 페이지 전체를 다시 불러옴
+        location.assign(pageUrl);
     });
+};
+
+weekGrid.addEventListener('mouseover', (e) => {
+    const cell = e.target.closest('.booked, .not-booked');
+    if (cell) {
+        cell.style.border = cell.classList.contains('booked') ? '2px solid #ff0000' : '2px solid #00ff00';
+    }
+});
+
+weekGrid.addEventListener('mouseout', (e) => {
+    const cell = e.target.closest('.booked, .not-booked');
+    if (cell) {
+        cell.style.border = null;
+    }
+});
+
+weekGrid.addEventListener('click', (e) => {
+    const link = e.target.closest('.week-nav');
+    if (link) {
+        e.preventDefault();
+        showWeek(link.dataset.fragmentUrl, link.href, true);
+        return;
+    }
 
-    cell.addEventListener('mouseout', (e) => {
-        e.target.style.border = null;
-    })
+    const cell = e.target.closest('.booked, .not-booked');
+    if (cell && cell.classList.contains('booked')) {
+        location.replace(cell.getAttribute('detail-link'));
+    } else if (cell) {
+        // 첫 번째 열은 시간 표시 열이므로 열 번호 - 1이 요일(월요일: 0), 행 번호가 시간
+        const createUrl = cell.closest('table').dataset.createUrl;
+        location.replace(`${createUrl}&wd=${cell.cellIndex - 1}&hour=${cell.parentElement.sectionRowIndex}`);
+    }
+});
+
+window.addEventListener('popstate', (e) => {
+    if (e.state && e.state.fragmentUrl) {
+        showWeek(e.state.fragmentUrl, location.href, false);
+    } else {
+        location.reload();
+    }
+});
+
+// 다른 멤버의 예약/취소 이벤트를 받아 현재 보이는 주의 week grid만 다시 받아옴 (ASGI로 실행하는 경우에만 전달됨)
+const REFRESH_DEBOUNCE_MS = 300;
+let refreshTimer = null;
+
+const refreshCurrentWeek = function () {
+    clearTimeout(refreshTimer);
+    refreshTimer = setTimeout(() => {
+        const fragmentUrl = history.state && history.state.fragmentUrl;
+        if (fragmentUrl) {
+            showWeek(fragmentUrl, location.href, false);
+        }
+    }, REFRESH_DEBOUNCE_MS);
+};
+
+const onReservationChanged = function (e) {
+    const event = JSON.parse(e.data);
+    // 받아둔 다른 주의 fragment도 더 이상 최신이 아니므로 모두 버림
+    fragmentCache.clear();
+
+    const table = weekGrid.querySelector('table');
+    const day = event.data.start.slice(0, 10);
+    if (table && table.dataset.weekStart <= day && day < table.dataset.weekEnd) {
+        refreshCurrentWeek();
+    }
+};
+
+if (window.EventSource && weekGrid.dataset.eventsUrl) {
+    const events = new EventSource(weekGrid.dataset.eventsUrl);
+    events.addEventListener('reservation.created', onReservationChanged);
+    events.addEventListener('reservation.deleted', onReservationChanged);
+}
 
-    cell.addEventListener('click', (e) => {
-        location.replace(e.target.getAttribute('detail-link'));
-    })
-}
\ No newline at end of file
+// 처음 렌더링된 주로 돌아오는 경우에도 fragment로 교체할 수 있도록 현재 주의 fragment URL을 기록함
+history.replaceState({fragmentUrl: weekGrid.dataset.fragmentUrl + location.search}, '', location.href);
+prefetchAdjacentWeeks();
@@ -1,6 +1,8 @@
+from asgiref.sync import sync_to_async
 from django.http import Http404
 from django.shortcuts import redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
+from django.contrib.auth.views import redirect_to_login
 
 from users.models import Group
 
@@ -15,22 +17,58 @@ def anonymous_user_only(func):
     return decorated
 
 
+def get_group_as_member(user, group_pk) -> Group:
+    """
+    user가 멤버로 소속된 그룹을 반환하는 함수
+    :raises Http404: 그룹이 없거나 user가 그룹의 멤버가 아닌 경우
+    """
+    group = get_object_or_404(Group, pk=group_pk)
+    if not group.members.contains(user):
+        raise Http404()
+    return group
+
+
 def group_member_only(func):
     @login_required
     def decorated(request, *args, **kwargs):
         # 그룹 멤버 검사
-        pk = kwargs.get('group_pk')
-        group = get_object_or_404(Group, pk=pk)
-        if not group.members.contains(request.user):
-            raise Http404()
-
-        kwargs['group'] = group
+        kwargs['group'] = get_group_as_member(request.user, kwargs.get('group_pk'))
 
         return func(request, *args, **kwargs)
 
     return decorated
 
 
+def async_login_required(func):
+    """
+    async view용 login_required
+    request.user는 session을 조회하는 lazy object이므로 thread에서 확인한다.
+    """
+
+    async def decorated(request, *args, **kwargs):
+        is_authenticated = await sync_to_async(lambda: request.user.is_authenticated)()
+        if not is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        return await func(request, *args, **kwargs)
+
+    return decorated
+
+
+def async_group_member_only(func):
+    """
+    async view용 group_member_only
+    """
+
+    @async_login_required
+    async def decorated(request, *args, **kwargs):
+        # 그룹 멤버 검사
+        kwargs['group'] = await sync_to_async(get_group_as_member)(request.user, kwargs.get('group_pk'))
+
+        return await func(request, *args, **kwargs)
+
+    return decorated
+
+
 def group_manager_only(func):
     @group_member_only
     def decorated(request, *args, **kwargs):
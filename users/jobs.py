@@ -0,0 +1,18 @@
+"""
+주기 작업(PERIODIC_JOBS)으로 실행되는 그룹 관련 정리 작업
+각 함수는 run_periodic_jobs 명령에서 인자 없이 호출되며, 실행 기록에 남길 요약을 반환한다.
+"""
+from django.conf import settings
+from django.utils import timezone
+
+from users.models import Block, JoinRequest
+
+
+def prune_expired_blocks() -> str:
+    ended_before = timezone.now() - timezone.timedelta(days=settings.BLOCK_RETENTION_DAYS)
+    return f'{Block.delete_expired(ended_before)} blocks ended before {ended_before} deleted'
+
+
+def prune_stale_join_requests() -> str:
+    created_before = timezone.now() - timezone.timedelta(days=settings.JOIN_REQUEST_MAX_AGE_DAYS)
+    return f'{JoinRequest.prune_stale(created_before)} stale join requests deleted'
@@ -0,0 +1,23 @@
+# Generated by Django 4.0.4 on 2026-10-19 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_group_deleted_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='max_active_reservations',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='멤버별 최대 예약 수'),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='max_weekly_hours',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='멤버별 주간 최대 예약 시간'),
+        ),
+    ]
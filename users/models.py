@@ -3,12 +3,15 @@ import random
 from typing import Union, List
 
 from django.db import models, IntegrityError, transaction
+from django.db.models import F, Q
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MinLengthValidator
 from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 
+from commons.models import SoftDeleteModel, OutboxMessage
+
 
 class SystemUser(AbstractUser):
     """
@@ -152,13 +155,14 @@ class SystemUser(AbstractUser):
         return group.manager == self
 
 
-class Group(models.Model):
+class Group(SoftDeleteModel):
     """
     여러 사용자를 포함하는 그룹
     - Group : SystemUser = 1 : 1 (그룹 매니저)
     - Group : SystemUser = 1 : N (그룹에 다수의 멤버가 소속될 수 있음)
     - Group : PermissionTag = 1 : N (그룹에 여러 권한 태그가 있을 수 있음)
     - Group : JoinRequest = 1 : N (한 그룹에 여러 그룹 요청이 올 수 있음)
+    삭제 요청된 그룹은 즉시 숨겨지며, 연결된 instance들은 purge_deleted_objects 명령으로 삭제된다.
     """
     created_at = models.DateTimeField('생성 일시', auto_now_add=True)
 
@@ -176,6 +180,10 @@ class Group(models.Model):
     members = models.ManyToManyField(SystemUser, db_index=True,
                                      related_name='belonged_groups', verbose_name='멤버 목록')
 
+    # 멤버별 예약 한도 (None인 경우 제한하지 않음, 그룹에 등록된 모든 공간의 예약을 합산함)
+    max_active_reservations = models.PositiveIntegerField('멤버별 최대 예약 수', null=True, blank=True)
+    max_weekly_hours = models.PositiveIntegerField('멤버별 주간 최대 예약 시간', null=True, blank=True)
+
     class Meta:
         verbose_name = '그룹'
         verbose_name_plural = '그룹 목록'
@@ -198,6 +206,11 @@ class Group(models.Model):
             new_manager = self.member_check(kwargs['manager'])
             self.manager = new_manager
 
+        if 'max_active_reservations' in kwargs.keys():
+            self.max_active_reservations = kwargs['max_active_reservations']
+        if 'max_weekly_hours' in kwargs.keys():
+            self.max_weekly_hours = kwargs['max_weekly_hours']
+
         self.save()
 
     def handover_group_manager(self, target_user: SystemUser) -> None:
@@ -249,7 +262,8 @@ class Group(models.Model):
         """
         while True:
             new_invite_code = ''.join(random.sample(cls._INVITE_CODE_CHARS, cls._INVITE_CODE_LENGTH))
-            existing_invite_code = cls.objects.values('invite_code')
+            # 삭제 요청된 그룹도 실제로 삭제되기 전까지는 초대 코드를 점유하고 있음
+            existing_invite_code = cls.all_objects.values('invite_code')
             if new_invite_code not in existing_invite_code:
                 break
         return new_invite_code
@@ -346,10 +360,43 @@ class Block(models.Model):
     dt_from = models.DateTimeField('제한 시작 일시', blank=False, null=False)
     dt_to = models.DateTimeField('제한 해제 일시', blank=False, null=False)
 
+    # 제한된 멤버에게 보내는 알림 종류 (OutboxMessage.topic)
+    NOTIFICATION_BLOCKED = 'group.member_blocked'
+
     class Meta:
         verbose_name = '제한 내역'
         verbose_name_plural = '제한 내역'
 
+    @classmethod
+    def create_block(cls, group: Group, member: SystemUser, dt_from, dt_to) -> 'Block':
+        """
+        그룹 내 활동 제한 내역을 생성하고, 제한된 멤버에게 보낼 알림을 outbox에 추가하는 메서드
+        :param group: 대상 그룹
+        :param member: 제한할 멤버
+        :param dt_from: 제한 시작 일시
+        :param dt_to: 제한 해제 일시
+        :return: 생성된 제한 내역
+        """
+        with transaction.atomic():
+            block = cls.objects.create(group=group, member=member, dt_from=dt_from, dt_to=dt_to)
+            OutboxMessage.enqueue(cls.NOTIFICATION_BLOCKED, [(member.pk, {
+                'block': block.pk,
+                'group': group.pk,
+                'group_name': group.name,
+                'start': dt_from,
+                'end': dt_to,
+            })])
+        return block
+
+    @classmethod
+    def delete_expired(cls, ended_before) -> int:
+        """
+        해제 일시가 ended_before 이전인 제한 내역을 삭제하는 메서드
+        :return: 삭제된 제한 내역의 수
+        """
+        deleted, _ = cls.objects.filter(dt_to__lt=ended_before).delete()
+        return deleted
+
 
 class JoinRequest(models.Model):
     """
@@ -364,6 +411,9 @@ class JoinRequest(models.Model):
     user = models.ForeignKey(SystemUser, null=False, on_delete=models.CASCADE,
                              verbose_name='신청 유저', related_name='send_join_requests')
 
+    # 가입 요청한 사용자에게 보내는 알림 종류 (OutboxMessage.topic)
+    NOTIFICATION_ACCEPTED = 'group.join_accepted'
+
     class Meta:
         verbose_name = '그룹 가입 요청'
         verbose_name_plural = '그룹 가입 요청 목록'
@@ -376,9 +426,30 @@ class JoinRequest(models.Model):
             ),
         )
 
+    @classmethod
+    def prune_stale(cls, created_before) -> int:
+        """
+        처리되지 않은 채 오래된 가입 요청(created_before 이전에 생성됨)과,
+        요청한 사용자가 이미 가입하여 처리할 필요가 없는 가입 요청을 삭제하는 메서드
+        :return: 삭제된 가입 요청의 수
+        """
+        stale = cls.objects.filter(
+            Q(created_at__lt=created_before) | Q(group__members=F('user'))
+        )
+        deleted, _ = cls.objects.filter(pk__in=list(stale.values_list('pk', flat=True))).delete()
+        return deleted
+
     def accept(self):
-        self.group.add_member(self.user)
-        self.delete()
+        """
+        가입 요청을 승인하여 요청한 사용자를 그룹에 추가하고, 사용자에게 보낼 알림을 outbox에 추가하는 메서드
+        """
+        with transaction.atomic():
+            self.group.add_member(self.user)
+            OutboxMessage.enqueue(self.NOTIFICATION_ACCEPTED, [(self.user_id, {
+                'group': self.group_id,
+                'group_name': self.group.name,
+            })])
+            self.delete()
 
     def reject(self):
         self.delete()
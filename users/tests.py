@@ -1,3 +1,50 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
-# Create your tests here.
+from users.models import SystemUser, Group
+
+
+# 테스트는 DEBUG=False로 실행되므로, collectstatic으로 만들어지는 manifest 없이 페이지를 렌더링할 수 있도록 함
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class GroupQuotaManageTest(TestCase):
+    """
+    그룹 관리 페이지에서의 멤버별 예약 한도 설정
+    """
+
+    def setUp(self):
+        self.manager = SystemUser.signup('manager', 'password1234', 'manager@example.com', 'manager')
+        self.member = SystemUser.signup('member', 'password1234', 'member@example.com', 'member')
+        self.group = Group.start_new_group(self.manager, 'group', False)
+        self.group.add_member(self.member)
+        self.url = reverse('users:group_manage', args=[self.group.pk])
+
+    def post(self, user: SystemUser, **data):
+        self.client.force_login(user)
+        return self.client.post(self.url, {'name': self.group.name, **data})
+
+    def test_manager_sets_and_clears_quota(self):
+        response = self.post(self.manager, max_active_reservations='3', max_weekly_hours='10')
+        self.assertEqual(response.status_code, 200)
+        self.group.refresh_from_db()
+        self.assertEqual((self.group.max_active_reservations, self.group.max_weekly_hours), (3, 10))
+
+        # 비어 있는 값은 제한하지 않음을 의미함
+        self.post(self.manager, max_active_reservations='', max_weekly_hours='')
+        self.group.refresh_from_db()
+        self.assertEqual((self.group.max_active_reservations, self.group.max_weekly_hours), (None, None))
+
+    def test_invalid_quota_is_rejected(self):
+        self.post(self.manager, max_active_reservations='3', max_weekly_hours='10')
+
+        # 잘못된 값이 전달된 경우 이전 설정을 유지하고 실패를 알림
+        for invalid in ({'max_active_reservations': '-1', 'max_weekly_hours': '5'},
+                        {'max_active_reservations': '5', 'max_weekly_hours': 'many'}):
+            response = self.post(self.manager, **invalid)
+            self.assertTrue(response.context['is_modify_failed'])
+            self.group.refresh_from_db()
+            self.assertEqual((self.group.max_active_reservations, self.group.max_weekly_hours), (3, 10))
+
+    def test_member_cannot_change_quota(self):
+        self.post(self.member, max_active_reservations='1')
+        self.group.refresh_from_db()
+        self.assertIsNone(self.group.max_active_reservations)
@@ -1,11 +1,15 @@
+from django.conf import settings
 from django.urls import path, include
 from . import views
 
+# ASGI로 실행하는 경우 읽기 위주의 페이지는 async view로 처리함 (ASYNC_VIEWS)
+GroupListView = views.AsyncGroupListView if settings.ASYNC_VIEWS else views.GroupListView
+
 app_name = 'users'
 
 group_urlpatterns = [
     # 그룹 목록
-    path('', views.GroupListView.as_view(), name='group'),
+    path('', GroupListView.as_view(), name='group'),
     # 그룹 멤버 상세 정보
     path('<int:group_pk>/<int:member_pk>/', views.GroupMemberDetailView.as_view(), name='group_member_detail'),
     # 그룹 탈퇴
@@ -1,16 +1,23 @@
+from asgiref.sync import sync_to_async
 from django.db import IntegrityError, transaction
 from django.http import JsonResponse, Http404
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.decorators import login_required
+from django.urls import reverse
 from django.utils import timezone, dateparse
 from django.utils.decorators import method_decorator
 from django.views import View
 
-from commons.views import ViewWithContext
-from utils.validation import check_not_null
+from commons.api import ApiView
+from commons.idempotency import idempotent
+from commons.ratelimit import rate_limit
+from commons.views import ViewWithContext, AsyncViewWithContext
+from utils.database import database_sync_to_async
+from utils.validation import check_not_null, parse_optional_positive_int, parse_optional_limit
 
-from .decorators import anonymous_user_only, group_manager_only, group_member_only
+from .decorators import anonymous_user_only, group_manager_only, group_member_only, async_login_required, \
+    async_group_member_only
 from .models import SystemUser, Group, JoinRequest, PermissionTag, Block
 from .utils import sort_group_member
 
@@ -47,6 +54,39 @@ class ManagerOnlyView(ViewWithContextAndGroup):
     pass
 
 
+@method_decorator(async_group_member_only, name='dispatch')
+class AsyncViewWithContextAndGroup(AsyncViewWithContext):
+    """
+    ViewWithContextAndGroup의 async 버전 (handler는 async def로 정의함)
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.group = kwargs['group']
+        self.context['group'] = self.group
+        return await super(AsyncViewWithContextAndGroup, self).dispatch(request, *args, **kwargs)
+
+
+class AsyncMemberOnlyView(AsyncViewWithContextAndGroup):
+    """
+    MemberOnlyView의 async 버전
+    MemberOnlyView를 상속한 sync view와 함께 상속하면 sync view의 메서드를 그대로 사용할 수 있다.
+    (권한 검사와 dispatch는 async 버전이 사용됨)
+    """
+    pass
+
+
+class MemberOnlyApiView(ApiView):
+    """
+    그룹 멤버만 호출할 수 있는 JSON API view
+    그룹 멤버가 아닌 경우 404(JSON)로 응답하며, self.group에 kwargs의 group_pk로 찾은 그룹이 저장된다.
+    """
+
+    def initial(self, request, *args, **kwargs) -> None:
+        self.group = get_object_or_404(Group, pk=kwargs.get('group_pk'))
+        if not self.group.members.contains(request.user):
+            raise Http404()
+
+
 @method_decorator(anonymous_user_only, name='dispatch')
 class LoginView(ViewWithContext):
     """
@@ -200,11 +240,13 @@ class ModifyAccountInfoView(ViewWithContext):
 
 
 @method_decorator(login_required, name='dispatch')
+@method_decorator(idempotent('group_create'), name='post')
 class GroupListView(ViewWithContext):
     """
     관리중인 그룹과 소속된 그룹을 분리하여 목록으로 보여주는 뷰
     신규 그룹 생성 기능을 포함한다(POST).
     """
+    query_budget = 10
 
     def __init__(self, *args, **kwargs):
         super(GroupListView, self).__init__(*args, **kwargs)
@@ -214,11 +256,21 @@ class GroupListView(ViewWithContext):
         """
         생성/조회 요청 상관 없이 항상 그룹 목록을 보여주어야 함
         """
+        self.init_group_list(request)
+        return render(request, 'users/group_list.html', self.context)
+
+    def init_group_list(self, request) -> None:
+        """
+        그룹 목록을 렌더링하는 데 필요한 context를 준비하는 메서드
+        """
         groups_as_manager, groups_as_member = request.user.classify_group_list()
         self.context['groups_as_manager'] = groups_as_manager
         self.context['groups_as_member'] = groups_as_member
 
-        return render(request, 'users/group_list.html', self.context)
+        # 그룹 생성 후 redirect된 경우 생성된 그룹을 메시지로 보여줌
+        created_pk = parse_optional_positive_int(request.GET.get('created'))
+        if created_pk is not None:
+            self.context['created_group'] = next((group for group in groups_as_manager if group.pk == created_pk), None)
 
     def get(self, request, *args, **kwargs):
         """
@@ -231,7 +283,9 @@ class GroupListView(ViewWithContext):
         그룹 생성 요청
         - name: 그룹명 (unique)
         - is_public: 공개 여부
-        => 성공/실패 여부 상관 없이 group list view로 이동된다. (수행 결과를 메시지로 전달받음)
+        => 성공한 경우 생성된 그룹을 쿼리 파라미터로 전달하며 group list view로 redirect된다.
+           (같은 요청이 다시 전송되어도 그룹이 중복 생성되지 않도록 함)
+        => 실패한 경우 group list view가 실패 메시지와 함께 렌더링된다.
         """
         name = request.POST.get('name')
         is_public = request.POST.get('is_public') == 'y'
@@ -245,16 +299,31 @@ class GroupListView(ViewWithContext):
             self.context['group_create_failed'] = True
             self.context['group_create_fail_message'] = 'You can manage only 50 groups.'
         else:
-            self.context['group_create_failed'] = False
-            self.context['created_group'] = new_group
+            return redirect(reverse('users:group') + f'?created={new_group.pk}')
 
         return self.render_page(request, *args, **kwargs)
 
 
+@method_decorator(async_login_required, name='dispatch')
+class AsyncGroupListView(AsyncViewWithContext, GroupListView):
+    """
+    GroupListView의 async 버전 (ASYNC_VIEWS)
+    그룹 목록 조회(GET)는 async로 처리하고, 그룹 생성(POST)은 GroupListView의 처리를 그대로 thread에서 실행한다.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        await database_sync_to_async(self.init_group_list)(request)
+        return await sync_to_async(render)(request, 'users/group_list.html', self.context)
+
+    async def post(self, request, *args, **kwargs):
+        return await sync_to_async(super(AsyncGroupListView, self).post)(request, *args, **kwargs)
+
+
 class GroupDetailView(ViewWithContextAndGroup):
     """
     그룹, 그룹에 소속된 멤버, 그룹에 등록된 가입 요청을 보여주는 View
     """
+    query_budget = 20
 
     def get(self, request, *args, **kwargs):
         # 속해 있는 모든 멤버를 unique id순으로 정렬하되, manager가 맨위로 오도록 함
@@ -296,7 +365,8 @@ class GroupManageView(ManagerOnlyView):
         그룹 정보 수정을 처리
         - name: 새 그룹명
         - is_public: 그룹 공개 여부
-        => 이미 사용중인 그룹명이 전달될 경우 같은 페이지에서 피드백해줌
+        - max_active_reservations, max_weekly_hours: 멤버별 예약 한도 (비어 있는 경우 제한하지 않음)
+        => 이미 사용중인 그룹명 또는 양의 정수가 아닌 예약 한도가 전달될 경우 수정하지 않고 같은 페이지에서 피드백해줌
         """
         name = request.POST.get('name')
         is_public = request.POST.get('is_public') is not None
@@ -304,7 +374,16 @@ class GroupManageView(ManagerOnlyView):
         self.context['is_modify_failed'] = False
 
         try:
-            self.group.update_info(name=name, is_public=is_public)
+            max_active_reservations = parse_optional_limit(request.POST.get('max_active_reservations'))
+            max_weekly_hours = parse_optional_limit(request.POST.get('max_weekly_hours'))
+        except ValueError:
+            self.context['is_modify_failed'] = True
+            self.context['modify_fail_message'] = 'Reservation limits must be positive integers.'
+            return render(request, 'users/group_manage.html', self.context)
+
+        try:
+            self.group.update_info(name=name, is_public=is_public,
+                                   max_active_reservations=max_active_reservations, max_weekly_hours=max_weekly_hours)
         except IntegrityError:
             self.context['is_modify_failed'] = True
             self.context['modify_fail_message'] = 'This group name is already used.'
@@ -315,11 +394,12 @@ class GroupManageView(ManagerOnlyView):
 class GroupDeleteView(ManagerOnlyView):
     """
     그룹의 삭제를 수행하는 View
+    그룹은 즉시 숨겨지며, 연결된 공간, 약관, 권한 태그 등의 삭제는 purge_deleted_objects 명령에서 수행된다.
     """
 
     def post(self, request, *args, **kwargs):
         group = kwargs['group']
-        group.delete()
+        group.soft_delete()
 
         del kwargs['group']
 
@@ -348,6 +428,7 @@ class GroupInviteCodeChangeView(ManagerOnlyView):
 
 
 @method_decorator(login_required, name='dispatch')
+@method_decorator(rate_limit('group_search'), name='get')
 class GroupSearchView(ViewWithContext):
     """
     그룹 검색을 수행하는 View
@@ -369,6 +450,7 @@ class GroupSearchView(ViewWithContext):
 
 
 @method_decorator(login_required, name='dispatch')
+@method_decorator(rate_limit('group_join_request'), name='post')
 class GroupJoinRequestView(ViewWithContext):
     """
     그룹 가입 요청을 처리하는 View
@@ -582,8 +664,7 @@ class BlockListView(ManagerOnlyView):
             self.context['past_dt'] = True
             return render(request, 'users/block_list.html', self.context)
         else:
-            block = Block.objects.create(group=self.group, member=target_member,
-                                         dt_from=now, dt_to=block_to)
+            block = Block.create_block(group=self.group, member=target_member, dt_from=now, dt_to=block_to)
             return redirect('users:group_detail', group_pk=self.group.pk)
 
 
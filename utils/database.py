@@ -0,0 +1,21 @@
+import functools
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+
+def database_sync_to_async(func):
+    """
+    ORM을 사용하는 sync 함수를 별도의 thread에서 실행하는 coroutine function으로 변환하는 함수
+    요청의 thread가 아닌 thread pool에서 실행되므로(thread_sensitive=False) 서로 관계없는 조회를 asyncio.gather로
+    동시에 실행할 수 있다. thread pool의 DB 연결은 요청이 끝날 때 정리되지 않으므로 실행 전후로 직접 정리한다.
+    """
+
+    def inner(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(functools.update_wrapper(inner, func), thread_sensitive=False)
@@ -3,3 +3,29 @@ import functools
 
 def check_not_null(*variables):
     return functools.reduce(lambda x, y: x is not None and y is not None, variables)
+
+
+def parse_optional_positive_int(value):
+    """
+    입력 폼에서 전달된 값을 양의 정수로 변환하는 함수
+    값이 비어 있거나 양의 정수가 아닌 경우 None(제한 없음)을 반환한다.
+    """
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return None
+    return value if value > 0 else None
+
+
+def parse_optional_limit(value):
+    """
+    입력 폼에서 전달된 한도 값을 양의 정수로 변환하는 함수
+    값이 비어 있는 경우 None(제한 없음)을 반환한다.
+    :raises ValueError: 값이 양의 정수가 아닌 경우
+    """
+    if value is None or value.strip() == '':
+        return None
+    value = int(value)
+    if value <= 0:
+        raise ValueError(f'{value} is not a positive integer.')
+    return value